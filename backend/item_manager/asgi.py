@@ -12,5 +12,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "item_manager.settings")
+# Use the native async item views (items.async_views) under ASGI.
+os.environ.setdefault("ITEMS_ASYNC_VIEWS", "True")
 
 application = get_asgi_application()
+
+from items.stream import disconnect_aware  # noqa: E402 (needs the app registry)
+
+# Lets /api/items/stream/ notice when its client disconnects.
+application = disconnect_aware(application)
@@ -0,0 +1,123 @@
+"""
+PostgreSQL backend that reuses connections from a per-process pool.
+
+Django 4.2 has no built-in pool. With ``POOL`` set, ``close()`` (called when
+a request finishes and ``CONN_MAX_AGE`` is 0) hands the connection back to
+the pool instead of closing it, and the next request in any thread of the
+same process takes it over without a new TCP/TLS handshake and
+authentication. Pools are keyed by process id, so workers forked by
+``manage.py serve`` never share a socket with their parent.
+"""
+import os
+import threading
+
+import psycopg2
+from django.db.backends.postgresql import base
+from django.db.utils import OperationalError
+from psycopg2 import extensions
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """At most ``max_size`` connections; ``get`` waits while all are in use."""
+
+    def __init__(self, max_size: int, timeout: float):
+        self.timeout = timeout
+        self.idle = []
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.lock = threading.Lock()
+
+    def get(self, connect, health_check: bool):
+        """Take an idle connection, or open one with ``connect()``."""
+        if not self.slots.acquire(timeout=self.timeout):
+            raise OperationalError(
+                f"No pooled database connection became free within {self.timeout}s"
+            )
+        try:
+            while True:
+                with self.lock:
+                    conn = self.idle.pop() if self.idle else None
+                if conn is None:
+                    return connect()
+                if _usable(conn, health_check):
+                    return conn
+                conn.close()
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def put(self, conn):
+        """Return ``conn``, rolling back anything left open on it."""
+        try:
+            if (
+                not conn.closed
+                and conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE
+            ):
+                conn.rollback()
+        except psycopg2.Error:
+            conn.close()
+        if not conn.closed:
+            with self.lock:
+                self.idle.append(conn)
+        self.slots.release()
+
+
+def _usable(conn, health_check: bool) -> bool:
+    if conn.closed or conn.info.transaction_status != (
+        extensions.TRANSACTION_STATUS_IDLE
+    ):
+        return False
+    if not health_check:
+        return True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if not conn.autocommit:
+            conn.rollback()
+    except psycopg2.Error:
+        return False
+    return True
+
+
+def get_pool(conn_params: dict, max_size: int, timeout: float) -> ConnectionPool:
+    """The current process's pool for connections made with ``conn_params``."""
+    # Keyed by the parameters too: creating a test database renames NAME.
+    key = (os.getpid(), *sorted((k, str(v)) for k, v in conn_params.items()))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(max_size, timeout)
+        return _pools[key]
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    pool = None
+
+    def get_new_connection(self, conn_params):
+        pool_settings = self.settings_dict.get("POOL")
+        if not pool_settings:
+            return super().get_new_connection(conn_params)
+
+        self.pool = get_pool(
+            conn_params, pool_settings["max_size"], pool_settings["timeout"]
+        )
+        conn = self.pool.get(
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+            self.settings_dict["CONN_HEALTH_CHECKS"],
+        )
+        # The parent sets this when it opens a connection; a reused one
+        # skips that, so resolve it the same way (OPTIONS are validated by
+        # then).
+        self.isolation_level = base.IsolationLevel(
+            self.settings_dict["OPTIONS"].get(
+                "isolation_level", base.IsolationLevel.READ_COMMITTED
+            )
+        )
+        return conn
+
+    def _close(self):
+        if self.connection is None or self.pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            self.pool.put(self.connection)
@@ -0,0 +1,171 @@
+"""
+Send reads to read replicas and writes to ``default``.
+
+``DATABASE_REPLICAS`` lists the replica aliases; with none configured every
+query uses ``default`` as before. Reads go to ``default`` instead when:
+
+- the request is pinned: it is not a GET/HEAD request, it has written, or
+  it carries the pin cookie set after a recent write (read-your-writes);
+- the query runs inside a transaction on ``default``, as do the reads that
+  stats and tag maintenance perform while writing;
+- no replica is reachable. A replica that fails to connect is skipped for
+  ``DATABASE_REPLICA_RETRY_SECONDS``.
+
+A request reads from a single replica, chosen round-robin or least recently
+used (``DATABASE_REPLICA_SELECTION``), so its queries see one snapshot.
+"""
+import asyncio
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import OperationalError
+from django.utils.decorators import sync_and_async_middleware
+
+PIN_COOKIE = "items_primary_pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+@dataclass
+class RouteState:
+    pinned: bool = False
+    wrote: bool = False
+    replica: Optional[str] = None
+
+
+_state = ContextVar("item_manager_db_route", default=None)
+
+_counter = itertools.count()
+_lock = threading.Lock()
+_last_used = {}
+_down_until = {}
+
+
+def _current() -> RouteState:
+    state = _state.get()
+    if state is None:
+        # Outside a request (shell, management commands): one state for the
+        # rest of this context, so a script reads its own writes too.
+        state = RouteState()
+        _state.set(state)
+    return state
+
+
+def primary_pinned() -> bool:
+    """Whether reads in this context are pinned to ``default``."""
+    return bool(settings.DATABASE_REPLICAS) and _current().pinned
+
+
+def _available(alias: str) -> bool:
+    if _down_until.get(alias, 0) > time.monotonic():
+        return False
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        # Connecting is not allowed on the event loop thread; the query
+        # itself runs in a worker thread where the probe happens anyway.
+        return True
+    try:
+        connections[alias].ensure_connection()
+    except OperationalError:
+        with _lock:
+            _down_until[alias] = (
+                time.monotonic() + settings.DATABASE_REPLICA_RETRY_SECONDS
+            )
+        return False
+    return True
+
+
+def _candidates(replicas: list) -> list:
+    """Replicas in the order they should be tried."""
+    if settings.DATABASE_REPLICA_SELECTION == "lru":
+        with _lock:
+            return sorted(replicas, key=lambda alias: _last_used.get(alias, 0))
+    start = next(_counter) % len(replicas)
+    return replicas[start:] + replicas[:start]
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            return None
+        state = _current()
+        if state.pinned or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if state.replica and _available(state.replica):
+            return state.replica
+        for alias in _candidates(replicas):
+            if _available(alias):
+                state.replica = alias
+                with _lock:
+                    _last_used[alias] = time.monotonic()
+                return alias
+        state.replica = None
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _current()
+        state.pinned = state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication.
+        return db == DEFAULT_DB_ALIAS
+
+
+@sync_and_async_middleware
+def replica_pin_middleware(get_response):
+    """Scope routing state to the request and pin it for read-your-writes.
+
+    After a request that wrote, the client gets a cookie that keeps its
+    reads on ``default`` for ``DATABASE_REPLICA_PIN_SECONDS``, the expected
+    upper bound of replication lag.
+    """
+
+    def begin(request):
+        return _state.set(
+            RouteState(
+                pinned=request.method not in SAFE_METHODS
+                or PIN_COOKIE in request.COOKIES
+            )
+        )
+
+    def finish(response, token):
+        state = _state.get()
+        _state.reset(token)
+        if state.wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            token = begin(request)
+            return finish(await get_response(request), token)
+
+    else:
+
+        def middleware(request):
+            token = begin(request)
+            return finish(get_response(request), token)
+
+    return middleware
@@ -0,0 +1,12 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite backend that applies the ``PRAGMAS`` setting on connect."""
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict.get("PRAGMAS", {}).items():
+            # In-memory databases answer journal_mode=wal with "memory".
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
@@ -1,6 +1,14 @@
 from django.contrib import admin
 
-from .models import Item, ItemGroup, ItemPriority, ItemStatus
+from . import search
+from .models import Item, ItemGroup, ItemPriority, ItemStatus, Tag
+from .services.item_service import ItemService
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ["name"]
+    search_fields = ["name"]
 
 
 @admin.register(Item)
@@ -72,6 +80,12 @@ class ItemAdmin(admin.ModelAdmin):
         list_filter = list(super().get_list_filter(request))
         return list_filter
 
+    def get_search_results(self, request, queryset, search_term):
+        """Answer changelist searches from the full-text index"""
+        if not search_term.strip():
+            return queryset, False
+        return search.filter_matches(queryset, search_term), False
+
     def get_search_fields(self, request):
         """Customize search fields"""
         search_fields = list(super().get_search_fields(request))
@@ -90,21 +104,27 @@ class ItemAdmin(admin.ModelAdmin):
     # Custom admin actions
     def make_active(self, request, queryset):
         """Mark selected items as active"""
-        updated = queryset.update(status=ItemStatus.ACTIVE.value)
+        updated = ItemService.update_queryset(
+            queryset, {"status": ItemStatus.ACTIVE.value}
+        )
         self.message_user(request, f"{updated} items marked as active.")
 
     make_active.short_description = "Mark selected items as active"
 
     def make_inactive(self, request, queryset):
         """Mark selected items as inactive"""
-        updated = queryset.update(status=ItemStatus.INACTIVE.value)
+        updated = ItemService.update_queryset(
+            queryset, {"status": ItemStatus.INACTIVE.value}
+        )
         self.message_user(request, f"{updated} items marked as inactive.")
 
     make_inactive.short_description = "Mark selected items as inactive"
 
     def make_urgent(self, request, queryset):
         """Mark selected items as urgent priority"""
-        updated = queryset.update(priority=ItemPriority.URGENT.value)
+        updated = ItemService.update_queryset(
+            queryset, {"priority": ItemPriority.URGENT.value}
+        )
         self.message_user(request, f"{updated} items marked as urgent priority.")
 
     make_urgent.short_description = "Mark selected items as urgent priority"
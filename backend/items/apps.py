@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+
+def _install_search_index(sender, using, **kwargs):
+    from . import search
+
+    search.install(connections[using])
 
 
 class ItemsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "items"
+
+    def ready(self):
+        from . import metrics, signals  # noqa: F401
+
+        # Schema changes can drop the SQLite FTS triggers; restore them.
+        post_migrate.connect(_install_search_index, sender=self)
+        connection_created.connect(metrics.instrument_connection)
@@ -0,0 +1,246 @@
+"""
+Native async counterparts of the item list, detail and stats endpoints.
+
+``items.urls`` serves these instead of the DRF views when
+``ITEMS_ASYNC_VIEWS`` is on, which ``item_manager.asgi`` turns on by default.
+Responses match the sync views (same JSON, status codes and headers).
+Reads use the async ORM, so no worker thread is held while a request waits
+on the database.
+"""
+from functools import wraps
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ParseError, UnsupportedMediaType
+from rest_framework.negotiation import DefaultContentNegotiation
+
+from . import renderers, stream
+from .filters import build_queryset, parse_fields, parse_query
+from .services import item_service
+from .utils.conditional import conditional_get
+from .views import (
+    _active_route,
+    _page_links,
+    _page_params,
+    _priority_route,
+    _status_route,
+    _urgent_route,
+)
+
+_renderer = renderers.FastJSONRenderer()
+_parsers = [renderers.FastJSONParser()]
+_negotiation = DefaultContentNegotiation()
+
+
+def _json(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(
+        _renderer.render(data),
+        status=status_code,
+        content_type=_renderer.media_type,
+    )
+
+
+def _body(request):
+    """Parse a JSON request body the way DRF's JSONParser does.
+
+    An empty body parses as ``{}``; any other body must be sent as JSON,
+    otherwise it is rejected with 415 like the sync views do.
+    """
+    if not request.body:
+        return {}
+    if _negotiation.select_parser(request, _parsers) is None:
+        raise UnsupportedMediaType(request.content_type)
+    try:
+        return renderers.loads(request.body or b"{}")
+    except ValueError as exc:
+        raise ParseError(f"JSON parse error - {exc}")
+
+
+def async_api_view(methods):
+    """``@api_view`` for ``async def`` views.
+
+    Rejects other methods with 405, renders 404, 415 and parse errors like DRF,
+    and exempts the view from CSRF checks as ``@api_view`` does for
+    unauthenticated requests.
+    """
+    allowed = {*methods, "OPTIONS"}
+    if "GET" in methods:
+        allowed.add("HEAD")
+
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            if request.method not in allowed:
+                response = _json(
+                    {"detail": f'Method "{request.method}" not allowed.'},
+                    status.HTTP_405_METHOD_NOT_ALLOWED,
+                )
+                response["Allow"] = ", ".join(sorted(allowed))
+                return response
+            if request.method == "OPTIONS":
+                response = HttpResponse()
+                response["Allow"] = ", ".join(sorted(allowed))
+                return response
+            try:
+                return await view(request, *args, **kwargs)
+            except Http404:
+                return _json({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+            except (NotFound, ParseError, UnsupportedMediaType) as exc:
+                return _json({"detail": exc.detail}, exc.status_code)
+
+        inner.csrf_exempt = True
+        return inner
+
+    return decorator
+
+
+async def _item_list(request, fixed=None):
+    query, error = parse_query(request.GET, fixed)
+    if error:
+        return _json({"error": error}, status.HTTP_400_BAD_REQUEST)
+    page = await item_service.alist_items(**_page_params(request), **query)
+    return _json(_page_links(request, page))
+
+
+def _list_validators(fixed_func=None):
+    """Async ETag/Last-Modified for a list view, see ``views._list_validators``."""
+
+    async def validators(request, *args, **kwargs):
+        fixed = fixed_func(*args, **kwargs) if fixed_func else None
+        query, error = parse_query(request.GET, fixed)
+        if error:
+            return None, None
+        queryset = build_queryset(query["filters"], query["tags"], query["tag_match"])
+        return await item_service.aget_list_validators(
+            queryset,
+            request.get_full_path(),
+            **_page_params(request),
+            ordering=query["ordering"],
+        )
+
+    return validators
+
+
+async def _detail_validators(request, pk):
+    return await item_service.aget_item_validators(pk, request.get_full_path())
+
+
+def _write_response(data, status_code, errors):
+    if errors is None:
+        return _json(data, status_code)
+    return _json(errors, status_code)
+
+
+@conditional_get(_list_validators())
+@async_api_view(["GET", "POST"])
+async def item_list(request):
+    """
+    List items, optionally filtered and sorted, or create a new item.
+    """
+    if request.method == "POST":
+        return _write_response(*await item_service.acreate_item(_body(request)))
+    return await _item_list(request)
+
+
+@conditional_get(_detail_validators)
+@async_api_view(["GET", "PATCH"])
+async def item_detail(request, pk):
+    """
+    Retrieve or update a specific item.
+    """
+    if request.method == "PATCH":
+        return _write_response(*await item_service.aupdate_item(pk, _body(request)))
+    fields, error = parse_fields(request.GET)
+    if error:
+        return _json({"error": error}, status.HTTP_400_BAD_REQUEST)
+    return _json(await item_service.aget_item(pk, fields))
+
+
+@conditional_get(_list_validators(_status_route))
+@async_api_view(["GET"])
+async def items_by_status(request, status_value):
+    """
+    Get items filtered by status; alias of ``/items/?status=<status_value>``.
+    """
+    return await _item_list(request, _status_route(status_value))
+
+
+@conditional_get(_list_validators(_priority_route))
+@async_api_view(["GET"])
+async def items_by_priority(request, priority_value):
+    """
+    Get items filtered by priority; alias of ``/items/?priority=<priority_value>``.
+    """
+    return await _item_list(request, _priority_route(priority_value))
+
+
+@conditional_get(_list_validators(_urgent_route))
+@async_api_view(["GET"])
+async def urgent_items(request):
+    """
+    Get all urgent items; alias of ``/items/?priority=urgent``.
+    """
+    return await _item_list(request, _urgent_route())
+
+
+@conditional_get(_list_validators(_active_route))
+@async_api_view(["GET"])
+async def active_items(request):
+    """
+    Get all active items; alias of ``/items/?status=active``.
+    """
+    return await _item_list(request, _active_route())
+
+
+@async_api_view(["GET"])
+async def item_stats(request):
+    """
+    Inventory counts, quantity and value in total and per status/priority/group.
+    """
+    live = request.GET.get("live", "false").lower() in ("true", "1")
+    return _json(await item_service.aget_item_stats(live))
+
+
+@async_api_view(["GET"])
+async def items_stream(request):
+    """
+    Push item changes as Server-Sent Events; resumes from ``Last-Event-ID``.
+    """
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI Django would buffer the endless response.
+        return _json(
+            {"error": "The item stream is only served over ASGI."},
+            status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    since = request.headers.get("Last-Event-ID") or request.GET.get("since")
+    if since:
+        item_service.changes_position(since)  # 404 on an invalid cursor
+
+    # Subscribe before reading the catch-up, so no change falls in between.
+    broker = stream.get_broker()
+    subscriber, cursor = broker.subscribe()
+    first_page = None
+    if since:
+        try:
+            first_page, status_code, errors = await item_service.alist_changes(
+                since, item_service.MAX_CHANGES_PAGE_SIZE
+            )
+        except BaseException:
+            broker.unsubscribe(subscriber)
+            raise
+        if errors:
+            broker.unsubscribe(subscriber)
+            return _json(errors, status_code)
+        cursor = since
+
+    response = StreamingHttpResponse(
+        stream.event_stream(
+            subscriber, cursor, first_page, request.scope.get("items.disconnected")
+        ),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Tell nginx not to buffer the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
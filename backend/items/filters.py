@@ -0,0 +1,155 @@
+"""
+Composable filters and sort keys for item list queries.
+
+``parse_query`` validates list query parameters such as
+``?status=active&priority__in=high,urgent&price__lt=100&ordering=-quantity``
+against the enums and field types; ``build_queryset`` compiles the result
+into a single queryset. Only orderings backed by an index are accepted;
+``explain_items`` checks the plan of every filter and ordering pair.
+``parse_fields`` validates the ``?fields=``/``?omit=`` sparse fieldsets
+accepted by every item read.
+"""
+from decimal import Decimal, InvalidOperation
+
+from .constants import ITEM_GROUPS, ITEM_PRIORITIES, ITEM_STATUSES
+from .models import Item
+from .serializers import ItemReadSerializer
+
+ENUM_FILTERS = {
+    "status": ITEM_STATUSES,
+    "priority": ITEM_PRIORITIES,
+    "group": ITEM_GROUPS,
+}
+RANGE_FILTERS = {
+    "price": (Decimal, "a number"),
+    "quantity": (int, "an integer"),
+}
+RANGE_LOOKUPS = ["lt", "lte", "gt", "gte"]
+MAX_IN_VALUES = 20
+
+# Range values must bind as a 64-bit integer or fit the decimal column.
+MAX_INTEGER = 2**63 - 1
+
+# Each sort key is backed by an index on (key, id) or (-key, -id), and by
+# one on (filter, key, id) for each enum filter, so every filter and
+# ordering pair reads its page in index order.
+ORDERINGS = ["-created_at", "created_at", "-quantity", "quantity"]
+DEFAULT_ORDERING = "-created_at"
+
+# Except tag filters: their items are found through the ItemTag index and
+# fetched by primary key, so only the tagged items are sorted.
+TAG_MATCHES = ["any", "all"]
+MAX_TAG_FILTERS = 20
+
+
+def parse_query(params, fixed=None):
+    """Validate the filter, tag and ordering parameters of a list request.
+
+    ``params`` is a ``QueryDict``; ``fixed`` holds filters imposed by the
+    route (e.g. ``{"status": "active"}``) and wins over the query string.
+    Returns ``(query, error)`` where ``query`` holds the keyword arguments
+    for ``item_service.list_items`` and ``error`` is a message or ``None``.
+    """
+    fixed = fixed or {}
+
+    filters = {}
+    for field, valid_values in ENUM_FILTERS.items():
+        value = fixed.get(field, params.get(field))
+        if value is not None:
+            if value not in valid_values:
+                return None, f"Invalid {field}. Must be one of: {valid_values}"
+            filters[field] = value
+        if field in fixed or params.get(f"{field}__in") is None:
+            continue
+        values = [v for v in params[f"{field}__in"].split(",") if v]
+        invalid = [v for v in values if v not in valid_values]
+        if invalid or not values:
+            return None, f"Invalid {field}__in. Must be a list of: {valid_values}"
+        if len(values) > MAX_IN_VALUES:
+            return None, f"At most {MAX_IN_VALUES} values are allowed in {field}__in."
+        filters[f"{field}__in"] = values
+
+    for field, (parse, expected) in RANGE_FILTERS.items():
+        for lookup in ["", *(f"__{name}" for name in RANGE_LOOKUPS)]:
+            raw = params.get(f"{field}{lookup}")
+            if raw is None:
+                continue
+            try:
+                value = parse(raw)
+            except (ValueError, InvalidOperation):
+                value = None
+            if value is None or not _in_column_range(field, value):
+                return None, f"Invalid {field}{lookup}. Must be {expected}."
+            filters[f"{field}{lookup}"] = value
+
+    tags = params.getlist("tag")
+    tag_match = params.get("tag_match", "any")
+    if tag_match not in TAG_MATCHES:
+        return None, f"Invalid tag_match. Must be one of: {TAG_MATCHES}"
+    if len(tags) > MAX_TAG_FILTERS:
+        return None, f"At most {MAX_TAG_FILTERS} tag filters are allowed."
+
+    ordering = params.get("ordering", DEFAULT_ORDERING)
+    if ordering not in ORDERINGS:
+        return None, f"Invalid ordering. Must be one of: {ORDERINGS}"
+
+    fields, error = parse_fields(params)
+    if error:
+        return None, error
+
+    return {
+        "filters": filters,
+        "tags": tags,
+        "tag_match": tag_match,
+        "ordering": ordering,
+        "fields": fields,
+    }, None
+
+
+def _in_column_range(field, value):
+    """Whether ``value`` can be compared with ``field`` by the database."""
+    if isinstance(value, int):
+        return -MAX_INTEGER - 1 <= value <= MAX_INTEGER
+    if not value.is_finite():
+        return False
+    model_field = Item._meta.get_field(field)
+    limit = Decimal(10) ** (model_field.max_digits - model_field.decimal_places)
+    # Check before rounding: huge exponents cannot be rounded.
+    return abs(value) < limit and abs(round(value, model_field.decimal_places)) < limit
+
+
+def parse_fields(params):
+    """Validate ``?fields=id,name`` and ``?omit=description``.
+
+    Returns ``(fields, error)``. ``fields`` is a tuple of the item fields
+    to render, in their usual order, or ``None`` for all of them.
+    """
+    chosen = {}
+    for name in ("fields", "omit"):
+        values = {value.strip() for value in params.get(name, "").split(",")}
+        values.discard("")
+        unknown = sorted(values - set(ItemReadSerializer.fields))
+        if unknown:
+            return None, (
+                f"Invalid {name}: {unknown}. "
+                f"Must be a list of: {list(ItemReadSerializer.fields)}"
+            )
+        chosen[name] = values
+
+    fields = tuple(
+        field
+        for field in ItemReadSerializer.fields
+        if (not chosen["fields"] or field in chosen["fields"])
+        and field not in chosen["omit"]
+    )
+    if not fields:
+        return None, "fields and omit leave no field to return."
+    if fields == ItemReadSerializer.fields:
+        return None, None
+    return fields, None
+
+
+def build_queryset(filters=None, tags=None, tag_match="any"):
+    """Compile validated filters into one (unordered) item queryset."""
+    items = Item.get_by_tags(tags, tag_match) if tags else Item.objects.all()
+    return items.filter(**(filters or {}))
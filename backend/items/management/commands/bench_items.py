@@ -0,0 +1,325 @@
+import gc
+import json
+import math
+import platform
+import random
+import resource
+import time
+import tracemalloc
+from contextlib import ExitStack
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from ...enums import ItemPriority, ItemStatus
+from ...models import Item
+from ...services.tag_service import sync_item_tags
+from ...utils.seeding import TAGS, seed_items
+
+# A regression must exceed the threshold (relative to the baseline) on
+# these; query counts fail on any increase.
+COMPARED = ("p50_ms", "peak_memory_kb")
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every item endpoint in process against a freshly created and "
+        "seeded test database. Reports throughput, latency percentiles, queries "
+        "per request and peak memory, and optionally fails on regressions "
+        "against a saved baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--items", type=int, default=10000, help="Synthetic items to seed."
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+        parser.add_argument(
+            "--iterations", type=int, default=200, help="Timed requests per endpoint."
+        )
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=3,
+            help="Timed rounds per endpoint; the fastest is reported.",
+        )
+        parser.add_argument(
+            "--only",
+            action="append",
+            metavar="NAME",
+            help="Run only this benchmark (repeatable).",
+        )
+        parser.add_argument(
+            "--cache",
+            action="store_true",
+            help="Keep the item read cache on (off by default, so reads hit the "
+            "serializers and the database).",
+        )
+        parser.add_argument("--json", dest="json_path", help="Write the report here.")
+        parser.add_argument(
+            "--baseline", help="Compare against a report saved with --json."
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Allowed relative slowdown/growth against --baseline (0.2 = 20%%).",
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            try:
+                with open(options["baseline"]) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read baseline: {exc}")
+
+        settings.ITEMS_CACHE_ENABLED = options["cache"]
+        setup_test_environment(debug=False)
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            self.stdout.write(f"Seeding {options['items']} items...")
+            pks = seed(options["items"], options["seed"])
+            results = {}
+            for name, method, make_request, scale in scenarios(pks, options["seed"]):
+                if options["only"] and name not in options["only"]:
+                    continue
+                results[name] = run_benchmark(
+                    method,
+                    make_request,
+                    max(1, options["iterations"] // scale),
+                    max(0, options["warmup"] // scale),
+                    options["rounds"],
+                )
+                if results[name]["errors"]:
+                    self.stdout.write(
+                        self.style.WARNING(f"{name}: {results[name]['errors']} errors")
+                    )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            "environment": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connections["default"].vendor,
+                "items": options["items"],
+                "seed": options["seed"],
+                "iterations": options["iterations"],
+                "rounds": options["rounds"],
+                "cache": options["cache"],
+            },
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "results": results,
+        }
+        self.print_results(results)
+        if options["json_path"]:
+            with open(options["json_path"], "w") as f:
+                json.dump(report, f, indent=2)
+
+        errors = [name for name, result in results.items() if result["errors"]]
+        if errors:
+            raise CommandError(f"Requests failed in: {', '.join(errors)}")
+        if baseline is not None:
+            regressions = compare(results, baseline["results"], options["threshold"])
+            for line in regressions:
+                self.stdout.write(self.style.ERROR(f"REGRESSION {line}"))
+            if regressions:
+                raise CommandError(
+                    f"{len(regressions)} regressions against {options['baseline']}."
+                )
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
+
+    def print_results(self, results):
+        self.stdout.write(
+            f"{'benchmark':<22}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+            f"{'p99 ms':>9}{'queries':>9}{'peak KB':>9}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<22}{result['rps']:>9.1f}{result['p50_ms']:>9.2f}"
+                f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                f"{result['queries']:>9.1f}{result['peak_memory_kb']:>9.1f}"
+            )
+
+
+def seed(count: int, seed_value: int) -> list:
+    """Insert ``count`` synthetic items with their tag links; return the pks."""
+    seed_items(Item, count, seed=seed_value, prefix="bench")
+    pairs = list(Item.objects.values_list("pk", "tags"))
+    for start in range(0, len(pairs), 2000):
+        sync_item_tags(pairs[start : start + 2000])
+    return [pk for pk, _ in pairs]
+
+
+def scenarios(pks: list, seed_value: int):
+    """Yield ``(name, method, make_request, scale)`` for each endpoint.
+
+    ``make_request(i)`` returns the path and JSON body of the i-th request;
+    ``scale`` divides the iteration count for expensive endpoints.
+    """
+    rng = random.Random(seed_value)
+    sample = [rng.choice(pks) for _ in range(1000)]
+
+    def get(path):
+        return lambda i: (path, None)
+
+    yield "constants", "get", get("/api/items/constants/"), 1
+    yield "list", "get", get("/api/items/"), 1
+    yield "list_filtered", "get", get(
+        "/api/items/?status=active&priority__in=high,urgent&price__lt=2000"
+    ), 1
+    yield "list_by_quantity", "get", get("/api/items/?ordering=-quantity"), 1
+    yield "list_by_tag", "get", get(
+        f"/api/items/?tag={TAGS[0]}&tag={TAGS[1]}&tag_match=all"
+    ), 1
+    for value in ItemStatus.values():
+        yield f"status_{value}", "get", get(f"/api/items/status/{value}/"), 1
+    for value in ItemPriority.values():
+        yield f"priority_{value}", "get", get(f"/api/items/priority/{value}/"), 1
+    yield "urgent", "get", get("/api/items/urgent/"), 1
+    yield "active", "get", get("/api/items/active/"), 1
+    yield "detail", "get", lambda i: (f"/api/items/{sample[i % 1000]}/", None), 1
+    yield "search", "get", get(f"/api/items/search/?q={TAGS[2]}"), 1
+    yield "stats", "get", get("/api/items/stats/"), 1
+    yield "create", "post", lambda i: (
+        "/api/items/",
+        {"name": f"bench-create-{i}", "price": "19.99", "quantity": 3},
+    ), 1
+    yield "patch", "patch", lambda i: (
+        f"/api/items/{sample[i % 1000]}/",
+        {"quantity": i % 50 + 1, "tags": TAGS[i % len(TAGS)]},
+    ), 1
+    yield "bulk_create", "post", lambda i: (
+        "/api/items/bulk/",
+        [{"name": f"bench-bulk-{i}-{n}", "quantity": n + 1} for n in range(100)],
+    ), 10
+    yield "bulk_update", "patch", lambda i: (
+        "/api/items/bulk/",
+        {"filter": {"priority": "urgent"}, "fields": {"quantity": i % 50 + 1}},
+    ), 10
+    yield "export", "get", get("/api/items/export/?output=ndjson"), 50
+
+
+def run_benchmark(
+    method: str, make_request, iterations: int, warmup: int, rounds: int
+) -> dict:
+    """Time ``rounds`` rounds of ``iterations`` requests and keep the fastest.
+
+    Like ``timeit``, the best round is the one least disturbed by other load
+    on the machine. Peak memory is measured separately afterwards.
+    """
+    client = Client()
+    send = getattr(client, method)
+    index = 0
+
+    def request():
+        nonlocal index
+        path, body = make_request(index)
+        index += 1
+        if body is None:
+            response = send(path)
+        else:
+            response = send(path, body, content_type="application/json")
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response.status_code
+
+    for _ in range(warmup):
+        request()
+
+    counter = QueryCounter()
+    best = None
+    for _ in range(rounds):
+        queries = []
+        latencies = []
+        errors = 0
+        gc.collect()
+        with counter.installed():
+            started = time.perf_counter()
+            for _ in range(iterations):
+                counter.count = 0
+                request_started = time.perf_counter()
+                if request() >= 400:
+                    errors += 1
+                latencies.append(time.perf_counter() - request_started)
+                queries.append(counter.count)
+            elapsed = time.perf_counter() - started
+        latencies.sort()
+        result = {
+            "requests": iterations,
+            "errors": errors,
+            "rps": iterations / elapsed if elapsed else 0.0,
+            "mean_ms": sum(latencies) / len(latencies) * 1000,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "queries": sum(queries) / len(queries),
+            "max_queries": max(queries),
+        }
+        if best is None or result["p50_ms"] < best["p50_ms"]:
+            best = {**result, "errors": max(errors, best["errors"] if best else 0)}
+
+    # tracemalloc slows everything down, so it gets its own few requests.
+    tracemalloc.start()
+    peak = 0
+    for _ in range(min(iterations, 10)):
+        tracemalloc.reset_peak()
+        request()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    return {**best, "rounds": rounds, "peak_memory_kb": peak / 1024}
+
+
+def percentile(latencies: list, p: float) -> float:
+    return latencies[max(0, math.ceil(p / 100 * len(latencies)) - 1)] * 1000
+
+
+class QueryCounter:
+    """Count SQL statements on every database connection of this thread."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def installed(self):
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(self))
+        return stack
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Describe every benchmark that regressed against ``baseline``."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        for key in COMPARED:
+            if before[key] and result[key] > before[key] * (1 + threshold):
+                regressions.append(
+                    f"{name} {key}: {before[key]:.2f} -> {result[key]:.2f} "
+                    f"(+{(result[key] / before[key] - 1) * 100:.0f}%)"
+                )
+        if result["max_queries"] > before["max_queries"]:
+            regressions.append(
+                f"{name} queries: {before['max_queries']} -> {result['max_queries']}"
+            )
+    return regressions
@@ -0,0 +1,172 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.http import QueryDict
+
+from ...enums import ItemGroup, ItemPriority, ItemStatus
+from ...filters import (
+    DEFAULT_ORDERING,
+    ENUM_FILTERS,
+    ORDERINGS,
+    RANGE_FILTERS,
+    build_queryset,
+    parse_query,
+)
+from ...models import Item
+from ...services.item_service import ItemService
+from ...utils.seeding import TAGS, seed_items
+
+# Cursor positions used when the table is empty.
+CURSOR_VALUES = {"created_at": "2024-01-01T00:00:00Z", "quantity": 1}
+
+# Bounds used for the range filters.
+RANGE_VALUES = {"price": "100", "quantity": "100"}
+
+# Plan fragments that mean a full table scan.
+SCAN_PATTERNS = {
+    "sqlite": [re.compile(r"\bSCAN items_item\b(?!.*USING (COVERING )?INDEX)")],
+    "postgresql": [re.compile(r"\bSeq Scan on items_item\b")],
+}
+
+# Plan fragments that mean a sort outside the index. Tag filters sort their
+# matches (see ``filters.TAG_MATCHES``) and are only checked for scans.
+SORT_PATTERNS = {
+    "sqlite": [re.compile(r"USE TEMP B-TREE FOR ORDER BY")],
+    "postgresql": [re.compile(r"^\s*(->\s+)?Sort\b", re.MULTILINE)],
+}
+
+# A cursor page must seek into the index at the cursor: its plan has to
+# bound the index range, not walk the index and filter the rows.
+SEEK_PATTERNS = {
+    "sqlite": re.compile(r"\bSEARCH items_item USING (COVERING )?INDEX \w+ \(.*[<>]"),
+    "postgresql": re.compile(r"Index Cond: .*[<>]"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the first page and a cursor page of each Item.get_by_* "
+        "access path and each allowed filter and ordering pair, and fail if "
+        "any of them scans the table, sorts outside an index or does not seek "
+        "to the cursor."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Insert this many synthetic items first (rolled back afterwards).",
+        )
+        parser.add_argument("--verbose-plans", action="store_true")
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        patterns = SCAN_PATTERNS.get(vendor)
+        if patterns is None:
+            raise CommandError(f"No plan checks for database '{vendor}'.")
+
+        failures = []
+        with transaction.atomic():
+            if options["seed"]:
+                seed_items(Item, options["seed"], prefix="explain")
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+
+            for label, queryset, ordering, sorted_ in self.access_paths():
+                checks = patterns if sorted_ else patterns + SORT_PATTERNS[vendor]
+                for page_label, page in self.pages(queryset, ordering):
+                    label_page = f"{label} [{page_label}]"
+                    plan = page.explain()
+                    bad = [p.pattern for p in checks if p.search(plan)]
+                    seek = SEEK_PATTERNS[vendor]
+                    if (
+                        page_label == "cursor page"
+                        and not sorted_
+                        and not seek.search(plan)
+                    ):
+                        bad.append(seek.pattern)
+                    if bad:
+                        failures.append(label_page)
+                        self.stdout.write(self.style.ERROR(f"SCAN  {label_page}"))
+                    else:
+                        self.stdout.write(self.style.SUCCESS(f"INDEX {label_page}"))
+                    if bad or options["verbose_plans"]:
+                        self.stdout.write(plan)
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"Unindexed access paths: {', '.join(failures)}")
+
+    def pages(self, queryset, ordering):
+        """The first page and a page after a cursor, as the list API runs them."""
+        rows, _ = ItemService._page_query(queryset, None, None, ordering, None)
+        yield "first page", rows
+        field = ordering.lstrip("-")
+        sign = "-" if ordering.startswith("-") else ""
+        page_size = ItemService.page_size
+        positions = queryset.order_by(ordering, f"{sign}id").values_list(field, "id")
+        position = next(iter(positions[page_size : page_size + 1]), None)
+        if position is None:
+            # Too few rows for a second page; any position gives a plan.
+            value = Item._meta.get_field(field).to_python(CURSOR_VALUES[field])
+            position = (value, 0)
+        cursor = ItemService.encode_cursor(field, position)
+        rows, _ = ItemService._page_query(queryset, cursor, None, ordering, None)
+        yield "cursor page", rows
+
+    def access_paths(self):
+        """``(label, queryset, ordering, sorted)`` for every list access path.
+
+        ``sorted`` marks tag-filtered paths, whose matches may be sorted.
+        """
+        paths = [("Item.objects.all", Item.objects.all())]
+        paths += [
+            (f"Item.get_by_status({value!r})", Item.get_by_status(value))
+            for value in ItemStatus.values()
+        ]
+        paths += [
+            (f"Item.get_by_priority({value!r})", Item.get_by_priority(value))
+            for value in ItemPriority.values()
+        ]
+        paths += [
+            (f"Item.get_by_group({value!r})", Item.get_by_group(value))
+            for value in ItemGroup.values()
+        ]
+        paths += [
+            ("Item.get_urgent_items", Item.get_urgent_items()),
+            ("Item.get_active_items", Item.get_active_items()),
+        ]
+        for label, queryset in paths:
+            yield label, queryset, DEFAULT_ORDERING, False
+        for ordering in ORDERINGS:
+            for params in self.list_filters():
+                query, error = parse_query(QueryDict(f"{params}ordering={ordering}"))
+                if error:
+                    raise CommandError(f"?{params}ordering={ordering}: {error}")
+                queryset = build_queryset(
+                    query["filters"], query["tags"], query["tag_match"]
+                )
+                yield (
+                    f"?{params}ordering={ordering}",
+                    queryset,
+                    ordering,
+                    bool(query["tags"]),
+                )
+
+    def list_filters(self):
+        """Query strings for each kind of list filter, each ending in ``&``."""
+        yield ""
+        for field, values in ENUM_FILTERS.items():
+            for value in values:
+                yield f"{field}={value}&"
+            yield f"{field}__in={','.join(values[:2])}&"
+        for field in RANGE_FILTERS:
+            yield f"{field}__gte={RANGE_VALUES[field]}&"
+        statuses, priorities = ENUM_FILTERS["status"], ENUM_FILTERS["priority"]
+        yield f"status={statuses[0]}&priority={priorities[0]}&"
+        yield f"tag={TAGS[0]}&"
+        yield f"tag={TAGS[0]}&tag={TAGS[1]}&"
+        yield f"tag={TAGS[0]}&tag={TAGS[1]}&tag_match=all&"
@@ -0,0 +1,192 @@
+import itertools
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services import import_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Import items from a CSV, NDJSON or JSON-array file. Records are "
+        "streamed, validated and written in batches, one transaction per batch; "
+        "after a failure, rerun with --resume to continue from the last "
+        "committed batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="File to import.")
+        parser.add_argument(
+            "--format",
+            choices=import_service.FORMATS,
+            help="File format (default: from the extension; .jsonl is ndjson).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Records validated and written per transaction.",
+        )
+        parser.add_argument(
+            "--on-conflict",
+            choices=import_service.CONFLICT_MODES,
+            default="error",
+            help="What to do with a record whose (name, group) already exists: "
+            "reject it (default), skip it, or update the existing item.",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use bulk_create on PostgreSQL instead of COPY.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Progress file for --resume (default: <file>.checkpoint).",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the records committed by a previous, interrupted run.",
+        )
+        parser.add_argument(
+            "--rejects",
+            help="Append rejected records and their errors to this NDJSON file.",
+        )
+        parser.add_argument(
+            "--progress-every",
+            type=float,
+            default=5.0,
+            metavar="SECONDS",
+            help="Seconds between progress lines.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["file"]
+        file_format = options["format"] or import_service.detect_format(path)
+        if file_format is None:
+            raise CommandError(f"Cannot tell the format of {path}; pass --format.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        try:
+            stat = os.stat(path)
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+
+        checkpoint_path = options["checkpoint"] or f"{path}.checkpoint"
+        identity = {
+            "file": os.path.abspath(path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "format": file_format,
+            "on_conflict": options["on_conflict"],
+        }
+        progress = {"records": 0, "accepted": 0, "rejected": 0, "dropped": 0}
+        if options["resume"]:
+            progress = self.load_checkpoint(checkpoint_path, identity)
+            self.stdout.write(f"Resuming after record {progress['records']}.")
+        elif os.path.exists(checkpoint_path):
+            raise CommandError(
+                f"{checkpoint_path} exists from an interrupted import; pass "
+                "--resume to continue it or delete the file to start over."
+            )
+
+        rejects = open(options["rejects"], "a") if options["rejects"] else None
+        started = last_report = time.monotonic()
+        resumed_at = progress["records"]
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as stream:
+                records = import_service.read_records(stream, file_format)
+                # Committed records are parsed again but not validated.
+                for _ in itertools.islice(records, progress["records"]):
+                    pass
+                while True:
+                    batch = list(itertools.islice(records, options["batch_size"]))
+                    if not batch:
+                        break
+                    self.import_batch(batch, progress, options, rejects)
+                    with open(checkpoint_path, "w") as f:
+                        json.dump({**identity, **progress}, f)
+                    now = time.monotonic()
+                    if now - last_report >= options["progress_every"]:
+                        last_report = now
+                        self.report(progress, resumed_at, now - started)
+        except CommandError:
+            raise
+        except Exception as exc:
+            raise CommandError(
+                f"Import stopped after record {progress['records']}: {exc!r}. "
+                "Fix the cause and rerun with --resume to continue."
+            )
+        finally:
+            if rejects:
+                rejects.close()
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        self.report(progress, resumed_at, time.monotonic() - started)
+        if progress["rejected"]:
+            self.stdout.write(
+                self.style.WARNING(f"{progress['rejected']} records were rejected.")
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("Import complete."))
+
+    def import_batch(self, batch, progress, options, rejects):
+        start = progress["records"]
+        rows, errors = import_service.clean_batch(batch, start)
+        dropped = import_service.resolve_duplicates(
+            rows, errors, options["on_conflict"]
+        )
+        import_service.write_batch(
+            list(rows.values()), options["on_conflict"], not options["no_copy"]
+        )
+        if rejects:
+            for index in sorted(errors):
+                record = batch[index - start]
+                if isinstance(record, ValueError):
+                    # An NDJSON line that is not JSON: keep it as it was.
+                    record = getattr(record, "doc", str(record)).rstrip("\r\n")
+                rejects.write(
+                    json.dumps(
+                        {"index": index, "record": record, "errors": errors[index]}
+                    )
+                )
+                rejects.write("\n")
+            rejects.flush()
+        elif errors and not progress["rejected"]:
+            index = min(errors)
+            self.stderr.write(
+                f"Record {index} rejected: {errors[index]} (pass --rejects to "
+                "save every rejected record)."
+            )
+        progress["records"] = start + len(batch)
+        progress["accepted"] += len(rows)
+        progress["rejected"] += len(errors)
+        progress["dropped"] += dropped
+
+    def load_checkpoint(self, checkpoint_path, identity):
+        try:
+            with open(checkpoint_path) as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read checkpoint: {exc}")
+        for key, value in identity.items():
+            if checkpoint.get(key) != value:
+                raise CommandError(
+                    f"{checkpoint_path} was written for a different {key} "
+                    f"({checkpoint.get(key)!r}, now {value!r})."
+                )
+        return {
+            key: checkpoint[key]
+            for key in ("records", "accepted", "rejected", "dropped")
+        }
+
+    def report(self, progress, resumed_at, elapsed):
+        rate = (progress["records"] - resumed_at) / elapsed if elapsed else 0.0
+        self.stdout.write(
+            f"{progress['records']} records: {progress['accepted']} accepted, "
+            f"{progress['rejected']} rejected, {progress['dropped']} duplicates "
+            f"dropped ({rate:.0f} records/s)"
+        )
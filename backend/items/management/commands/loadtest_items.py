@@ -0,0 +1,174 @@
+import asyncio
+import json
+import math
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Send concurrent keep-alive GET requests to one or more running servers "
+        "and compare throughput and latency percentiles, e.g. WSGI vs ASGI."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            action="append",
+            required=True,
+            metavar="LABEL=URL",
+            help="Server to test, e.g. asgi=http://127.0.0.1:8001/api/items/. "
+            "Repeat to compare several; they are tested one after another.",
+        )
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument(
+            "--duration", type=float, default=10.0, help="Seconds per target."
+        )
+        parser.add_argument(
+            "--warmup", type=float, default=2.0, help="Unmeasured seconds first."
+        )
+        parser.add_argument("--json", dest="json_path", help="Also write results here.")
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options["target"]:
+            label, sep, url = target.partition("=")
+            parts = urlsplit(url)
+            if not sep or parts.scheme != "http" or not parts.hostname:
+                raise CommandError(
+                    f"Expected LABEL=http://host:port/path, got {target!r}"
+                )
+            targets.append((label, parts))
+
+        results = {}
+        for label, parts in targets:
+            if options["warmup"]:
+                asyncio.run(run_load(parts, options["concurrency"], options["warmup"]))
+            latencies, errors, elapsed = asyncio.run(
+                run_load(parts, options["concurrency"], options["duration"])
+            )
+            results[label] = summarize(latencies, errors, elapsed)
+            results[label]["url"] = parts.geturl()
+
+        self.stdout.write(
+            f"{'target':<12}{'requests':>10}{'errors':>8}{'req/s':>10}"
+            f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+        )
+        for label, result in results.items():
+            self.stdout.write(
+                f"{label:<12}{result['requests']:>10}{result['errors']:>8}"
+                f"{result['rps']:>10.1f}{result['p50_ms']:>9.1f}"
+                f"{result['p90_ms']:>9.1f}{result['p99_ms']:>9.1f}"
+                f"{result['max_ms']:>9.1f}"
+            )
+        if options["json_path"]:
+            with open(options["json_path"], "w") as f:
+                json.dump(
+                    {"concurrency": options["concurrency"], "results": results},
+                    f,
+                    indent=2,
+                )
+
+
+async def run_load(parts, concurrency: int, duration: float):
+    """Run ``concurrency`` clients against ``parts`` for ``duration`` seconds."""
+    path = parts.path or "/"
+    if parts.query:
+        path += f"?{parts.query}"
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+        "Accept: application/json\r\nConnection: keep-alive\r\n\r\n"
+    ).encode()
+    deadline = time.perf_counter() + duration
+    latencies = []
+    errors = [0]
+
+    async def client():
+        reader = writer = None
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            reused = writer is not None
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(
+                        parts.hostname, parts.port or 80
+                    )
+                writer.write(request)
+                status_code, keep_alive = await read_response(reader)
+            except (asyncio.IncompleteReadError, ConnectionError) as exc:
+                writer = _close(writer)
+                if reused and not getattr(exc, "partial", None):
+                    # The server closed an idle keep-alive connection (e.g. a
+                    # recycled worker); retry on a new one like any client.
+                    continue
+                errors[0] += 1
+                continue
+            except (OSError, ValueError):
+                errors[0] += 1
+                writer = _close(writer)
+                await asyncio.sleep(0.01)
+                continue
+            latencies.append(time.perf_counter() - started)
+            if status_code >= 400:
+                errors[0] += 1
+            if not keep_alive:
+                writer = _close(writer)
+        _close(writer)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors[0], time.perf_counter() - started
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response; return ``(status, keep_alive)``."""
+    status_line = await reader.readuntil(b"\r\n")
+    status_code = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readuntil(b"\r\n")
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    keep_alive = headers.get("connection", "").lower() != "close"
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.read()
+        keep_alive = False
+    return status_code, keep_alive
+
+
+def _close(writer):
+    if writer is not None:
+        writer.close()
+    return None
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+
+    def percentile(p):
+        if not latencies:
+            return 0.0
+        return latencies[max(0, math.ceil(p / 100 * len(latencies)) - 1)] * 1000
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(50),
+        "p90_ms": percentile(90),
+        "p99_ms": percentile(99),
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
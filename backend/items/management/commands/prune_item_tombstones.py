@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...models import ItemTombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete item tombstones older than ITEMS_TOMBSTONE_RETENTION_DAYS. The "
+        "change feed already refuses cursors that old, so they are never read."
+    )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(
+            days=settings.ITEMS_TOMBSTONE_RETENTION_DAYS
+        )
+        deleted, _ = ItemTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(f"Deleted {deleted} tombstones older than {cutoff}.")
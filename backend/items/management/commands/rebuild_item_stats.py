@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services import stats_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the inventory statistics summary from the item table, then "
+        "verify it against a live GROUP BY aggregate."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify-only",
+            action="store_true",
+            help="Only compare the summary with the live aggregate.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["verify_only"]:
+            rebuilt = stats_service.rebuild()
+            self.stdout.write(f"Rebuilt {rebuilt} statistics rows.")
+
+        drift = stats_service.verify()
+        for (dimension, key), stored, live in drift:
+            bucket = f"{dimension}={key}" if key else dimension
+            self.stdout.write(
+                self.style.ERROR(f"DRIFT {bucket}: summary {stored}, live {live}")
+            )
+        if drift:
+            raise CommandError(f"{len(drift)} statistics rows differ from the items.")
+        self.stdout.write(self.style.SUCCESS("Statistics match the item table."))
@@ -0,0 +1,129 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils.module_loading import import_string
+from gunicorn.app.base import BaseApplication
+
+from ...services import cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the project with pre-forked gunicorn workers: the application is "
+        "loaded once and shared copy-on-write, workers are recycled after "
+        "--max-requests, and SIGHUP gracefully replaces them."
+    )
+    # Checks import the URLconf, which depends on --asgi; run them in handle().
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bind", default=settings.SERVE_BIND)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.SERVE_WORKERS,
+            help="Worker processes (default: one per CPU core).",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.SERVE_THREADS,
+            help="Threads per WSGI worker; ignored with --asgi.",
+        )
+        parser.add_argument(
+            "--asgi",
+            action="store_true",
+            default=settings.SERVE_ASGI,
+            help="Serve item_manager.asgi with uvicorn workers.",
+        )
+        parser.add_argument(
+            "--max-requests", type=int, default=settings.SERVE_MAX_REQUESTS
+        )
+        parser.add_argument(
+            "--max-requests-jitter",
+            type=int,
+            default=settings.SERVE_MAX_REQUESTS_JITTER,
+        )
+        parser.add_argument(
+            "--keepalive",
+            type=int,
+            default=settings.SERVE_KEEPALIVE,
+            help="Seconds to hold idle keep-alive connections open.",
+        )
+        parser.add_argument("--timeout", type=int, default=settings.SERVE_TIMEOUT)
+        parser.add_argument(
+            "--graceful-timeout", type=int, default=settings.SERVE_GRACEFUL_TIMEOUT
+        )
+        parser.add_argument(
+            "--no-preload",
+            action="store_true",
+            help="Load the app in each worker, so SIGHUP also picks up new code.",
+        )
+        parser.add_argument("--pidfile")
+
+    def handle(self, *args, **options):
+        if options["asgi"]:
+            if "ITEMS_ASYNC_VIEWS" not in os.environ:
+                # Same default as item_manager.asgi; set before the URLconf loads.
+                settings.ITEMS_ASYNC_VIEWS = True
+            app_path = settings.ASGI_APPLICATION
+            worker_class = "uvicorn.workers.UvicornWorker"
+        else:
+            app_path = settings.WSGI_APPLICATION
+            worker_class = "gthread"
+        self.check()
+
+        workers = options["workers"] or os.cpu_count() or 1
+        if workers > 1 and settings.ITEMS_CACHE_ENABLED and cache.process_local():
+            # Set before forking, so every worker inherits it.
+            settings.ITEMS_CACHE_ENABLED = False
+            self.stderr.write(
+                self.style.WARNING(
+                    f"The item read cache is a per-process LocMemCache, which "
+                    f"{workers} workers cannot share; it is disabled. Set "
+                    "ITEMS_CACHE_BACKEND to a shared backend (file, Redis, "
+                    "Memcached) to keep it."
+                )
+            )
+
+        config = {
+            "bind": options["bind"],
+            "workers": workers,
+            "worker_class": worker_class,
+            "threads": options["threads"],
+            "preload_app": not options["no_preload"],
+            "max_requests": options["max_requests"],
+            "max_requests_jitter": options["max_requests_jitter"],
+            "keepalive": options["keepalive"],
+            "timeout": options["timeout"],
+            "graceful_timeout": options["graceful_timeout"],
+            "pidfile": options["pidfile"],
+            "post_fork": post_fork,
+            "accesslog": "-",
+            "errorlog": "-",
+        }
+        ProjectApplication(app_path, config).run()
+
+
+def post_fork(server, worker):
+    # Connections opened while preloading must not be shared between workers.
+    connections.close_all()
+
+
+class ProjectApplication(BaseApplication):
+    """Run the application at a dotted path under gunicorn's arbiter."""
+
+    def __init__(self, app_path, config):
+        self.app_path = app_path
+        self.config = config
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.config.items():
+            if value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        return import_string(self.app_path)
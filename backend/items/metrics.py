@@ -0,0 +1,206 @@
+"""
+Per-request timings and per-route histograms in the Prometheus text format.
+
+``metrics_middleware`` counts each request's SQL queries and times its
+database work, serialization and total handling. The numbers go out in a
+``Server-Timing`` response header and into histograms labelled by route and
+method. ``GET /api/metrics/`` renders the histograms together with the read
+cache counters. Like ``cache_stats()``, every worker process keeps its own
+numbers.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.decorators import sync_and_async_middleware
+
+from .services.cache import cache_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@dataclass
+class RequestMetrics:
+    queries: int = 0
+    db: float = 0.0
+    serialize: float = 0.0
+
+
+_current = ContextVar("items_request_metrics", default=None)
+_lock = threading.Lock()
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        # labels -> [per-bucket counts (not cumulative), sum, count]
+        self.series = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self, label_names: tuple) -> list:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with _lock:
+            series = {
+                labels: (list(counts), total, count)
+                for labels, (counts, total, count) in self.series.items()
+            }
+        for labels, (counts, total, count) in sorted(series.items()):
+            pairs = [
+                f'{name}="{_escape(value)}"' for name, value in zip(label_names, labels)
+            ]
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = ",".join([*pairs, f'le="{bound}"'])
+                lines.append(f"{self.name}_bucket{{{le}}} {cumulative}")
+            le = ",".join([*pairs, 'le="+Inf"'])
+            lines.append(f"{self.name}_bucket{{{le}}} {count}")
+            lines.append(f"{self.name}_sum{{{','.join(pairs)}}} {total}")
+            lines.append(f"{self.name}_count{{{','.join(pairs)}}} {count}")
+        return lines
+
+
+LABELS = ("route", "method")
+# Any other request method is labelled "other".
+METHODS = frozenset(
+    {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"}
+)
+HISTOGRAMS = {
+    "total": Histogram(
+        "items_request_duration_seconds",
+        "Time to handle a request, until its response headers are ready.",
+        LATENCY_BUCKETS,
+    ),
+    "db": Histogram(
+        "items_request_db_seconds",
+        "Time spent executing SQL per request.",
+        LATENCY_BUCKETS,
+    ),
+    "serialize": Histogram(
+        "items_request_serialize_seconds",
+        "Time spent in item serializers per request.",
+        LATENCY_BUCKETS,
+    ),
+    "queries": Histogram(
+        "items_request_queries",
+        "SQL queries executed per request.",
+        QUERY_BUCKETS,
+    ),
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@contextmanager
+def timed(measure: str):
+    """Add the time spent in the block to the current request's ``measure``."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(
+            metrics,
+            measure,
+            getattr(metrics, measure) + time.perf_counter() - started,
+        )
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db += time.perf_counter() - started
+        metrics.queries += 1
+
+
+def instrument_connection(sender, connection, **kwargs):
+    """``connection_created`` receiver: time every query on ``connection``."""
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def render() -> str:
+    """All histograms and the read cache counters as Prometheus text."""
+    lines = []
+    for histogram in HISTOGRAMS.values():
+        lines.extend(histogram.render(LABELS))
+    for name, value in cache_stats().items():
+        metric = f"items_cache_{name}_total"
+        lines.append(f"# HELP {metric} Item read cache {name} in this process.")
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    return "\n".join(lines) + "\n"
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """Measure each request and report it in ``Server-Timing`` and histograms."""
+    if not settings.ITEMS_METRICS_ENABLED:
+        raise MiddlewareNotUsed
+
+    def finish(request, response, started, token):
+        total = time.perf_counter() - started
+        metrics = _current.get()
+        _current.reset(token)
+        response["Server-Timing"] = (
+            f'db;dur={metrics.db * 1000:.2f};desc="{metrics.queries} queries", '
+            f"serialize;dur={metrics.serialize * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+        match = request.resolver_match
+        # Unmatched paths and unknown methods share one label each, to keep
+        # the series count bounded whatever clients send.
+        method = request.method if request.method in METHODS else "other"
+        labels = (f"/{match.route}" if match else "unmatched", method)
+        HISTOGRAMS["total"].observe(labels, total)
+        HISTOGRAMS["db"].observe(labels, metrics.db)
+        HISTOGRAMS["serialize"].observe(labels, metrics.serialize)
+        HISTOGRAMS["queries"].observe(labels, metrics.queries)
+        return response
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            started, token = time.perf_counter(), _current.set(RequestMetrics())
+            return finish(request, await get_response(request), started, token)
+
+    else:
+
+        def middleware(request):
+            started, token = time.perf_counter(), _current.set(RequestMetrics())
+            return finish(request, get_response(request), started, token)
+
+    return middleware
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("items", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(fields=["-created_at", "-id"], name="item_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"], name="item_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["priority", "-created_at", "-id"],
+                name="item_priority_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["group", "-created_at", "-id"], name="item_group_created_idx"
+            ),
+        ),
+    ]
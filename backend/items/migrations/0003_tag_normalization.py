@@ -0,0 +1,78 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("items", "0002_item_access_path_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                "verbose_name": "Tag",
+                "verbose_name_plural": "Tags",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ItemTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="item_tags",
+                        to="items.item",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="item_tags",
+                        to="items.tag",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Item tag",
+                "verbose_name_plural": "Item tags",
+                "unique_together": {("tag", "item")},
+            },
+        ),
+        migrations.AddField(
+            model_name="item",
+            name="tag_objects",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="items",
+                through="items.ItemTag",
+                to="items.tag",
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:18
+
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def normalize(tags):
+    # Frozen copy of Tag.normalize; migrations must not import app code.
+    names = (tag.strip().lower()[:100] for tag in tags.split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def populate_item_tags(apps, schema_editor):
+    Item = apps.get_model("items", "Item")
+    Tag = apps.get_model("items", "Tag")
+    ItemTag = apps.get_model("items", "ItemTag")
+
+    rows = (
+        Item.objects.exclude(tags__isnull=True)
+        .exclude(tags="")
+        .values_list("id", "tags")
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            _link(Tag, ItemTag, batch)
+            batch = []
+    if batch:
+        _link(Tag, ItemTag, batch)
+
+
+def _link(Tag, ItemTag, batch):
+    wanted = {item_id: normalize(tags) for item_id, tags in batch}
+    names = {name for tag_names in wanted.values() for name in tag_names}
+    Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+    tag_ids = dict(Tag.objects.filter(name__in=names).values_list("name", "id"))
+    ItemTag.objects.bulk_create(
+        [
+            ItemTag(item_id=item_id, tag_id=tag_ids[name])
+            for item_id, tag_names in wanted.items()
+            for name in tag_names
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("items", "0003_tag_normalization"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_item_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:30
+
+from django.db import migrations
+
+
+# Frozen copies of items.search.SQLITE_INSTALL and POSTGRESQL_INSTALL;
+# migrations must not import app code.
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS items_item_fts USING fts5(
+        name, description, location, tags,
+        content='items_item', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_item_fts_ai AFTER INSERT ON items_item BEGIN
+        INSERT INTO items_item_fts(rowid, name, description, location, tags)
+        VALUES (new.id, new.name, new.description, new.location, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_item_fts_ad AFTER DELETE ON items_item BEGIN
+        INSERT INTO items_item_fts(items_item_fts, rowid, name, description, location, tags)
+        VALUES ('delete', old.id, old.name, old.description, old.location, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_item_fts_au
+    AFTER UPDATE OF name, description, location, tags ON items_item BEGIN
+        INSERT INTO items_item_fts(items_item_fts, rowid, name, description, location, tags)
+        VALUES ('delete', old.id, old.name, old.description, old.location, old.tags);
+        INSERT INTO items_item_fts(rowid, name, description, location, tags)
+        VALUES (new.id, new.name, new.description, new.location, new.tags);
+    END
+    """,
+    # Index the rows that already exist.
+    "INSERT INTO items_item_fts(items_item_fts) VALUES ('rebuild')",
+]
+
+POSTGRESQL_INSTALL = [
+    """
+    ALTER TABLE items_item ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple',
+        coalesce(name, '') || ' ' || coalesce(description, '') || ' ' ||
+        coalesce(location, '') || ' ' || coalesce(tags, '')
+    )) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS item_search_vector_idx
+    ON items_item USING GIN (search_vector)
+    """,
+]
+
+
+def install_search_index(apps, schema_editor):
+    statements = {
+        "sqlite": SQLITE_INSTALL,
+        "postgresql": POSTGRESQL_INSTALL,
+    }.get(schema_editor.connection.vendor, [])
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def remove_search_index(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        if schema_editor.connection.vendor == "sqlite":
+            for trigger in (
+                "items_item_fts_ai",
+                "items_item_fts_ad",
+                "items_item_fts_au",
+            ):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute("DROP TABLE IF EXISTS items_item_fts")
+        elif schema_editor.connection.vendor == "postgresql":
+            cursor.execute("DROP INDEX IF EXISTS item_search_vector_idx")
+            cursor.execute("ALTER TABLE items_item DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("items", "0004_populate_item_tags"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, remove_search_index),
+    ]
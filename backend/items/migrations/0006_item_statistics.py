@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:23
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+
+
+def populate_item_statistics(apps, schema_editor):
+    # Frozen copy of the rebuild; migrations must not import app code.
+    Item = apps.get_model("items", "Item")
+    ItemStatistic = apps.get_model("items", "ItemStatistic")
+    value = ExpressionWrapper(
+        F("price") * F("quantity"),
+        output_field=DecimalField(max_digits=20, decimal_places=2),
+    )
+    measures = {
+        "item_count": Count("pk"),
+        "quantity_sum": Sum("quantity"),
+        "value_sum": Sum(value),
+    }
+
+    def statistic(dimension, key, row):
+        return ItemStatistic(
+            dimension=dimension,
+            key=key,
+            count=row["item_count"],
+            quantity=row["quantity_sum"] or 0,
+            value_cents=int((Decimal(row["value_sum"] or 0) * 100).to_integral_value()),
+        )
+
+    items = Item.objects.order_by()
+    rows = [statistic("total", "", items.aggregate(**measures))]
+    for dimension in ("status", "priority", "group"):
+        for row in items.values(dimension).annotate(**measures):
+            rows.append(statistic(dimension, row[dimension], row))
+    ItemStatistic.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("items", "0005_item_full_text_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ItemStatistic",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("dimension", models.CharField(max_length=20)),
+                ("key", models.CharField(blank=True, max_length=20)),
+                ("count", models.BigIntegerField(default=0)),
+                ("quantity", models.BigIntegerField(default=0)),
+                ("value_cents", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Item statistic",
+                "verbose_name_plural": "Item statistics",
+                "unique_together": {("dimension", "key")},
+            },
+        ),
+        migrations.RunPython(populate_item_statistics, migrations.RunPython.noop),
+    ]
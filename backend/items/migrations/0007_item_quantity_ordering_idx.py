@@ -0,0 +1,16 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("items", "0006_item_statistics"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(fields=["quantity", "id"], name="item_quantity_idx"),
+        ),
+    ]
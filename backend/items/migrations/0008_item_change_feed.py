@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:51
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("items", "0007_item_quantity_ordering_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ItemTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("item_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "Item tombstone",
+                "verbose_name_plural": "Item tombstones",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(fields=["updated_at", "id"], name="item_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="itemtombstone",
+            index=models.Index(fields=["deleted_at", "id"], name="item_tombstone_idx"),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("items", "0008_item_change_feed"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["status", "quantity", "id"], name="item_status_quantity_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["priority", "quantity", "id"], name="item_priority_quantity_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["group", "quantity", "id"], name="item_group_quantity_idx"
+            ),
+        ),
+    ]
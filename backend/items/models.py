@@ -1,10 +1,312 @@
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import Case, Count, F, Q, Value, When
+from django.utils import timezone
 
 from .enums import ItemGroup, ItemPriority, ItemStatus
+from .services.cache import invalidate
+from .utils import stats
 from .utils.validators import validate_enum_value, validate_unique_name_within_group
 
 
+class Tag(models.Model):
+    """A normalized tag; ``Item.tags`` stays the comma-separated source."""
+
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ["name"]
+        verbose_name = "Tag"
+        verbose_name_plural = "Tags"
+
+    def __str__(self):
+        return self.name
+
+    @staticmethod
+    def normalize(tags):
+        """Split a comma-separated string (or list) into unique tag names."""
+        if not tags:
+            return []
+        if isinstance(tags, str):
+            tags = tags.split(",")
+        names = (tag.strip().lower()[:100] for tag in tags)
+        return list(dict.fromkeys(name for name in names if name))
+
+
+class ItemStatistic(models.Model):
+    """One bucket of the inventory statistics, e.g. ``status=active``.
+
+    Kept up to date incrementally by Item saves, deletes, bulk writes and
+    ``QuerySet.update``; ``value_cents`` is the sum of ``price * quantity``.
+    """
+
+    dimension = models.CharField(max_length=20)
+    key = models.CharField(max_length=20, blank=True)
+    count = models.BigIntegerField(default=0)
+    quantity = models.BigIntegerField(default=0)
+    value_cents = models.BigIntegerField(default=0)
+
+    MEASURES = ("count", "quantity", "value_cents")
+
+    class Meta:
+        unique_together = ["dimension", "key"]
+        verbose_name = "Item statistic"
+        verbose_name_plural = "Item statistics"
+
+    def __str__(self):
+        return f"{self.dimension}={self.key}" if self.key else self.dimension
+
+    @classmethod
+    def apply(cls, deltas: dict) -> None:
+        """Add ``{(dimension, key): (count, quantity, value_cents)}`` deltas.
+
+        All buckets are incremented in a single UPDATE; rows for buckets seen
+        for the first time are created on demand.
+        """
+        deltas = stats.merge(deltas)
+        if not deltas:
+            return
+        if cls._increment(deltas) < len(deltas):
+            existing = set(
+                cls.objects.filter(cls._match(deltas)).values_list("dimension", "key")
+            )
+            missing = {b: m for b, m in deltas.items() if b not in existing}
+            cls.objects.bulk_create(
+                [cls(dimension=d, key=k) for d, k in missing], ignore_conflicts=True
+            )
+            cls._increment(missing)
+
+    @classmethod
+    def _increment(cls, deltas: dict) -> int:
+        increments = {}
+        for index, measure in enumerate(cls.MEASURES):
+            whens = [
+                When(dimension=d, key=k, then=Value(m[index]))
+                for (d, k), m in deltas.items()
+                if m[index]
+            ]
+            if whens:
+                increments[measure] = F(measure) + Case(
+                    *whens, default=Value(0), output_field=models.BigIntegerField()
+                )
+        return cls.objects.filter(cls._match(deltas)).update(**increments)
+
+    @staticmethod
+    def _match(buckets) -> Q:
+        match = Q()
+        for dimension, key in buckets:
+            match |= Q(dimension=dimension, key=key)
+        return match
+
+
+class ItemQuerySet(models.QuerySet):
+    """Keeps ItemStatistic in step with bulk inserts, updates and adjustments.
+
+    These writes send no model signals, so each of them also stamps
+    ``updated_at`` where Django would not and invalidates cached item reads.
+    """
+
+    # Rows per UPDATE when assigned values are expressions (F(), Case, ...).
+    stats_chunk_size = 500
+
+    def update(self, **kwargs):
+        kwargs.setdefault("updated_at", timezone.now())
+        updated = self._update_with_stats(kwargs)
+        if updated:
+            invalidate(self.model)
+        return updated
+
+    def _update_with_stats(self, kwargs):
+        changed = stats.STAT_FIELDS.intersection(kwargs)
+        if not changed:
+            return super().update(**kwargs)
+        # Route the statistics reads below like the write itself.
+        self._for_write = True
+        with transaction.atomic(using=self.db):
+            if any(hasattr(kwargs[field], "resolve_expression") for field in changed):
+                return self._update_in_chunks(kwargs)
+            # Constant assignments: the new totals follow from the old ones.
+            values = {
+                field: self.model._meta.get_field(field).to_python(kwargs[field])
+                for field in changed
+            }
+            before = stats.tally(self)
+            updated = super().update(**kwargs)
+            ItemStatistic.apply(
+                stats.merge(
+                    stats.group_deltas(before, -1),
+                    stats.group_deltas(stats.assign(before, values)),
+                )
+            )
+        return updated
+
+    def _update_in_chunks(self, kwargs):
+        pks = list(self.values_list("pk", flat=True))
+        updated = 0
+        for start in range(0, len(pks), self.stats_chunk_size):
+            chunk = self.model.objects.filter(
+                pk__in=pks[start : start + self.stats_chunk_size]
+            )
+            before = stats.tally(chunk)
+            updated += super(ItemQuerySet, chunk).update(**kwargs)
+            ItemStatistic.apply(
+                stats.merge(
+                    stats.group_deltas(before, -1),
+                    stats.group_deltas(stats.tally(chunk)),
+                )
+            )
+        return updated
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        self._for_write = True
+        with transaction.atomic(using=self.db):
+            if kwargs.get("ignore_conflicts") or kwargs.get("update_conflicts"):
+                # Which rows get inserted or overwritten is only known to the
+                # database; diff the totals of every row that could be hit.
+                scope = self.model.objects.filter(name__in={obj.name for obj in objs})
+                before = stats.tally(scope)
+                objs = super().bulk_create(objs, *args, **kwargs)
+                deltas = stats.merge(
+                    stats.group_deltas(before, -1),
+                    stats.group_deltas(stats.tally(scope)),
+                )
+            else:
+                objs = super().bulk_create(objs, *args, **kwargs)
+                deltas = stats.merge(
+                    *(stats.row_deltas(obj.stat_values()) for obj in objs)
+                )
+            ItemStatistic.apply(deltas)
+        for obj in objs:
+            obj._loaded_stats = obj.stat_values()
+        if objs:
+            invalidate(self.model)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        now = timezone.now()
+        for obj in objs:
+            obj.updated_at = now
+        fields = [*dict.fromkeys([*fields, "updated_at"])]
+        updated = super().bulk_update(objs, fields, *args, **kwargs)
+        for obj in objs:
+            obj._loaded_stats = obj.stat_values()
+        if updated:
+            invalidate(self.model)
+        return updated
+
+    def adjust_quantities(self, deltas: dict, columns=("id", "quantity")) -> dict:
+        """Add ``{pk: delta}`` to the items' quantities, computed by the database.
+
+        Each chunk is one ``UPDATE ... SET quantity = quantity + delta`` whose
+        WHERE clause also requires the result to stay within the field's
+        range, so concurrent adjustments never overwrite each other and no
+        lock, read or retry is needed; rows that would leave the range are
+        simply not updated. Returns ``{pk: row}`` for the adjusted items,
+        ``row`` holding ``columns`` after the update. The rows come back
+        through ``RETURNING`` (PostgreSQL, SQLite 3.35+), otherwise from a
+        read in the same transaction. Statistics follow from the same rows.
+        """
+        self._for_write = True
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        opts = self.model._meta
+        quantity = opts.get_field("quantity")
+        ceiling = connection.ops.integer_field_range(quantity.get_internal_type())[1]
+        selected = [*dict.fromkeys(["id", *columns, *sorted(stats.STAT_FIELDS)])]
+        positions = [selected.index(column) for column in columns]
+        now = timezone.now()
+        returning = _can_return_from_update(connection)
+
+        # Five parameters per row: two in each CASE and one in the IN list.
+        max_params = connection.features.max_query_params or 5 * self.stats_chunk_size
+        chunk_size = min(self.stats_chunk_size, (max_params - 2) // 5)
+        items = list(deltas.items())
+        adjusted = {}
+        with transaction.atomic(using=self.db):
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start : start + chunk_size]
+                # BIGINT so the range check cannot overflow near the ceiling.
+                case = "CASE {} {} END".format(
+                    quote("id"),
+                    " ".join(["WHEN %s THEN CAST(%s AS BIGINT)"] * len(chunk)),
+                )
+                case_params = [value for pair in chunk for value in pair]
+                new_quantity = f"{quote('quantity')} + {case}"
+                in_range = (
+                    f"BETWEEN 0 AND {int(ceiling)}" if ceiling is not None else ">= 0"
+                )
+                sql = (
+                    f"UPDATE {quote(opts.db_table)} "
+                    f"SET {quote('quantity')} = {new_quantity}, "
+                    f"{quote('updated_at')} = %s "
+                    f"WHERE {quote('id')} IN ({', '.join(['%s'] * len(chunk))}) "
+                    f"AND {new_quantity} {in_range}"
+                )
+                params = [
+                    *case_params,
+                    opts.get_field("updated_at").get_db_prep_value(now, connection),
+                    *(pk for pk, _ in chunk),
+                    *case_params,
+                ]
+                if returning:
+                    sql += " RETURNING " + ", ".join(map(quote, selected))
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    rows = cursor.fetchall() if returning else None
+                if returning:
+                    rows = self._convert_rows(connection, selected, rows)
+                else:
+                    # Nothing else can write these rows before we commit, so
+                    # the ones carrying our timestamp are the ones we updated.
+                    rows = (
+                        self.model.objects.using(self.db)
+                        .filter(pk__in=[pk for pk, _ in chunk], updated_at=now)
+                        .values_list(*selected)
+                    )
+                changes = []
+                for row in rows:
+                    new = dict(zip(selected, row))
+                    old = {**new, "quantity": new["quantity"] - deltas[row[0]]}
+                    changes.append(stats.change_deltas(old, new))
+                    adjusted[row[0]] = tuple(row[position] for position in positions)
+                ItemStatistic.apply(stats.merge(*changes))
+        if adjusted:
+            invalidate(self.model)
+        return adjusted
+
+    def _convert_rows(self, connection, names, rows):
+        """Apply the converters the ORM would to raw ``names`` columns."""
+        converters = []
+        for index, name in enumerate(names):
+            col = self.model._meta.get_field(name).get_col(self.model._meta.db_table)
+            functions = [
+                *connection.ops.get_db_converters(col),
+                *col.get_db_converters(connection),
+            ]
+            if functions:
+                converters.append((index, col, functions))
+        if not converters:
+            return rows
+        converted = []
+        for row in rows:
+            row = list(row)
+            for index, col, functions in converters:
+                for function in functions:
+                    row[index] = function(row[index], col, connection)
+            converted.append(tuple(row))
+        return converted
+
+
+def _can_return_from_update(connection) -> bool:
+    if connection.vendor == "postgresql":
+        return True
+    if connection.vendor == "sqlite":
+        return connection.Database.sqlite_version_info >= (3, 35)
+    return False
+
+
 class Item(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
@@ -25,23 +327,78 @@ class Item(models.Model):
     )  # Comma-separated tags
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    tag_objects = models.ManyToManyField(
+        Tag, through="ItemTag", related_name="items", blank=True
+    )
+
+    objects = ItemQuerySet.as_manager()
 
     class Meta:
         unique_together = ["name", "group"]
         ordering = ["-created_at"]
+        # Match the keyset pagination order (-created_at, -id) of each access
+        # path so filtered lists are index range scans without a sort.
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="item_created_idx"),
+            models.Index(
+                fields=["status", "-created_at", "-id"], name="item_status_created_idx"
+            ),
+            models.Index(
+                fields=["priority", "-created_at", "-id"],
+                name="item_priority_created_idx",
+            ),
+            models.Index(
+                fields=["group", "-created_at", "-id"], name="item_group_created_idx"
+            ),
+            # Sort key for ?ordering=quantity / -quantity, alone and combined
+            # with each enum filter
+            models.Index(fields=["quantity", "id"], name="item_quantity_idx"),
+            models.Index(
+                fields=["status", "quantity", "id"], name="item_status_quantity_idx"
+            ),
+            models.Index(
+                fields=["priority", "quantity", "id"],
+                name="item_priority_quantity_idx",
+            ),
+            models.Index(
+                fields=["group", "quantity", "id"], name="item_group_quantity_idx"
+            ),
+            # Keyset order of the change feed (GET /api/items/changes/)
+            models.Index(fields=["updated_at", "id"], name="item_updated_idx"),
+        ]
         verbose_name = "Item"
         verbose_name_plural = "Items"
 
     def clean(self):
-        """Validate the item instance for unique name and valid enum values."""
-        validate_unique_name_within_group(Item, self.name, self.group, self.pk)
+        """Validate the item instance for valid enum values."""
         validate_enum_value(self.group, ItemGroup.values(), "group")
         validate_enum_value(self.status, ItemStatus.values(), "status")
         validate_enum_value(self.priority, ItemPriority.values(), "priority")
 
     def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
+        # Uniqueness of (name, group) is left to the database constraint
+        # instead of exists() queries; a violation is reported the same way.
+        self.full_clean(validate_unique=False)
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except IntegrityError:
+            validate_unique_name_within_group(Item, self.name, self.group, self.pk)
+            raise
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored tags so saves only resync them when they change
+        instance._loaded_tags = instance.__dict__.get("tags")
+        # ...and the statistics fields, to apply only the delta on save
+        if stats.STAT_FIELDS.issubset(instance.__dict__):
+            instance._loaded_stats = instance.stat_values()
+        return instance
+
+    def stat_values(self):
+        """The field values the inventory statistics are computed from."""
+        return {field: getattr(self, field) for field in stats.STAT_FIELDS}
 
     def __str__(self):
         return f"{self.name} ({self.group})"
@@ -94,6 +451,21 @@ class Item(models.Model):
             raise ValueError(f"Invalid group: {group}")
         return cls.objects.filter(group=group)
 
+    @classmethod
+    def get_by_tags(cls, tags, match="any"):
+        """Get items tagged with any (or all) of ``tags``"""
+        if match not in ("any", "all"):
+            raise ValueError(f"Invalid tag match: {match}")
+        names = Tag.normalize(tags)
+        links = ItemTag.objects.filter(tag__name__in=names)
+        if match == "all":
+            links = (
+                links.values("item_id")
+                .annotate(matched=Count("tag_id"))
+                .filter(matched=len(names))
+            )
+        return cls.objects.filter(id__in=links.values("item_id"))
+
     @classmethod
     def get_urgent_items(cls):
         """Get all urgent items"""
@@ -103,3 +475,34 @@ class Item(models.Model):
     def get_active_items(cls):
         """Get all active items"""
         return cls.objects.filter(status=ItemStatus.ACTIVE.value)
+
+
+class ItemTag(models.Model):
+    item = models.ForeignKey(Item, on_delete=models.CASCADE, related_name="item_tags")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="item_tags")
+
+    class Meta:
+        # Leading on tag so tag filters are index range scans
+        unique_together = ["tag", "item"]
+        verbose_name = "Item tag"
+        verbose_name_plural = "Item tags"
+
+    def __str__(self):
+        return f"{self.item_id}:{self.tag_id}"
+
+
+class ItemTombstone(models.Model):
+    """A deleted item, reported by the change feed until it expires."""
+
+    item_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "id"], name="item_tombstone_idx"),
+        ]
+        verbose_name = "Item tombstone"
+        verbose_name_plural = "Item tombstones"
+
+    def __str__(self):
+        return f"{self.item_id} deleted at {self.deleted_at}"
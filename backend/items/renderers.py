@@ -0,0 +1,130 @@
+"""
+JSON renderer and parser backed by orjson when it is installed.
+
+``ITEMS_JSON_BACKEND`` selects the encoder: ``"auto"`` (orjson if
+importable, else the standard library), ``"orjson"`` or ``"json"``. The
+output is byte for byte what DRF's ``JSONRenderer`` produces: datetimes,
+dates, times and ``Decimal`` values are still formatted by DRF's
+``JSONEncoder``, and U+2028/U+2029 are escaped the same way. Anything
+orjson cannot encode or decode (integers beyond 64 bits, invalid input)
+goes through the standard library path, so results and error messages
+match DRF too; request bodies with 19 or more consecutive digits are
+always parsed by it. Indented output (``Accept: application/json; indent=4``)
+and non-default ``UNICODE_JSON``/``COMPACT_JSON``/``STRICT_JSON``
+settings also use the standard library.
+"""
+import io
+import json
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import parsers, renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional: the standard library json is used instead
+    orjson = None
+
+JSON_BACKENDS = ("auto", "orjson", "json")
+
+# orjson reads integers beyond 64 bits as floats; json keeps them exact.
+# Bodies with a run of 19 digits are left to json. Mapping every digit to
+# "0" and searching for the run is much faster than a regex.
+_DIGITS = bytes(48 if 48 <= byte <= 57 else 32 for byte in range(256))
+_LONG_RUN = b"0" * 19
+
+
+def _has_long_number(body: bytes) -> bool:
+    return _LONG_RUN in body.translate(_DIGITS)
+
+
+_default = JSONEncoder().default
+
+
+def _use_orjson() -> bool:
+    backend = settings.ITEMS_JSON_BACKEND
+    if backend == "json":
+        return False
+    if backend not in JSON_BACKENDS:
+        raise ImproperlyConfigured(
+            f"ITEMS_JSON_BACKEND must be one of {JSON_BACKENDS}, not {backend!r}"
+        )
+    if orjson is None and backend == "orjson":
+        raise ImproperlyConfigured(
+            "ITEMS_JSON_BACKEND is 'orjson' but it is not installed"
+        )
+    return orjson is not None
+
+
+if orjson is not None:
+    # Leave datetimes and dataclasses to DRF's encoder; orjson writes
+    # "+00:00" where DRF writes "Z", and json.dumps rejects dataclasses.
+    _OPTIONS = (
+        orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_NON_STR_KEYS
+    )
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            data is None
+            or self.ensure_ascii
+            or not (self.compact and self.strict)
+            or not _use_orjson()
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b"\xe2\x80" in ret:
+            # Valid JSON but not valid JavaScript; DRF escapes them too.
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class FastJSONParser(parsers.JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if (
+            not self.strict
+            or encoding.lower().replace("-", "") != "utf8"
+            or not _use_orjson()
+        ):
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if not _has_long_number(body):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass  # let DRF word the error
+        return super().parse(io.BytesIO(body), media_type, parser_context)
+
+
+_renderer = FastJSONRenderer()
+
+
+def dumps(data) -> bytes:
+    """``data`` as compact JSON, exactly as the API renders it."""
+    return _renderer.render(data)
+
+
+def loads(body: bytes):
+    """Parse a JSON request body like :class:`FastJSONParser`.
+
+    Raises :class:`ValueError` on invalid JSON.
+    """
+    if _use_orjson() and not _has_long_number(body):
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass  # the standard library's message
+    return json.loads(body)
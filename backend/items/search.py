@@ -0,0 +1,179 @@
+"""
+Full-text search over item name, description, location and tags.
+
+SQLite uses an FTS5 external-content table kept in sync by triggers;
+PostgreSQL uses a stored generated ``tsvector`` column with a GIN index.
+Both are maintained by the database itself, so saves, ``QuerySet.update``
+and ``bulk_create`` all stay indexed. Other backends fall back to
+``icontains`` lookups.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_FIELDS = ["name", "description", "location", "tags"]
+MAX_TERMS = 10
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS items_item_fts USING fts5(
+        name, description, location, tags,
+        content='items_item', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_item_fts_ai AFTER INSERT ON items_item BEGIN
+        INSERT INTO items_item_fts(rowid, name, description, location, tags)
+        VALUES (new.id, new.name, new.description, new.location, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_item_fts_ad AFTER DELETE ON items_item BEGIN
+        INSERT INTO items_item_fts(items_item_fts, rowid, name, description, location, tags)
+        VALUES ('delete', old.id, old.name, old.description, old.location, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_item_fts_au
+    AFTER UPDATE OF name, description, location, tags ON items_item BEGIN
+        INSERT INTO items_item_fts(items_item_fts, rowid, name, description, location, tags)
+        VALUES ('delete', old.id, old.name, old.description, old.location, old.tags);
+        INSERT INTO items_item_fts(rowid, name, description, location, tags)
+        VALUES (new.id, new.name, new.description, new.location, new.tags);
+    END
+    """,
+]
+SQLITE_TRIGGERS = ["items_item_fts_ai", "items_item_fts_ad", "items_item_fts_au"]
+
+POSTGRESQL_INSTALL = [
+    """
+    ALTER TABLE items_item ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple',
+        coalesce(name, '') || ' ' || coalesce(description, '') || ' ' ||
+        coalesce(location, '') || ' ' || coalesce(tags, '')
+    )) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS item_search_vector_idx
+    ON items_item USING GIN (search_vector)
+    """,
+]
+
+
+def install(schema_connection=None):
+    """Create the full-text index objects if they are missing.
+
+    Idempotent. On SQLite, Django rebuilds ``items_item`` for most schema
+    changes, which drops its triggers; this is run again after every
+    ``migrate`` and rebuilds the index whenever a trigger had to be recreated.
+    """
+    conn = schema_connection or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name IN "
+                f"({', '.join(['%s'] * len(SQLITE_TRIGGERS))})",
+                SQLITE_TRIGGERS,
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            for statement in SQLITE_INSTALL:
+                cursor.execute(statement)
+            if existing != set(SQLITE_TRIGGERS):
+                cursor.execute(
+                    "INSERT INTO items_item_fts(items_item_fts) VALUES ('rebuild')"
+                )
+        elif conn.vendor == "postgresql":
+            for statement in POSTGRESQL_INSTALL:
+                cursor.execute(statement)
+
+
+def terms(query):
+    """Split user input into at most MAX_TERMS word tokens."""
+    return _TERM_RE.findall(query or "")[:MAX_TERMS]
+
+
+def match_expression(query):
+    """Build the backend's prefix-matching query string, or ``None``."""
+    words = terms(query)
+    if not words:
+        return None
+    if connection.vendor == "sqlite":
+        return " ".join('"{}"*'.format(word.replace('"', "")) for word in words)
+    if connection.vendor == "postgresql":
+        return " & ".join(f"{word}:*" for word in words)
+    return words
+
+
+def filter_matches(queryset, query):
+    """Restrict ``queryset`` to items matching every term of ``query``."""
+    match = match_expression(query)
+    if match is None:
+        return queryset.none()
+    if connection.vendor == "sqlite":
+        return queryset.filter(
+            id__in=RawSQL(
+                "SELECT rowid FROM items_item_fts WHERE items_item_fts MATCH %s",
+                [match],
+            )
+        )
+    if connection.vendor == "postgresql":
+        return queryset.extra(
+            where=["items_item.search_vector @@ to_tsquery('simple', %s)"],
+            params=[match],
+        )
+    for word in match:
+        queryset = queryset.filter(
+            Q(
+                *[Q(**{f"{field}__icontains": word}) for field in SEARCH_FIELDS],
+                _connector=Q.OR,
+            )
+        )
+    return queryset
+
+
+def ranked(queryset, query, after=None):
+    """Matching items annotated with ``search_rank`` (lower is better).
+
+    Ordered by ``(search_rank, id)``; ``after`` is the ``(rank, id)`` keyset
+    position of the previous page's last row.
+    """
+    match = match_expression(query)
+    if match is None:
+        return queryset.none()
+
+    if connection.vendor == "sqlite":
+        rank_sql = "bm25(items_item_fts)"
+        queryset = queryset.extra(
+            select={"search_rank": rank_sql},
+            tables=["items_item_fts"],
+            where=[
+                'items_item_fts.rowid = "items_item"."id"',
+                "items_item_fts MATCH %s",
+            ],
+            params=[match],
+        )
+        rank_params = []
+    elif connection.vendor == "postgresql":
+        rank_sql = "-ts_rank(items_item.search_vector, to_tsquery('simple', %s))"
+        rank_params = [match]
+        queryset = filter_matches(queryset, query).extra(
+            select={"search_rank": rank_sql}, select_params=rank_params
+        )
+    else:
+        # No index to rank with; keep a stable order.
+        rank_sql, rank_params = "0", []
+        queryset = filter_matches(queryset, query).extra(select={"search_rank": "0"})
+
+    if after is not None:
+        rank, pk = after
+        queryset = queryset.extra(
+            where=[
+                f'({rank_sql} > %s OR ({rank_sql} = %s AND "items_item"."id" > %s))'
+            ],
+            params=[*rank_params, rank, *rank_params, rank, pk],
+        )
+    return queryset.order_by("search_rank", "id")
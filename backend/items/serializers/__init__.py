@@ -1,2 +1,3 @@
 # This file allows importing ItemSerializer from the serializers package
 from .item_serializer import ItemSerializer
+from .item_read_serializer import ItemReadSerializer
@@ -0,0 +1,206 @@
+import decimal
+import functools
+import operator
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..enums import ItemGroup, ItemPriority, ItemStatus
+from ..models import Item
+
+VALID_GROUPS = frozenset(ItemGroup.values())
+VALID_STATUSES = frozenset(ItemStatus.values())
+VALID_PRIORITIES = frozenset(ItemPriority.values())
+HIGH_PRIORITIES = frozenset([ItemPriority.HIGH.value, ItemPriority.URGENT.value])
+PRIMARY = ItemGroup.PRIMARY.value
+ACTIVE = ItemStatus.ACTIVE.value
+MEDIUM = ItemPriority.MEDIUM.value
+URGENT = ItemPriority.URGENT.value
+
+_price_field = Item._meta.get_field("price")
+PRICE_EXPONENT = decimal.Decimal(".1") ** _price_field.decimal_places
+PRICE_CONTEXT = decimal.Context(prec=_price_field.max_digits)
+
+
+def _price(price, tz=None):
+    if price is None:
+        return None
+    return "{:f}".format(price.quantize(PRICE_EXPONENT, context=PRICE_CONTEXT))
+
+
+def _timestamp(value, tz=None):
+    if tz is not None:
+        value = value.astimezone(tz)
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def _enum(valid, default):
+    return lambda value, tz=None: value if value in valid else default
+
+
+def _tag_list(tags, tz=None):
+    return [tag.strip() for tag in tags.split(",")] if tags else []
+
+
+# Each output field, in ItemSerializer order: the column it is computed
+# from and the conversion applied to it (None to use the value as is).
+FIELDS = {
+    "id": ("id", None),
+    "name": ("name", None),
+    "description": ("description", None),
+    "group": ("group", _enum(VALID_GROUPS, PRIMARY)),
+    "status": ("status", _enum(VALID_STATUSES, ACTIVE)),
+    "priority": ("priority", _enum(VALID_PRIORITIES, MEDIUM)),
+    "price": ("price", _price),
+    "quantity": ("quantity", None),
+    "location": ("location", None),
+    "tags": ("tags", None),
+    "tag_list": ("tags", _tag_list),
+    "is_urgent": ("priority", lambda priority, tz=None: priority == URGENT),
+    "is_active": ("status", lambda status, tz=None: status == ACTIVE),
+    "is_primary_group": ("group", lambda group, tz=None: group == PRIMARY),
+    "is_high_priority": (
+        "priority",
+        lambda priority, tz=None: priority in HIGH_PRIORITIES,
+    ),
+    "created_at": ("created_at", _timestamp),
+    "updated_at": ("updated_at", _timestamp),
+}
+
+
+class ItemReadSerializer:
+    """Read-only fast path for ``ItemSerializer`` output.
+
+    Works on ``values_list(*ItemReadSerializer.columns)`` tuples instead of
+    model instances and builds each dict directly, so no field objects or
+    model properties are touched per row. The result renders to the same
+    JSON as ``ItemSerializer(items, many=True).data``.
+
+    :meth:`sparse` derives serializers rendering a subset of the fields
+    from only the columns those fields need.
+    """
+
+    fields = tuple(FIELDS)
+
+    columns = (
+        "id",
+        "name",
+        "description",
+        "group",
+        "status",
+        "priority",
+        "price",
+        "quantity",
+        "location",
+        "tags",
+        "created_at",
+        "updated_at",
+    )
+    column_index = {column: index for index, column in enumerate(columns)}
+
+    def __init__(self, instance, many=False):
+        self.instance = instance
+        self.many = many
+
+    @property
+    def data(self):
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        if self.many:
+            return [self.to_representation(row, tz) for row in self.instance]
+        return self.to_representation(self.instance, tz)
+
+    @classmethod
+    def position(cls, row, field="created_at"):
+        """Return the ``(field, id)`` keyset position of ``row``."""
+        return row[cls.column_index[field]], row[0]
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def sparse(cls, fields: tuple, keys: tuple = ()) -> type:
+        """A serializer class rendering only ``fields`` (a subset of :attr:`fields`).
+
+        Its :attr:`columns` are the ones those fields are computed from,
+        plus ``id`` and the ``keys`` columns (e.g. the pagination key) that
+        are fetched for :meth:`position` but not rendered. Derived fields
+        such as ``is_urgent`` are only computed when selected.
+        """
+        needed = {"id", *keys, *(FIELDS[field][0] for field in fields)}
+        columns = tuple(column for column in cls.columns if column in needed)
+        column_index = {column: index for index, column in enumerate(columns)}
+        # Pick every field's column in one call, then convert the fields
+        # that need it. The first index is repeated so that itemgetter
+        # returns a tuple even for one field; zip() drops the extra value.
+        indexes = [column_index[FIELDS[field][0]] for field in fields]
+        sources = operator.itemgetter(*indexes, *indexes[:1])
+        conversions = [
+            (field, FIELDS[field][1]) for field in fields if FIELDS[field][1]
+        ]
+
+        def to_representation(row, tz=None):
+            data = dict(zip(fields, sources(row)))
+            for field, convert in conversions:
+                data[field] = convert(data[field], tz)
+            return data
+
+        return type(
+            f"Sparse{cls.__name__}",
+            (cls,),
+            {
+                "fields": fields,
+                "columns": columns,
+                "column_index": column_index,
+                "to_representation": staticmethod(to_representation),
+            },
+        )
+
+    @staticmethod
+    def to_representation(row, tz=None):
+        (
+            pk,
+            name,
+            description,
+            group,
+            status,
+            priority,
+            price,
+            quantity,
+            location,
+            tags,
+            created_at,
+            updated_at,
+        ) = row
+        # Inlined rather than built from FIELDS: this is the hot path.
+        if price is not None:
+            price = "{:f}".format(price.quantize(PRICE_EXPONENT, context=PRICE_CONTEXT))
+        if tz is not None:
+            created_at = created_at.astimezone(tz)
+            updated_at = updated_at.astimezone(tz)
+        created_at = created_at.isoformat()
+        if created_at.endswith("+00:00"):
+            created_at = created_at[:-6] + "Z"
+        updated_at = updated_at.isoformat()
+        if updated_at.endswith("+00:00"):
+            updated_at = updated_at[:-6] + "Z"
+
+        return {
+            "id": pk,
+            "name": name,
+            "description": description,
+            "group": group if group in VALID_GROUPS else PRIMARY,
+            "status": status if status in VALID_STATUSES else ACTIVE,
+            "priority": priority if priority in VALID_PRIORITIES else MEDIUM,
+            "price": price,
+            "quantity": quantity,
+            "location": location,
+            "tags": tags,
+            "tag_list": [tag.strip() for tag in tags.split(",")] if tags else [],
+            "is_urgent": priority == URGENT,
+            "is_active": status == ACTIVE,
+            "is_primary_group": group == PRIMARY,
+            "is_high_priority": priority in HIGH_PRIORITIES,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
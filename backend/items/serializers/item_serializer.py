@@ -42,23 +42,16 @@ class ItemSerializer(serializers.ModelSerializer):
             "is_primary_group",
             "is_high_priority",
         ]
+        # SQLite has no unsigned columns; PositiveIntegerField only adds a
+        # CHECK constraint there, so validate the bound up front.
+        extra_kwargs = {"quantity": {"min_value": 0}}
 
-    def validate(self, data):
-        # Check for unique name within the same group
-        name = data.get("name")
-        group = data.get("group")
-        instance = self.instance
-
-        if name and group:
-            existing_item = Item.objects.filter(name=name, group=group)
-            if instance:
-                existing_item = existing_item.exclude(pk=instance.pk)
-
-            if existing_item.exists():
-                raise serializers.ValidationError(
-                    f"An item with name '{name}' already exists in the {group} group."
-                )
+    def get_validators(self):
+        # Name/group uniqueness is enforced once, by Item.save() catching the
+        # unique_together IntegrityError, rather than by extra exists() queries.
+        return []
 
+    def validate(self, data):
         # Validate enum values
         if "group" in data and data["group"] not in ItemGroup.values():
             raise serializers.ValidationError(
@@ -3,35 +3,362 @@
 Base service class for shared service logic.
 Extend this for model-specific services.
 """
-from typing import Any, Type
+import base64
+import binascii
+import hashlib
+from datetime import datetime
+from typing import Any, Optional, Type
 
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Max, Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework import status
-from rest_framework.response import Response
+from rest_framework.exceptions import NotFound
+
+from ..metrics import timed
 
 
 class BaseService:
     model: Type[Any] = None
     serializer_class: Type[Any] = None
+    # Optional fast path for reads; serializes values_list() tuples of its
+    # ``columns`` and must render the same output as serializer_class.
+    read_serializer_class: Type[Any] = None
+
+    # Keyset pagination: rows are ordered on (key, id), newest first by
+    # default, so every page is a single index range scan however deep it is.
+    page_size: int = settings.REST_FRAMEWORK.get("PAGE_SIZE", 10)
+    max_page_size: int = 100
+    default_ordering: str = "-created_at"
+    invalid_cursor_message = "Invalid cursor"
+
+    # Bulk writes are validated and inserted in batches of this many rows.
+    bulk_batch_size: int = 500
+    max_bulk_batch_size: int = 5000
+    max_bulk_items: int = 10000
+    # Fields that may not be assigned by bulk updates (e.g. unique keys).
+    bulk_update_exclude: tuple = ()
+    # Optional model recording deletions in a ``deleted_at`` field, so that
+    # list Last-Modified headers move when rows are deleted.
+    tombstone_model: Type[Any] = None
 
     @classmethod
-    def list(cls):
-        objects = cls.model.objects.all()
-        serializer = cls.serializer_class(objects, many=True)
-        return serializer.data
+    def list(cls, cursor: Optional[str] = None, page_size: Optional[int] = None):
+        return cls.paginate(cls.model.objects.all(), cursor, page_size)
 
     @classmethod
-    def retrieve(cls, pk: int):
-        obj = get_object_or_404(cls.model, pk=pk)
-        serializer = cls.serializer_class(obj)
-        return serializer.data
+    def paginate(
+        cls,
+        queryset,
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+        ordering: Optional[str] = None,
+        fields: Optional[tuple] = None,
+    ) -> dict:
+        """Serialize one keyset page of ``queryset``.
+
+        ``ordering`` is a field name, optionally prefixed with ``-``; ties
+        are broken by ``id`` in the same direction. ``fields`` limits the
+        serialized fields (see :meth:`get_read_serializer_class`). Returns
+        ``{"next": ..., "previous": ..., "results": [...]}`` where the
+        cursors are opaque tokens to pass back as ``cursor``.
+        """
+        rows, page = cls._page_query(queryset, cursor, page_size, ordering, fields)
+        return cls._page_result(list(rows), **page)
+
+    @classmethod
+    async def apaginate(
+        cls,
+        queryset,
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+        ordering: Optional[str] = None,
+        fields: Optional[tuple] = None,
+    ) -> dict:
+        """:meth:`paginate` fetching the rows with async iteration."""
+        rows, page = cls._page_query(queryset, cursor, page_size, ordering, fields)
+        return cls._page_result([row async for row in rows], **page)
+
+    @classmethod
+    def _page_query(cls, queryset, cursor, page_size, ordering, fields) -> tuple:
+        """Return the (lazy) rows of one page and the state to finish it."""
+        page_size = cls.get_page_size(page_size)
+        queryset, field, reverse, position = cls._page_queryset(
+            queryset, cursor, ordering
+        )
+        serializer_class = cls.get_read_serializer_class(fields, keys=(field,))
+        rows = cls.read_rows(queryset, serializer_class)[: page_size + 1]
+        return rows, {
+            "page_size": page_size,
+            "field": field,
+            "reverse": reverse,
+            "first": position is None,
+            "serializer_class": serializer_class,
+        }
+
+    @classmethod
+    def _page_queryset(cls, queryset, cursor, ordering) -> tuple:
+        """Order ``queryset`` for a page and start it at ``cursor``.
+
+        Returns ``(queryset, field, reverse, position)``.
+        """
+        ordering = ordering or cls.default_ordering
+        field = ordering.lstrip("-")
+        reverse, position = (
+            cls.decode_cursor(cursor, field) if cursor else (False, None)
+        )
+
+        # Walking back from a "previous" cursor scans the index the other way.
+        descending = ordering.startswith("-") != reverse
+        sign, lookup = ("-", "lt") if descending else ("", "gt")
+        queryset = queryset.order_by(f"{sign}{field}", f"{sign}id")
+        if position is not None:
+            value, pk = position
+            # The OR alone is not sargable; the plain bound in front of it
+            # lets the index seek straight to the cursor.
+            queryset = queryset.filter(
+                Q(**{f"{field}__{lookup}e": value})
+                & (
+                    Q(**{f"{field}__{lookup}": value})
+                    | Q(**{field: value, f"id__{lookup}": pk})
+                )
+            )
+        return queryset, field, reverse, position
+
+    @classmethod
+    def _page_result(
+        cls,
+        objects: list,
+        page_size: int,
+        field: str,
+        reverse: bool,
+        first: bool,
+        serializer_class,
+    ) -> dict:
+        has_more = len(objects) > page_size
+        objects = objects[:page_size]
+        if reverse:
+            objects.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, not first
+
+        next_cursor = previous_cursor = None
+        if objects:
+            if has_next:
+                next_cursor = cls.encode_cursor(
+                    field, cls.position(objects[-1], field, serializer_class)
+                )
+            if has_previous:
+                previous_cursor = cls.encode_cursor(
+                    field,
+                    cls.position(objects[0], field, serializer_class),
+                    reverse=True,
+                )
+
+        with timed("serialize"):
+            results = serializer_class(objects, many=True).data
+        return {
+            "next": next_cursor,
+            "previous": previous_cursor,
+            "results": results,
+        }
+
+    @classmethod
+    def get_page_size(cls, page_size: Optional[int] = None) -> int:
+        try:
+            page_size = int(page_size)
+        except (TypeError, ValueError):
+            return cls.page_size
+        if page_size < 1:
+            return cls.page_size
+        return min(page_size, cls.max_page_size)
+
+    @classmethod
+    def read_rows(cls, queryset, serializer_class=None):
+        """Fetch rows in the shape the read serializer expects.
+
+        ``serializer_class`` is one returned by :meth:`get_read_serializer_class`.
+        """
+        if cls.read_serializer_class is None:
+            return queryset
+        serializer_class = serializer_class or cls.read_serializer_class
+        return queryset.values_list(*serializer_class.columns)
+
+    @classmethod
+    def get_read_serializer_class(cls, fields: Optional[tuple] = None, keys=()):
+        """The serializer for reads of ``fields`` (every field when ``None``).
+
+        A read serializer's ``sparse(fields, keys)`` renders just those
+        fields from just the columns they need, and also fetches the
+        ``keys`` columns for :meth:`position`. Without a read serializer
+        every field is returned.
+        """
+        if cls.read_serializer_class is None:
+            return cls.serializer_class
+        if fields is None:
+            return cls.read_serializer_class
+        return cls.read_serializer_class.sparse(tuple(fields), tuple(keys))
+
+    @classmethod
+    def position(cls, row, field: str = "created_at", serializer_class=None) -> tuple:
+        """Return the ``(field, id)`` keyset position of a fetched row."""
+        if cls.read_serializer_class is None:
+            return getattr(row, field), row.pk
+        serializer_class = serializer_class or cls.read_serializer_class
+        return serializer_class.position(row, field)
+
+    @staticmethod
+    def encode_cursor(field: str, position: tuple, reverse: bool = False) -> str:
+        value, pk = position
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        raw = f"{'r' if reverse else 'f'}|{field}|{value}|{pk}"
+        return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii")
+
+    @classmethod
+    def decode_cursor(cls, cursor: str, field: str = "created_at") -> tuple:
+        """Return ``(reverse, (value, id))``; the cursor must be for ``field``."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii")
+            direction, cursor_field, value, pk = raw.split("|")
+            if direction not in ("f", "r") or cursor_field != field:
+                raise ValueError(direction)
+            value = cls.model._meta.get_field(field).to_python(value)
+            return direction == "r", (value, int(pk))
+        except (binascii.Error, UnicodeError, ValueError, DjangoValidationError):
+            raise NotFound(cls.invalid_cursor_message)
+
+    @classmethod
+    def list_validators(
+        cls,
+        queryset,
+        key: str = "",
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+        ordering: Optional[str] = None,
+    ) -> tuple:
+        """Return ``(etag, last_modified)`` for one page of ``queryset``.
+
+        The ETag hashes the ids and ``updated_at`` of the rows on the page,
+        and of the row after it that decides the ``next`` link. The rows are
+        read with the same index seek as the page, so the check costs about
+        as much as the page itself, not a count of every matching row.
+        ``key`` distinguishes different pages or views of the same rows.
+        """
+        try:
+            window = cls._page_window(queryset, cursor, page_size, ordering)
+        except NotFound:
+            return None, None  # the view reports the invalid cursor
+        return cls._list_etag(key, list(window), cls._latest_change())
+
+    @classmethod
+    async def alist_validators(
+        cls,
+        queryset,
+        key: str = "",
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+        ordering: Optional[str] = None,
+    ) -> tuple:
+        try:
+            window = cls._page_window(queryset, cursor, page_size, ordering)
+        except NotFound:
+            return None, None
+        rows = [row async for row in window]
+        return cls._list_etag(key, rows, await cls._alatest_change())
+
+    @classmethod
+    def _page_window(cls, queryset, cursor, page_size, ordering):
+        queryset = cls._page_queryset(queryset, cursor, ordering)[0]
+        return queryset.values_list("id", "updated_at")[
+            : cls.get_page_size(page_size) + 1
+        ]
+
+    @classmethod
+    def _latest_change(cls):
+        """When a row was last updated or deleted, read from two indexes.
+
+        This is the list Last-Modified: a row can leave a page (deleted, or
+        no longer matching its filters) without any ``updated_at`` on the
+        page changing, so only a model-wide bound is safe.
+        """
+        latest = cls.model.objects.aggregate(latest=Max("updated_at"))["latest"]
+        if cls.tombstone_model is not None:
+            deleted = cls.tombstone_model.objects.aggregate(latest=Max("deleted_at"))[
+                "latest"
+            ]
+            latest = max(filter(None, (latest, deleted)), default=None)
+        return latest
+
+    @classmethod
+    async def _alatest_change(cls):
+        latest = (await cls.model.objects.aaggregate(latest=Max("updated_at")))[
+            "latest"
+        ]
+        if cls.tombstone_model is not None:
+            deleted = (
+                await cls.tombstone_model.objects.aaggregate(latest=Max("deleted_at"))
+            )["latest"]
+            latest = max(filter(None, (latest, deleted)), default=None)
+        return latest
+
+    @staticmethod
+    def _list_etag(key: str, rows: list, last_modified) -> tuple:
+        raw = f"{key}|{rows}"
+        return hashlib.md5(raw.encode()).hexdigest(), last_modified
+
+    @classmethod
+    def detail_validators(cls, pk: int, key: str = "") -> tuple:
+        """Return ``(etag, last_modified)`` for one row, or ``(None, None)``."""
+        last_modified = (
+            cls.model.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+        )
+        return cls._detail_etag(pk, key, last_modified)
+
+    @classmethod
+    async def adetail_validators(cls, pk: int, key: str = "") -> tuple:
+        last_modified = (
+            await cls.model.objects.filter(pk=pk)
+            .values_list("updated_at", flat=True)
+            .afirst()
+        )
+        return cls._detail_etag(pk, key, last_modified)
+
+    @staticmethod
+    def _detail_etag(pk: int, key: str, last_modified) -> tuple:
+        if last_modified is None:
+            return None, None
+        raw = f"{key}|{pk}|{last_modified}"
+        return hashlib.md5(raw.encode()).hexdigest(), last_modified
+
+    @classmethod
+    def retrieve(cls, pk: int, fields: Optional[tuple] = None):
+        serializer_class = cls.get_read_serializer_class(fields)
+        row = cls.read_rows(cls.model.objects.filter(pk=pk), serializer_class).first()
+        return cls._retrieved(row, serializer_class)
+
+    @classmethod
+    async def aretrieve(cls, pk: int, fields: Optional[tuple] = None):
+        serializer_class = cls.get_read_serializer_class(fields)
+        rows = cls.read_rows(cls.model.objects.filter(pk=pk), serializer_class)
+        return cls._retrieved(await rows.afirst(), serializer_class)
+
+    @classmethod
+    def _retrieved(cls, row, serializer_class):
+        if row is None:
+            raise Http404(f"No {cls.model._meta.object_name} matches the given query.")
+        with timed("serialize"):
+            return serializer_class(row).data
 
     @classmethod
     def create(cls, data: dict):
         serializer = cls.serializer_class(data=data)
         if serializer.is_valid():
-            serializer.save()
-            return serializer.data, status.HTTP_201_CREATED, None
+            return cls._save(serializer, status.HTTP_201_CREATED)
         return None, status.HTTP_400_BAD_REQUEST, serializer.errors
 
     @classmethod
@@ -39,6 +366,264 @@ class BaseService:
         obj = get_object_or_404(cls.model, pk=pk)
         serializer = cls.serializer_class(obj, data=data, partial=True)
         if serializer.is_valid():
-            serializer.save()
-            return serializer.data, status.HTTP_200_OK, None
+            return cls._save(serializer, status.HTTP_200_OK)
         return None, status.HTTP_400_BAD_REQUEST, serializer.errors
+
+    @staticmethod
+    def _save(serializer, success_status: int):
+        """Save a validated serializer, reporting model validation as a 400."""
+        try:
+            serializer.save()
+        except DjangoValidationError as exc:
+            return None, status.HTTP_400_BAD_REQUEST, {"non_field_errors": exc.messages}
+        with timed("serialize"):
+            return serializer.data, success_status, None
+
+    @classmethod
+    def bulk_create(cls, items: list, atomic: bool = True, batch_size: int = None):
+        """Validate and insert many objects with ``bulk_create``.
+
+        ``unique_together`` is checked for the whole batch, both against the
+        database and within the batch itself. With ``atomic`` any error
+        rejects the whole request; otherwise valid rows are inserted and
+        errors are reported per index.
+        """
+        if not isinstance(items, list):
+            return None, status.HTTP_400_BAD_REQUEST, {"error": "Expected a list."}
+        if len(items) > cls.max_bulk_items:
+            return (
+                None,
+                status.HTTP_400_BAD_REQUEST,
+                {"error": f"At most {cls.max_bulk_items} items per request."},
+            )
+        batch_size = cls.get_bulk_batch_size(batch_size)
+
+        errors = {}
+        valid = {}
+        for index, raw in enumerate(items):
+            serializer = cls.serializer_class(data=raw)
+            if serializer.is_valid():
+                valid[index] = serializer.validated_data
+            else:
+                errors[index] = serializer.errors
+
+        for index, message in cls.find_unique_conflicts(valid, batch_size).items():
+            errors[index] = {"non_field_errors": [message]}
+            del valid[index]
+
+        if errors and atomic:
+            return None, status.HTTP_400_BAD_REQUEST, cls._bulk_errors(errors)
+
+        objects = [(index, cls.model(**data)) for index, data in valid.items()]
+        try:
+            with transaction.atomic():
+                created = cls._bulk_insert(objects, errors, atomic, batch_size)
+                cls.after_bulk_write([obj for _, obj in created])
+        except IntegrityError as exc:
+            return None, status.HTTP_400_BAD_REQUEST, {"error": str(exc)}
+        data = {
+            "created": len(created),
+            "failed": len(errors),
+            "results": [{"index": index, "id": obj.pk} for index, obj in created],
+            **cls._bulk_errors(errors),
+        }
+        if not errors:
+            return data, status.HTTP_201_CREATED, None
+        if created:
+            return data, status.HTTP_207_MULTI_STATUS, None
+        return None, status.HTTP_400_BAD_REQUEST, cls._bulk_errors(errors)
+
+    @classmethod
+    def _bulk_insert(cls, objects: list, errors: dict, atomic: bool, batch_size: int):
+        if atomic:
+            cls.model.objects.bulk_create(
+                [obj for _, obj in objects], batch_size=batch_size
+            )
+            return objects
+
+        created = []
+        for start in range(0, len(objects), batch_size):
+            batch = objects[start : start + batch_size]
+            try:
+                with transaction.atomic():
+                    cls.model.objects.bulk_create([obj for _, obj in batch])
+                created.extend(batch)
+            except IntegrityError:
+                # A concurrent writer won a race; isolate the offending rows.
+                for index, obj in batch:
+                    try:
+                        with transaction.atomic():
+                            cls.model.objects.bulk_create([obj])
+                        created.append((index, obj))
+                    except IntegrityError as exc:
+                        errors[index] = {"non_field_errors": [str(exc)]}
+        return created
+
+    @classmethod
+    def bulk_update(cls, filters: dict, fields: dict):
+        """Assign ``fields`` to every row matching ``filters`` in one UPDATE."""
+        validated, errors = cls.validate_bulk_fields(fields)
+        if errors:
+            return None, status.HTTP_400_BAD_REQUEST, errors
+        updated = cls.update_queryset(cls.model.objects.filter(**filters), validated)
+        return {"updated": updated}, status.HTTP_200_OK, None
+
+    @classmethod
+    def update_queryset(cls, queryset, fields: dict) -> int:
+        """Assign ``fields`` with one ``QuerySet.update``.
+
+        The model's queryset stamps ``updated_at`` and invalidates cached
+        reads; subclasses extend this to keep derived data in step.
+        """
+        return queryset.update(**fields)
+
+    @classmethod
+    def bulk_patch(cls, patches: list, atomic: bool = True, batch_size: int = None):
+        """Apply a list of ``{"id": ..., "fields": {...}}`` patches.
+
+        Rows are fetched with ``in_bulk`` and written with ``bulk_update``,
+        one statement per batch for each distinct set of patched fields.
+        """
+        if not isinstance(patches, list):
+            return None, status.HTTP_400_BAD_REQUEST, {"error": "Expected a list."}
+        if len(patches) > cls.max_bulk_items:
+            return (
+                None,
+                status.HTTP_400_BAD_REQUEST,
+                {"error": f"At most {cls.max_bulk_items} patches per request."},
+            )
+        batch_size = cls.get_bulk_batch_size(batch_size)
+
+        errors = {}
+        valid = {}
+        seen = {}
+        for index, patch in enumerate(patches):
+            if not isinstance(patch, dict):
+                errors[index] = {"non_field_errors": ["Expected an object."]}
+                continue
+            try:
+                pk = int(patch.get("id"))
+            except (TypeError, ValueError):
+                errors[index] = {"id": ["A valid integer is required."]}
+                continue
+            if pk in seen:
+                errors[index] = {"id": [f"Duplicate of patch at index {seen[pk]}."]}
+                continue
+            seen[pk] = index
+            validated, field_errors = cls.validate_bulk_fields(patch.get("fields"))
+            if field_errors:
+                errors[index] = field_errors
+            else:
+                valid[index] = (pk, validated)
+
+        pks = [pk for pk, _ in valid.values()]
+        existing = {}
+        for start in range(0, len(pks), batch_size):
+            existing.update(cls.model.objects.in_bulk(pks[start : start + batch_size]))
+        for index, (pk, _) in list(valid.items()):
+            if pk not in existing:
+                errors[index] = {"id": ["Not found."]}
+                del valid[index]
+
+        if errors and atomic:
+            return None, status.HTTP_400_BAD_REQUEST, cls._bulk_errors(errors)
+
+        by_fields = {}
+        for pk, validated in valid.values():
+            obj = existing[pk]
+            for field, value in validated.items():
+                setattr(obj, field, value)
+            by_fields.setdefault(frozenset(validated), []).append(obj)
+
+        with transaction.atomic():
+            for fields, objects in by_fields.items():
+                cls.model.objects.bulk_update(
+                    objects, list(fields), batch_size=batch_size
+                )
+                cls.after_bulk_write(objects, fields)
+
+        data = {"updated": len(valid), "failed": len(errors)}
+        if not errors:
+            return data, status.HTTP_200_OK, None
+        if valid:
+            return (
+                {**data, **cls._bulk_errors(errors)},
+                status.HTTP_207_MULTI_STATUS,
+                None,
+            )
+        return None, status.HTTP_400_BAD_REQUEST, cls._bulk_errors(errors)
+
+    @classmethod
+    def after_bulk_write(cls, objects: list, fields=None) -> None:
+        """Hook run inside the transaction after ``bulk_create``/``bulk_update``.
+
+        Bulk writes send no model signals; ``fields`` is ``None`` for inserts
+        or the set of field names that were updated.
+        """
+
+    @classmethod
+    def validate_bulk_fields(cls, fields: dict):
+        """Validate a partial field assignment; returns ``(data, errors)``."""
+        if not isinstance(fields, dict) or not fields:
+            return None, {"fields": ["Expected a non-empty object."]}
+        excluded = sorted(set(fields) & set(cls.bulk_update_exclude))
+        if excluded:
+            return None, {field: ["Cannot be changed in bulk."] for field in excluded}
+        serializer = cls.serializer_class(data=fields, partial=True)
+        if not serializer.is_valid():
+            return None, serializer.errors
+        unknown = sorted(set(fields) - set(serializer.validated_data))
+        if unknown:
+            return None, {field: ["Unknown or read-only field."] for field in unknown}
+        return dict(serializer.validated_data), None
+
+    @classmethod
+    def find_unique_conflicts(cls, valid: dict, batch_size: int) -> dict:
+        """Map the index of each row violating ``unique_together`` to a message.
+
+        Existing rows are looked up with one query per ``batch_size`` keys.
+        """
+        conflicts = {}
+        for fields in cls.model._meta.unique_together:
+            defaults = {f: cls.model._meta.get_field(f).get_default() for f in fields}
+            seen = {}
+            for index, data in valid.items():
+                key = tuple(data.get(f, defaults[f]) for f in fields)
+                if key in seen:
+                    conflicts[index] = f"Duplicate of item at index {seen[key]}."
+                else:
+                    seen[key] = index
+
+            keys = list(seen)
+            for start in range(0, len(keys), batch_size):
+                chunk = keys[start : start + batch_size]
+                lookup = {f"{fields[0]}__in": {key[0] for key in chunk}}
+                existing = set(cls.model.objects.filter(**lookup).values_list(*fields))
+                for key in chunk:
+                    if key in existing:
+                        conflicts[seen[key]] = cls.unique_conflict_message(
+                            dict(zip(fields, key))
+                        )
+        return conflicts
+
+    @classmethod
+    def unique_conflict_message(cls, values: dict) -> str:
+        return f"{cls.model._meta.verbose_name} with {values} already exists."
+
+    @classmethod
+    def get_bulk_batch_size(cls, batch_size: int = None) -> int:
+        try:
+            batch_size = int(batch_size)
+        except (TypeError, ValueError):
+            return cls.bulk_batch_size
+        if batch_size < 1:
+            return cls.bulk_batch_size
+        return min(batch_size, cls.max_bulk_batch_size)
+
+    @staticmethod
+    def _bulk_errors(errors: dict) -> dict:
+        return {
+            "errors": [
+                {"index": index, "errors": errors[index]} for index in sorted(errors)
+            ]
+        }
@@ -0,0 +1,200 @@
+# backend/items/services/cache.py
+"""
+Versioned read-through cache for service-layer reads.
+
+Every cached value is keyed by the model's current version token. Writes
+bump the token instead of deleting keys, so stale entries simply become
+unreachable and age out through the backend's LRU/TTL eviction.
+
+The token also records when it was bumped. For
+``DATABASE_REPLICA_PIN_SECONDS`` after a bump, results read from a replica
+are not cached: the replica may not have replayed the write yet, and its
+rows would otherwise be served under the new version until the entry
+expires.
+"""
+import functools
+import hashlib
+import pickle
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from item_manager.db.router import primary_pinned
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "skipped": 0, "lagging": 0, "invalidations": 0}
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def cache_stats() -> dict:
+    """Return this process's hit/miss/invalidation counters."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _backend():
+    return caches[settings.ITEMS_CACHE_ALIAS]
+
+
+def process_local() -> bool:
+    """Whether the cache, version tokens included, lives in this process only.
+
+    Such a cache must not serve several worker processes: a write in one
+    worker would not invalidate the entries held by the others.
+    """
+    return isinstance(_backend(), LocMemCache)
+
+
+def _version_key(model) -> str:
+    return f"items:version:{model._meta.label_lower}"
+
+
+def _new_version() -> str:
+    # A fresh token (never a reused counter) so an evicted version key
+    # cannot resurrect entries written under an older version, and the
+    # time of the bump for _replica_may_lag().
+    return f"{uuid.uuid4().hex}:{time.time():.3f}"
+
+
+def _replica_may_lag(version: str) -> bool:
+    """Whether this context's reads may predate the write behind ``version``.
+
+    Unpinned reads go to a replica, which may still lag a recent bump. A
+    token whose key was evicted is only as old as its re-creation, which
+    errs on the side of not caching.
+    """
+    if not settings.DATABASE_REPLICAS or primary_pinned():
+        return False
+    _, _, bumped_at = version.partition(":")
+    try:
+        age = time.time() - float(bumped_at)
+    except ValueError:
+        return True
+    return age < settings.DATABASE_REPLICA_PIN_SECONDS
+
+
+def get_version(model) -> str:
+    backend = _backend()
+    version = backend.get(_version_key(model))
+    if version is None:
+        version = _new_version()
+        if not backend.add(_version_key(model), version, timeout=None):
+            version = backend.get(_version_key(model), version)
+    return version
+
+
+async def aget_version(model) -> str:
+    backend = _backend()
+    version = await backend.aget(_version_key(model))
+    if version is None:
+        version = _new_version()
+        if not await backend.aadd(_version_key(model), version, timeout=None):
+            version = await backend.aget(_version_key(model), version)
+    return version
+
+
+def invalidate(model):
+    """Make every cached read of ``model`` unreachable.
+
+    The version is bumped immediately and again once the surrounding
+    transaction commits, so a read racing an uncommitted write cannot cache
+    the old rows under the new version.
+    """
+
+    def bump():
+        _backend().set(_version_key(model), _new_version(), timeout=None)
+
+    _count("invalidations")
+    bump()
+    transaction.on_commit(bump)
+
+
+def cached_read(model):
+    """Cache the decorated service read per model version and arguments.
+
+    Reads pinned to the primary database skip the lookup: another request
+    may have cached a lagging replica's rows under the current version.
+    Their fresh result replaces that entry.
+    """
+
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not settings.ITEMS_CACHE_ENABLED:
+                return func(*args, **kwargs)
+
+            backend = _backend()
+            version = get_version(model)
+            key = _key(version, name, args, kwargs)
+            value = None if primary_pinned() else backend.get(key)
+            if value is not None:
+                _count("hits")
+                return value
+
+            _count("misses")
+            value = func(*args, **kwargs)
+            if _cacheable(value, version):
+                backend.set(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def acached_read(model):
+    """:func:`cached_read` for ``async def`` reads, via the async cache API."""
+
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not settings.ITEMS_CACHE_ENABLED:
+                return await func(*args, **kwargs)
+
+            backend = _backend()
+            version = await aget_version(model)
+            key = _key(version, name, args, kwargs)
+            value = None if primary_pinned() else await backend.aget(key)
+            if value is not None:
+                _count("hits")
+                return value
+
+            _count("misses")
+            value = await func(*args, **kwargs)
+            if _cacheable(value, version):
+                await backend.aset(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def _key(version: str, name: str, args: tuple, kwargs: dict) -> str:
+    arguments = repr((args, sorted(kwargs.items()))).encode()
+    return f"items:{version}:{name}:{hashlib.sha1(arguments).hexdigest()}"
+
+
+def _cacheable(value, version: str) -> bool:
+    if _replica_may_lag(version):
+        _count("lagging")
+        return False
+    if len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)) > (
+        settings.ITEMS_CACHE_MAX_VALUE_BYTES
+    ):
+        _count("skipped")
+        return False
+    return True
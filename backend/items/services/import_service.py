@@ -0,0 +1,392 @@
+# Bulk loading of item files for the import_items command
+"""
+Stream item records from CSV, NDJSON or JSON-array files and write them in
+validated batches.
+
+Records are parsed one at a time, so memory depends on the batch size, not
+the file size. Each batch is validated in a few passes over its columns
+plus one lookup of existing ``(name, group)`` keys, instead of
+``full_clean()`` and ``exists()`` per row. It is then written in a single
+transaction: with ``bulk_create``, or with ``COPY`` on PostgreSQL. The
+inventory statistics, tag links and read cache are kept current the same
+way the bulk API keeps them.
+"""
+import csv
+import io
+import json
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..enums import ItemGroup, ItemPriority, ItemStatus
+from ..models import Item, ItemStatistic
+from ..utils import stats
+from .cache import invalidate
+from .item_service import ItemService
+from .tag_service import sync_item_tags
+
+FORMATS = ["csv", "ndjson", "json"]
+CONFLICT_MODES = ["error", "skip", "update"]
+
+FIELDS = [
+    "name",
+    "description",
+    "group",
+    "status",
+    "priority",
+    "price",
+    "quantity",
+    "location",
+    "tags",
+]
+# Read-only columns of the export formats; ignored so exports re-import.
+IGNORED_FIELDS = frozenset(
+    {
+        "id",
+        "tag_list",
+        "is_urgent",
+        "is_active",
+        "is_primary_group",
+        "is_high_priority",
+        "created_at",
+        "updated_at",
+    }
+)
+CHOICES = {
+    "group": (ItemGroup.values(), ItemGroup.PRIMARY.value),
+    "status": (ItemStatus.values(), ItemStatus.ACTIVE.value),
+    "priority": (ItemPriority.values(), ItemPriority.MEDIUM.value),
+}
+MAX_LENGTHS = {
+    field: Item._meta.get_field(field).max_length
+    for field in ("name", "location", "tags")
+}
+_price_field = Item._meta.get_field("price")
+MAX_QUANTITY = 2147483647
+_INTEGER_RE = re.compile(r"^\s*[-+]?\d+(\.0*)?\s*$")
+
+JSON_CHUNK_SIZE = 64 * 1024
+
+
+def detect_format(path: str) -> str:
+    """Guess the format from the file extension; ``None`` if unknown."""
+    extension = path.rsplit(".", 1)[-1].lower()
+    if extension in ("jsonl", "ndjson"):
+        return "ndjson"
+    return extension if extension in FORMATS else None
+
+
+def read_records(stream, file_format: str):
+    """Yield one dict per record of a text ``stream``."""
+    if file_format == "csv":
+        yield from csv.DictReader(stream)
+    elif file_format == "ndjson":
+        for line in stream:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError as exc:
+                    # Rejected by clean_batch like any other invalid record.
+                    yield exc
+    else:
+        yield from _json_array(stream)
+
+
+def _json_array(stream):
+    """Incrementally decode the elements of a top-level JSON array."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = stream.read(JSON_CHUNK_SIZE)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def next_char():
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or eof:
+                return buffer[position : position + 1]
+            fill()
+
+    fill()
+    if next_char() != "[":
+        raise ValueError("Expected a JSON array of items.")
+    position += 1
+    if next_char() == "]":
+        return
+    while True:
+        next_char()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            if end == len(buffer) and not eof:
+                # A number may continue in the next chunk.
+                fill()
+                continue
+            break
+        position = end
+        yield value
+        separator = next_char()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError("Expected ',' or ']' after an array element.")
+        position += 1
+
+
+def clean_batch(records: list, start: int = 0) -> tuple:
+    """Validate a batch of raw records column by column.
+
+    Returns ``(rows, errors)``: ``rows`` maps each record's index in the
+    file (the batch starts at ``start``) to its cleaned field values, and
+    ``errors`` maps the rejected indexes to ``{field: [messages]}`` like
+    serializer errors.
+    """
+    errors = {}
+
+    def reject(index, field, message):
+        errors.setdefault(index, {}).setdefault(field, []).append(message)
+
+    rows = {}
+    for index, record in enumerate(records, start):
+        if isinstance(record, ValueError):
+            reject(index, "non_field_errors", f"Invalid JSON: {record}")
+            continue
+        if not isinstance(record, dict):
+            reject(index, "non_field_errors", "Expected an object.")
+            continue
+        unknown = set(record) - IGNORED_FIELDS - set(FIELDS)
+        if unknown:
+            reject(index, "non_field_errors", f"Unknown fields: {sorted(unknown)}")
+            continue
+        rows[index] = {field: _blank_to_none(record.get(field)) for field in FIELDS}
+
+    for index, row in rows.items():
+        name = row["name"]
+        if not isinstance(name, str) or not name.strip():
+            reject(index, "name", "This field is required.")
+        else:
+            row["name"] = name.strip()
+
+    for field in ("name", "description", "location", "tags"):
+        for index, row in rows.items():
+            value = row[field]
+            if value is not None and not isinstance(value, str):
+                reject(index, field, "Not a valid string.")
+            elif field in MAX_LENGTHS and value and len(value) > MAX_LENGTHS[field]:
+                reject(
+                    index,
+                    field,
+                    f"Ensure this field has no more than {MAX_LENGTHS[field]} "
+                    "characters.",
+                )
+
+    for field, (valid_values, default) in CHOICES.items():
+        valid = frozenset(valid_values)
+        for index, row in rows.items():
+            if row[field] is None:
+                row[field] = default
+            elif row[field] not in valid:
+                reject(index, field, f"Must be one of: {valid_values}")
+
+    for index, row in rows.items():
+        if row["price"] is not None:
+            row["price"], message = _clean_price(row["price"])
+            if message:
+                reject(index, "price", message)
+        if row["quantity"] is None:
+            row["quantity"] = 1
+        else:
+            row["quantity"], message = _clean_quantity(row["quantity"])
+            if message:
+                reject(index, "quantity", message)
+
+    return {i: row for i, row in rows.items() if i not in errors}, errors
+
+
+def _blank_to_none(value):
+    # CSV has no null; an empty cell means the field was not given.
+    return None if value == "" else value
+
+
+def _clean_price(value):
+    try:
+        price = Decimal(str(value).strip())
+    except InvalidOperation:
+        return None, "A valid number is required."
+    if not price.is_finite():
+        return None, "A valid number is required."
+    sign, digits, exponent = price.as_tuple()
+    decimals = max(0, -exponent)
+    whole = max(0, len(digits) + exponent)
+    if decimals > _price_field.decimal_places:
+        return None, (
+            f"Ensure that there are no more than {_price_field.decimal_places} "
+            "decimal places."
+        )
+    if whole > _price_field.max_digits - _price_field.decimal_places:
+        return None, (
+            "Ensure that there are no more than "
+            f"{_price_field.max_digits - _price_field.decimal_places} digits "
+            "before the decimal point."
+        )
+    return price, None
+
+
+def _clean_quantity(value):
+    if isinstance(value, bool) or not _INTEGER_RE.match(str(value)):
+        return None, "A valid integer is required."
+    quantity = int(str(value).strip().split(".")[0])
+    if not 0 <= quantity <= MAX_QUANTITY:
+        return None, f"Ensure this value is between 0 and {MAX_QUANTITY}."
+    return quantity, None
+
+
+def resolve_duplicates(rows: dict, errors: dict, on_conflict: str) -> int:
+    """Apply the ``(name, group)`` uniqueness rules to a cleaned batch.
+
+    Within the batch, ``update`` keeps the last of several rows with the
+    same key, ``skip`` the first, and ``error`` rejects the later ones and
+    every row whose key already exists. Returns how many rows were dropped
+    without an error.
+    """
+    if on_conflict == "error":
+        conflicts = ItemService.find_unique_conflicts(rows, ItemService.bulk_batch_size)
+        for index, message in conflicts.items():
+            errors[index] = {"non_field_errors": [message]}
+            del rows[index]
+        return 0
+
+    keep = {}
+    for index, row in rows.items():
+        key = (row["name"], row["group"])
+        if on_conflict == "update" or key not in keep:
+            keep[key] = index
+    kept = set(keep.values())
+    dropped = [index for index in rows if index not in kept]
+    for index in dropped:
+        del rows[index]
+    return len(dropped)
+
+
+def write_batch(rows: list, on_conflict: str, use_copy: bool) -> None:
+    """Write cleaned rows in one transaction and update the derived data."""
+    if not rows:
+        return
+    with transaction.atomic():
+        if use_copy and connection.vendor == "postgresql":
+            _copy_rows(rows, on_conflict)
+            # COPY bypasses the ORM; bulk_create invalidates by itself.
+            invalidate(Item)
+        else:
+            _bulk_create_rows(rows, on_conflict)
+
+
+def _bulk_create_rows(rows: list, on_conflict: str) -> None:
+    options = {}
+    if on_conflict == "skip":
+        options = {"ignore_conflicts": True}
+    elif on_conflict == "update":
+        options = {
+            "update_conflicts": True,
+            "unique_fields": ["name", "group"],
+            "update_fields": [f for f in FIELDS if f not in ("name", "group")]
+            + ["updated_at"],
+        }
+    # ItemQuerySet.bulk_create applies the statistics deltas.
+    objects = Item.objects.bulk_create(
+        [Item(**row) for row in rows], batch_size=ItemService.bulk_batch_size, **options
+    )
+    if on_conflict == "error" and all(obj.pk for obj in objects):
+        sync_item_tags([(obj.pk, obj.tags) for obj in objects if obj.tags])
+    else:
+        _sync_tags_by_key(rows)
+
+
+def _sync_tags_by_key(rows: list) -> None:
+    """Resync tag links from the stored rows, whichever were written."""
+    keys = {(row["name"], row["group"]) for row in rows}
+    stored = Item.objects.filter(name__in={name for name, _ in keys}).values_list(
+        "pk", "name", "group", "tags"
+    )
+    sync_item_tags(
+        [(pk, tags) for pk, name, group, tags in stored if (name, group) in keys]
+    )
+
+
+def _copy_line(values) -> str:
+    """One line of ``COPY ... (FORMAT csv)`` input.
+
+    COPY reads only an unquoted empty field as NULL; a quoted ``""`` is an
+    empty string. None is written as the former and every other value is
+    quoted, which the csv module cannot express.
+    """
+    fields = (
+        "" if value is None else '"' + str(value).replace('"', '""') + '"'
+        for value in values
+    )
+    return ",".join(fields) + "\n"
+
+
+def _copy_rows(rows: list, on_conflict: str) -> None:
+    """Load rows with ``COPY``, through a temporary table for conflicts."""
+    table = connection.ops.quote_name(Item._meta.db_table)
+    columns = [*FIELDS, "created_at", "updated_at"]
+    column_list = ", ".join(connection.ops.quote_name(c) for c in columns)
+    now = timezone.now()
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(_copy_line([*(row[field] for field in FIELDS), now, now]))
+    buffer.seek(0)
+    copy = "FROM STDIN WITH (FORMAT csv)"
+
+    with connection.cursor() as cursor:
+        if on_conflict == "error":
+            cursor.copy_expert(f"COPY {table} ({column_list}) {copy}", buffer)
+            ItemStatistic.apply(stats.merge(*(stats.row_deltas(row) for row in rows)))
+            _sync_tags_by_key(rows)
+            return
+
+        scope = Item.objects.filter(name__in={row["name"] for row in rows})
+        before = stats.tally(scope)
+        cursor.execute(
+            "CREATE TEMPORARY TABLE items_import AS "
+            f"SELECT {column_list} FROM {table} WITH NO DATA"
+        )
+        cursor.copy_expert(f"COPY items_import ({column_list}) {copy}", buffer)
+        if on_conflict == "skip":
+            action = "NOTHING"
+        else:
+            assignments = ", ".join(
+                f"{connection.ops.quote_name(c)} = EXCLUDED.{connection.ops.quote_name(c)}"
+                for c in columns
+                if c not in ("name", "group", "created_at")
+            )
+            action = f"UPDATE SET {assignments}"
+        cursor.execute(
+            f"INSERT INTO {table} ({column_list}) "
+            f"SELECT {column_list} FROM items_import "
+            f'ON CONFLICT ("name", "group") DO {action}'
+        )
+        cursor.execute("DROP TABLE items_import")
+        ItemStatistic.apply(
+            stats.merge(
+                stats.group_deltas(before, -1),
+                stats.group_deltas(stats.tally(scope)),
+            )
+        )
+    _sync_tags_by_key(rows)
@@ -1,57 +1,541 @@
 # Service layer for item-related business logic
-from django.shortcuts import get_object_or_404
+import base64
+import binascii
+import csv
+import json
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404
+from django.utils import timezone
 from rest_framework import status
-from rest_framework.response import Response
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.fields import DateTimeField, IntegerField
+from rest_framework.utils.encoders import JSONEncoder
 
-from ..models import Item
-from ..serializers import ItemSerializer
+from .. import search
+from ..filters import build_queryset
+from ..metrics import timed
+from ..models import Item, ItemTombstone
+from ..serializers import ItemReadSerializer, ItemSerializer
 from .base_service import BaseService
+from . import stats_service
+from .cache import acached_read, cached_read
+from .tag_service import sync_item_tags
 
 
 class ItemService(BaseService):
     model = Item
     serializer_class = ItemSerializer
+    read_serializer_class = ItemReadSerializer
+    tombstone_model = ItemTombstone
+    # name/group changes need per-row uniqueness checks; use a single PATCH.
+    bulk_update_exclude = ("name", "group")
+
+    @classmethod
+    def after_bulk_write(cls, objects: list, fields=None) -> None:
+        if fields is None:
+            objects = [obj for obj in objects if obj.tags]
+        elif "tags" not in fields:
+            return
+        sync_item_tags([(obj.pk, obj.tags) for obj in objects])
+
+    @classmethod
+    def update_queryset(cls, queryset, fields: dict) -> int:
+        if "tags" not in fields:
+            return super().update_queryset(queryset, fields)
+        with transaction.atomic():
+            pks = list(queryset.values_list("pk", flat=True))
+            updated = super().update_queryset(
+                cls.model.objects.filter(pk__in=pks), fields
+            )
+            sync_item_tags([(pk, fields["tags"]) for pk in pks])
+        return updated
+
+    @classmethod
+    def unique_conflict_message(cls, values: dict) -> str:
+        return (
+            f"An item with name '{values['name']}' already exists "
+            f"in the {values['group']} group."
+        )
+
+    # The largest quantity step accepted, the range of an integer column.
+    max_adjustment = 2**31 - 1
+    _delta_field = IntegerField(min_value=-max_adjustment, max_value=max_adjustment)
+
+    @classmethod
+    def validate_delta(cls, delta):
+        """Validate a quantity step; returns ``(delta, errors)``."""
+        try:
+            delta = cls._delta_field.run_validation(delta)
+        except ValidationError as exc:
+            return None, {"delta": exc.detail}
+        if delta == 0:
+            return None, {"delta": ["Must not be zero."]}
+        return delta, None
+
+    @classmethod
+    def adjust(cls, pk: int, delta, fields: tuple = None):
+        """Add ``delta`` to an item's quantity with one conditional UPDATE.
+
+        Returns the item as it was written, or a 409 with the current
+        quantity if the step would take it below zero (or past the maximum).
+        """
+        delta, errors = cls.validate_delta(delta)
+        if errors:
+            return None, status.HTTP_400_BAD_REQUEST, errors
+        serializer_class = cls.get_read_serializer_class(fields)
+        rows = cls.model.objects.adjust_quantities(
+            {pk: delta}, serializer_class.columns
+        )
+        if pk in rows:
+            with timed("serialize"):
+                return serializer_class(rows[pk]).data, status.HTTP_200_OK, None
+        current = cls._current_quantities([pk])
+        if pk not in current:
+            raise Http404(f"No {cls.model._meta.object_name} matches the given query.")
+        return (
+            None,
+            status.HTTP_409_CONFLICT,
+            {"error": cls._out_of_range_message(delta), "quantity": current[pk]},
+        )
+
+    @classmethod
+    def bulk_adjust(cls, adjustments: list, atomic: bool = True):
+        """Apply a list of ``{"id": ..., "delta": ...}`` quantity steps.
+
+        All steps go through :meth:`ItemQuerySet.adjust_quantities`, one
+        UPDATE per chunk. Steps that would leave the quantity's range are
+        not applied; with ``atomic`` any of them rolls back the whole batch.
+        """
+        if not isinstance(adjustments, list):
+            return None, status.HTTP_400_BAD_REQUEST, {"error": "Expected a list."}
+        if len(adjustments) > cls.max_bulk_items:
+            return (
+                None,
+                status.HTTP_400_BAD_REQUEST,
+                {"error": f"At most {cls.max_bulk_items} adjustments per request."},
+            )
 
+        errors = {}
+        valid = {}
+        seen = {}
+        for index, adjustment in enumerate(adjustments):
+            if not isinstance(adjustment, dict):
+                errors[index] = {"non_field_errors": ["Expected an object."]}
+                continue
+            try:
+                pk = int(adjustment.get("id"))
+            except (TypeError, ValueError):
+                errors[index] = {"id": ["A valid integer is required."]}
+                continue
+            if pk in seen:
+                errors[index] = {
+                    "id": [f"Duplicate of adjustment at index {seen[pk]}."]
+                }
+                continue
+            seen[pk] = index
+            delta, delta_errors = cls.validate_delta(adjustment.get("delta"))
+            if delta_errors:
+                errors[index] = delta_errors
+            else:
+                valid[index] = (pk, delta)
+        if errors and atomic:
+            return None, status.HTTP_400_BAD_REQUEST, cls._bulk_errors(errors)
 
-def list_items() -> list:
-    return ItemService.list()
+        with transaction.atomic():
+            rows = cls.model.objects.adjust_quantities(dict(valid.values()))
+            rejected = {i: pk for i, (pk, _) in valid.items() if pk not in rows}
+            if rejected and atomic:
+                transaction.set_rollback(True)
+        if rejected:
+            current = cls._current_quantities(rejected.values())
+            for index, pk in rejected.items():
+                if pk not in current:
+                    errors[index] = {"id": ["Not found."]}
+                else:
+                    errors[index] = {
+                        "delta": [cls._out_of_range_message(valid[index][1])],
+                        "quantity": current[pk],
+                    }
+        # Steps the quantity's range rejected conflict with the current state.
+        status_code = (
+            status.HTTP_409_CONFLICT
+            if any("quantity" in errors[index] for index in rejected)
+            else status.HTTP_400_BAD_REQUEST
+        )
+        if rejected and atomic:
+            return None, status_code, cls._bulk_errors(errors)
+
+        data = {
+            "adjusted": len(rows),
+            "failed": len(errors),
+            "results": [
+                {"index": index, "id": pk, "quantity": rows[pk][1]}
+                for index, (pk, _) in valid.items()
+                if pk in rows
+            ],
+        }
+        if not errors:
+            return data, status.HTTP_200_OK, None
+        if rows:
+            return (
+                {**data, **cls._bulk_errors(errors)},
+                status.HTTP_207_MULTI_STATUS,
+                None,
+            )
+        return None, status_code, cls._bulk_errors(errors)
+
+    @classmethod
+    def _current_quantities(cls, pks) -> dict:
+        return dict(
+            cls.model.objects.filter(pk__in=list(pks)).values_list("pk", "quantity")
+        )
+
+    @staticmethod
+    def _out_of_range_message(delta: int) -> str:
+        if delta < 0:
+            return "Not enough quantity; it cannot go below zero."
+        return "Quantity would exceed its maximum value."
+
+
+@cached_read(Item)
+def list_items(
+    cursor: str = None,
+    page_size: int = None,
+    filters: dict = None,
+    tags: list = None,
+    tag_match: str = "any",
+    ordering: str = None,
+    fields: tuple = None,
+) -> dict:
+    """One page of items matching validated ``items.filters`` parameters."""
+    items = build_queryset(filters, tags, tag_match)
+    return ItemService.paginate(items, cursor, page_size, ordering, fields)
+
+
+@acached_read(Item)
+async def alist_items(
+    cursor: str = None,
+    page_size: int = None,
+    filters: dict = None,
+    tags: list = None,
+    tag_match: str = "any",
+    ordering: str = None,
+    fields: tuple = None,
+) -> dict:
+    """:func:`list_items` on the async ORM."""
+    items = build_queryset(filters, tags, tag_match)
+    return await ItemService.apaginate(items, cursor, page_size, ordering, fields)
 
 
 def create_item(data: dict) -> tuple:
     return ItemService.create(data)
 
 
-def get_item(pk: int) -> dict:
-    return ItemService.retrieve(pk)
+# Writes need transactions and model signals, which the async ORM does not
+# offer; they run in the thread that serves sync ORM calls.
+acreate_item = sync_to_async(create_item)
+
+
+def bulk_create_items(items: list, atomic: bool = True, batch_size: int = None):
+    return ItemService.bulk_create(items, atomic, batch_size)
+
+
+def bulk_update_items(filters: dict, fields: dict) -> tuple:
+    return ItemService.bulk_update(filters, fields)
+
+
+def bulk_patch_items(patches: list, atomic: bool = True, batch_size: int = None):
+    return ItemService.bulk_patch(patches, atomic, batch_size)
+
+
+def adjust_item_quantity(pk: int, delta, fields: tuple = None) -> tuple:
+    return ItemService.adjust(pk, delta, fields)
+
+
+def bulk_adjust_items(adjustments: list, atomic: bool = True) -> tuple:
+    return ItemService.bulk_adjust(adjustments, atomic)
+
+
+def get_list_validators(
+    queryset, key: str = "", cursor=None, page_size=None, ordering=None
+) -> tuple:
+    return ItemService.list_validators(queryset, key, cursor, page_size, ordering)
+
+
+async def aget_list_validators(
+    queryset, key: str = "", cursor=None, page_size=None, ordering=None
+) -> tuple:
+    return await ItemService.alist_validators(
+        queryset, key, cursor, page_size, ordering
+    )
+
+
+def get_item_validators(pk: int, key: str = "") -> tuple:
+    return ItemService.detail_validators(pk, key)
+
+
+async def aget_item_validators(pk: int, key: str = "") -> tuple:
+    return await ItemService.adetail_validators(pk, key)
+
+
+@cached_read(Item)
+def search_items(
+    query: str, cursor: str = None, page_size: int = None, fields: tuple = None
+) -> dict:
+    """Full-text search ranked by relevance, with a forward-only cursor."""
+    page_size = ItemService.get_page_size(page_size)
+    after = _decode_search_cursor(cursor) if cursor else None
+    serializer_class = ItemService.get_read_serializer_class(fields)
+    rows = list(
+        search.ranked(Item.objects.all(), query, after).values_list(
+            *serializer_class.columns, "search_rank"
+        )[: page_size + 1]
+    )
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = _encode_search_cursor(rows[-1][-1], rows[-1][0])
+    with timed("serialize"):
+        results = serializer_class([row[:-1] for row in rows], many=True).data
+    return {"next": next_cursor, "results": results}
+
+
+def _encode_search_cursor(rank: float, pk: int) -> str:
+    raw = f"s|{rank!r}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii")
+
+
+def _decode_search_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii")
+        kind, rank, pk = raw.split("|")
+        if kind != "s":
+            raise ValueError(kind)
+        return float(rank), int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise NotFound(ItemService.invalid_cursor_message)
+
+
+CHANGES_PAGE_SIZE = 500
+MAX_CHANGES_PAGE_SIZE = 2000
+
+
+def list_changes(
+    since: str = None, page_size: int = None, fields: tuple = None
+) -> tuple:
+    """Items written and ids deleted after the ``since`` cursor.
+
+    Items are read in ``(updated_at, id)`` order and tombstones in
+    ``(deleted_at, id)`` order, each an index range scan starting at its
+    position in the cursor, so a poll costs in proportion to the changes
+    since the last one. Without ``since`` every item is returned (and only
+    deletions from now on). Writes younger than the settle window are left
+    for a later poll, so one committing late cannot fall behind the cursor.
+    ``fields`` limits the item fields returned, as for list reads.
+    """
+    try:
+        page_size = max(1, min(int(page_size), MAX_CHANGES_PAGE_SIZE))
+    except (TypeError, ValueError):
+        page_size = CHANGES_PAGE_SIZE
+    now = timezone.now()
+    settled = now - timedelta(seconds=settings.ITEMS_CHANGES_SETTLE_SECONDS)
+    if since:
+        item_position, tombstone_position = _decode_changes_cursor(since)
+        retention = timedelta(days=settings.ITEMS_TOMBSTONE_RETENTION_DAYS)
+        if tombstone_position[0] < now - retention:
+            return (
+                None,
+                status.HTTP_410_GONE,
+                {"error": "Cursor expired; reload all items and sync from there."},
+            )
+    else:
+        item_position, tombstone_position = None, (settled, 0)
+
+    items = _after(
+        Item.objects.filter(updated_at__lte=settled), "updated_at", item_position
+    )
+    serializer_class = ItemService.get_read_serializer_class(
+        fields, keys=("updated_at",)
+    )
+    rows = list(ItemService.read_rows(items, serializer_class)[: page_size + 1])
+    tombstones = list(
+        _after(
+            ItemTombstone.objects.filter(deleted_at__lte=settled),
+            "deleted_at",
+            tombstone_position,
+        ).values_list("deleted_at", "id", "item_id")[: page_size + 1]
+    )
+
+    # Merge both streams by time and keep the first page_size changes.
+    column = serializer_class.column_index["updated_at"]
+    changes = sorted(
+        [(row[column], 0, row) for row in rows]
+        + [(row[0], 1, row) for row in tombstones],
+        key=lambda change: change[:2],
+    )
+    has_more = len(changes) > page_size
+    changes = changes[:page_size]
+    fetched_tombstones = len(tombstones)
+    rows = [row for _, kind, row in changes if kind == 0]
+    tombstones = [row for _, kind, row in changes if kind == 1]
+    if rows:
+        item_position = serializer_class.position(rows[-1], "updated_at")
+    if tombstones:
+        tombstone_position = tombstones[-1][:2]
+    if len(tombstones) == fetched_tombstones <= page_size:
+        # No deletions up to the settle point: move on to it, so a cursor
+        # only expires when the client stops polling, not when nothing
+        # gets deleted.
+        tombstone_position = max(tombstone_position, (settled, 0))
+
+    with timed("serialize"):
+        results = serializer_class(rows, many=True).data
+        timestamp = DateTimeField().to_representation
+        deleted = [
+            {"id": item_id, "deleted_at": timestamp(deleted_at)}
+            for deleted_at, _, item_id in tombstones
+        ]
+    data = {
+        "cursor": _encode_changes_cursor(item_position, tombstone_position),
+        "has_more": has_more,
+        "results": results,
+        "deleted": deleted,
+    }
+    return data, status.HTTP_200_OK, None
+
+
+alist_changes = sync_to_async(list_changes)
+
+
+def changes_cursor() -> str:
+    """A :func:`list_changes` cursor at the current settle point."""
+    settled = timezone.now() - timedelta(seconds=settings.ITEMS_CHANGES_SETTLE_SECONDS)
+    return _encode_changes_cursor((settled, 0), (settled, 0))
+
+
+def changes_position(cursor: str) -> tuple:
+    """The ``(item, tombstone)`` keyset positions a changes cursor points at.
+
+    Both are ``(timestamp, id)`` tuples, so the positions of two cursors
+    compare in the order the feed walks the rows.
+    """
+    item_position, tombstone_position = _decode_changes_cursor(cursor)
+    if item_position is None:
+        item_position = (datetime.min.replace(tzinfo=dt_timezone.utc), 0)
+    return item_position, tombstone_position
+
+
+def _after(queryset, field: str, position):
+    """``queryset`` in ``(field, id)`` order, after ``position`` if given."""
+    queryset = queryset.order_by(field, "id")
+    if position is None:
+        return queryset
+    value, pk = position
+    return queryset.filter(
+        Q(**{f"{field}__gt": value}) | Q(**{field: value, "id__gt": pk})
+    )
+
+
+def _encode_changes_cursor(item_position, tombstone_position) -> str:
+    parts = ["c"]
+    for position in (item_position, tombstone_position):
+        value, pk = position or ("", "")
+        parts += [value.isoformat() if value else "", str(pk)]
+    raw = "|".join(parts)
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii")
+
+
+def _decode_changes_cursor(cursor: str) -> tuple:
+    to_datetime = Item._meta.get_field("updated_at").to_python
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii")
+        kind, item_value, item_pk, tombstone_value, tombstone_pk = raw.split("|")
+        if kind != "c":
+            raise ValueError(kind)
+        item_position = (to_datetime(item_value), int(item_pk)) if item_value else None
+        tombstone_position = (to_datetime(tombstone_value), int(tombstone_pk))
+        if tombstone_position[0] is None:
+            raise ValueError(raw)
+        return item_position, tombstone_position
+    except (binascii.Error, UnicodeError, ValueError, DjangoValidationError):
+        raise NotFound(ItemService.invalid_cursor_message)
+
+
+def get_item_stats(live: bool = False) -> dict:
+    return stats_service.summary(live)
+
+
+async def aget_item_stats(live: bool = False) -> dict:
+    return await stats_service.asummary(live)
+
+
+@cached_read(Item)
+def get_item(pk: int, fields: tuple = None) -> dict:
+    return ItemService.retrieve(pk, fields)
+
+
+@acached_read(Item)
+async def aget_item(pk: int, fields: tuple = None) -> dict:
+    return await ItemService.aretrieve(pk, fields)
 
 
 def update_item(pk: int, data: dict) -> tuple:
     return ItemService.update(pk, data)
 
 
-def get_items_by_status(status_value: str) -> list:
-    """Get items filtered by status."""
-    items = Item.get_by_status(status_value)
-    serializer = ItemSerializer(items, many=True)
-    return serializer.data
+aupdate_item = sync_to_async(update_item)
+
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_CSV_FIELDS = [
+    field for field in ItemSerializer.Meta.fields if field != "tag_list"
+]
+
 
+class _Echo:
+    """File-like object whose write() hands the row back to csv.writer."""
 
-def get_items_by_priority(priority_value: str) -> list:
-    """Get items filtered by priority."""
-    items = Item.get_by_priority(priority_value)
-    serializer = ItemSerializer(items, many=True)
-    return serializer.data
+    def write(self, value):
+        return value
 
 
-def get_urgent_items() -> list:
-    """Get all urgent items."""
-    items = Item.get_urgent_items()
-    serializer = ItemSerializer(items, many=True)
-    return serializer.data
+def export_items(
+    output: str = "ndjson",
+    filters: dict = None,
+    tags: list = None,
+    tag_match="any",
+    fields: tuple = None,
+):
+    """Yield the filtered item catalog as NDJSON lines or CSV rows.
 
+    Rows are read through a server-side cursor in EXPORT_CHUNK_SIZE batches,
+    so memory stays flat regardless of table size. ``fields`` limits the
+    exported fields (CSV never has ``tag_list``).
+    """
+    items = build_queryset(filters, tags, tag_match).order_by("-created_at", "-id")
+    serializer_class = ItemService.get_read_serializer_class(fields)
+    rows = ItemService.read_rows(items, serializer_class).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+    tz = timezone.get_current_timezone()
 
-def get_active_items() -> list:
-    """Get all active items."""
-    items = Item.get_active_items()
-    serializer = ItemSerializer(items, many=True)
-    return serializer.data
+    if output == "csv":
+        columns = [
+            field for field in EXPORT_CSV_FIELDS if field in serializer_class.fields
+        ]
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            data = serializer_class.to_representation(row, tz)
+            yield writer.writerow([data[field] for field in columns])
+    else:
+        for row in rows:
+            data = serializer_class.to_representation(row, tz)
+            yield json.dumps(data, cls=JSONEncoder) + "\n"
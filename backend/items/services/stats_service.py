@@ -0,0 +1,115 @@
+# Inventory statistics served from the incrementally maintained summary table
+from decimal import Decimal
+
+from django.db import connection, transaction
+
+from ..enums import ItemGroup, ItemPriority, ItemStatus
+from ..models import Item, ItemStatistic
+from ..utils import stats
+
+DIMENSION_VALUES = {
+    "status": ItemStatus.values(),
+    "priority": ItemPriority.values(),
+    "group": ItemGroup.values(),
+}
+
+
+def summary(live: bool = False) -> dict:
+    """Counts, quantity and value in total and per status/priority/group.
+
+    Reads the few summary rows, so the cost does not depend on the number
+    of items. ``live`` computes the same figures with a GROUP BY over the
+    item table instead, for consistency checks.
+    """
+    return _render(live_buckets() if live else stored_buckets(), live)
+
+
+async def asummary(live: bool = False) -> dict:
+    if live:
+        groups = [group async for group in stats.tally_query(Item.objects.all())]
+        buckets = _live_buckets(groups)
+    else:
+        buckets = _stored_buckets([row async for row in _stored_rows()])
+    return _render(buckets, live)
+
+
+def stored_buckets() -> dict:
+    return _stored_buckets(_stored_rows())
+
+
+def live_buckets() -> dict:
+    return _live_buckets(stats.tally(Item.objects.all()))
+
+
+def _stored_rows():
+    return ItemStatistic.objects.values_list(
+        "dimension", "key", *ItemStatistic.MEASURES
+    )
+
+
+def _stored_buckets(rows) -> dict:
+    return {(dimension, key): tuple(m) for dimension, key, *m in rows}
+
+
+def _live_buckets(groups: list) -> dict:
+    deltas = stats.group_deltas(groups)
+    # Buckets of an empty table cancel out of the deltas; report zeros.
+    deltas.setdefault(stats.TOTAL, (0, 0, 0))
+    return deltas
+
+
+def _render(buckets: dict, live: bool) -> dict:
+    return {
+        "source": "live" if live else "summary",
+        "total": _measures(buckets.get(stats.TOTAL)),
+        **{
+            f"by_{dimension}": {
+                value: _measures(buckets.get((dimension, value))) for value in values
+            }
+            for dimension, values in DIMENSION_VALUES.items()
+        },
+    }
+
+
+def verify() -> list:
+    """Return ``(bucket, stored, live)`` for every bucket that has drifted."""
+    stored = stored_buckets()
+    live = live_buckets()
+    zero = (0, 0, 0)
+    return [
+        (bucket, stored.get(bucket, zero), live.get(bucket, zero))
+        for bucket in sorted(set(stored) | set(live))
+        if stored.get(bucket, zero) != live.get(bucket, zero)
+    ]
+
+
+def rebuild() -> int:
+    """Recompute every summary row from the item table.
+
+    On PostgreSQL the item table is locked against writes meanwhile, so no
+    concurrent delta is lost between the aggregate and the swap.
+    """
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("LOCK TABLE items_item IN SHARE MODE")
+        buckets = live_buckets()
+        ItemStatistic.objects.all().delete()
+        ItemStatistic.objects.bulk_create(
+            [
+                ItemStatistic(
+                    dimension=dimension, key=key, **dict(zip(ItemStatistic.MEASURES, m))
+                )
+                for (dimension, key), m in buckets.items()
+            ]
+        )
+    return len(buckets)
+
+
+def _measures(measures) -> dict:
+    count, quantity, value_cents = measures or (0, 0, 0)
+    return {
+        "count": count,
+        "quantity": quantity,
+        "value": str((Decimal(value_cents) / 100).quantize(Decimal("0.01"))),
+    }
@@ -0,0 +1,30 @@
+# Keeps the normalized Tag/ItemTag rows in step with Item.tags
+from ..models import ItemTag, Tag
+
+
+def sync_item_tags(pairs) -> None:
+    """Make the ItemTag rows match the given ``(item_id, tags)`` pairs.
+
+    Works in a fixed number of queries for the whole batch: one insert for
+    unseen tags, one lookup of tag ids, one delete and one insert of links.
+    """
+    wanted = {item_id: Tag.normalize(tags) for item_id, tags in pairs}
+    if not wanted:
+        return
+
+    names = {name for tag_names in wanted.values() for name in tag_names}
+    tag_ids = {}
+    if names:
+        Tag.objects.bulk_create(
+            [Tag(name=name) for name in names], ignore_conflicts=True
+        )
+        tag_ids = dict(Tag.objects.filter(name__in=names).values_list("name", "id"))
+
+    ItemTag.objects.filter(item_id__in=list(wanted)).delete()
+    ItemTag.objects.bulk_create(
+        [
+            ItemTag(item_id=item_id, tag_id=tag_ids[name])
+            for item_id, tag_names in wanted.items()
+            for name in tag_names
+        ]
+    )
@@ -0,0 +1,59 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Item, ItemStatistic, ItemTombstone
+from .services.cache import invalidate
+from .services.tag_service import sync_item_tags
+from .utils import stats
+
+
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+def invalidate_item_cache(sender, **kwargs):
+    """Drop cached item reads whenever a single item is written."""
+    invalidate(sender)
+
+
+@receiver(post_save, sender=Item)
+def sync_tags_on_save(sender, instance, created, **kwargs):
+    """Rebuild the item's normalized tags when its tags string changed."""
+    if created:
+        changed = bool(instance.tags)
+    else:
+        changed = instance.tags != getattr(instance, "_loaded_tags", None)
+    if changed:
+        sync_item_tags([(instance.pk, instance.tags)])
+    instance._loaded_tags = instance.tags
+
+
+@receiver(pre_save, sender=Item)
+def remember_stats_before_save(sender, instance, **kwargs):
+    """Note the stored statistics fields of the row about to be written."""
+    if instance.pk is None:
+        instance._stats_before = None
+    elif hasattr(instance, "_loaded_stats"):
+        instance._stats_before = instance._loaded_stats
+    else:
+        # Not loaded from the database (or loaded with deferred fields)
+        instance._stats_before = (
+            sender.objects.filter(pk=instance.pk).values(*stats.STAT_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=Item)
+def update_stats_on_save(sender, instance, **kwargs):
+    """Apply the item's field deltas to the inventory statistics."""
+    values = instance.stat_values()
+    ItemStatistic.apply(stats.change_deltas(instance._stats_before, values))
+    instance._loaded_stats = values
+
+
+@receiver(post_delete, sender=Item)
+def update_stats_on_delete(sender, instance, **kwargs):
+    ItemStatistic.apply(stats.change_deltas(instance.stat_values(), None))
+
+
+@receiver(post_delete, sender=Item)
+def record_tombstone(sender, instance, **kwargs):
+    """Keep a trace of the deletion for clients syncing from the change feed."""
+    ItemTombstone.objects.create(item_id=instance.pk)
@@ -0,0 +1,263 @@
+"""
+Server-Sent Events push of item changes for ``GET /api/items/stream/``.
+
+Each server process (each event loop) runs one :class:`ChangeBroker` while
+it has subscribers. Every ``ITEMS_STREAM_POLL_SECONDS`` it reads what
+changed since its cursor from the change feed (``item_service.list_changes``),
+so a burst of writes, bulk updates and admin actions included, becomes one
+event per tick. That costs one query however many clients listen, and
+sees writes made by every process. The event is encoded once and handed to
+all subscribers.
+
+Event ids are change feed cursors. A client reconnecting with
+``Last-Event-ID`` first catches up from the feed, then continues live. A
+subscriber whose buffer of ``ITEMS_STREAM_CLIENT_BUFFER`` undelivered events
+fills up is disconnected. Its ``EventSource`` reconnects and catches up
+from its last event id, so nothing is lost.
+"""
+import asyncio
+import contextvars
+import logging
+import weakref
+from collections import deque
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from . import renderers
+from .services import item_service
+
+logger = logging.getLogger(__name__)
+
+_brokers = weakref.WeakKeyDictionary()
+
+# Reconnection delay the client is told to use, in milliseconds.
+RETRY_MS = 3000
+PING = b": ping\n\n"
+
+
+def frame(event: str, data: dict, event_id: str = None) -> bytes:
+    """One SSE message; the compact JSON ``data`` never spans lines."""
+    head = f"id: {event_id}\n" if event_id else ""
+    data = renderers.dumps(data).decode()
+    return f"{head}event: {event}\ndata: {data}\n\n".encode()
+
+
+def changes_frame(page: dict) -> bytes:
+    data = {"results": page["results"], "deleted": page["deleted"]}
+    return frame("changes", data, page["cursor"])
+
+
+class Event:
+    """A published message, encoded once for every subscriber.
+
+    ``position`` is the change feed position the message leads up to, or
+    ``None`` for messages every subscriber gets.
+    """
+
+    __slots__ = ("payload", "position")
+
+    def __init__(self, payload: bytes, position: tuple = None):
+        self.payload = payload
+        self.position = position
+
+    @classmethod
+    def from_page(cls, page: dict) -> "Event":
+        return cls(changes_frame(page), item_service.changes_position(page["cursor"]))
+
+
+class Subscriber:
+    __slots__ = ("pending", "limit", "ready", "dropped")
+
+    def __init__(self, limit: int):
+        self.pending = deque()
+        self.limit = limit
+        self.ready = asyncio.Event()
+        self.dropped = False
+
+    def push(self, event: Event) -> None:
+        if len(self.pending) >= self.limit:
+            self.dropped = True
+            self.pending.clear()
+        else:
+            self.pending.append(event)
+        self.ready.set()
+
+
+class ChangeBroker:
+    """Poll the change feed while anyone listens and fan out each page."""
+
+    def __init__(self):
+        self.subscribers = set()
+        self.cursor = None
+        self.task = None
+
+    def subscribe(self) -> tuple:
+        """Register a subscriber; returns it with the current cursor."""
+        if self.task is None or self.task.done():
+            # Starting (again): changes from before now are not pushed.
+            self.cursor = item_service.changes_cursor()
+            # A fresh context, so the poll's queries are not attributed to
+            # the request that happened to start it (metrics, DB routing).
+            self.task = asyncio.create_task(self.run(), context=contextvars.Context())
+        subscriber = Subscriber(settings.ITEMS_STREAM_CLIENT_BUFFER)
+        self.subscribers.add(subscriber)
+        return subscriber, self.cursor
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    async def run(self):
+        while self.subscribers:
+            await asyncio.sleep(settings.ITEMS_STREAM_POLL_SECONDS)
+            try:
+                await self.poll()
+            except Exception:
+                # The database may be briefly unavailable; try again next tick.
+                logger.exception("Polling item changes failed")
+
+    async def poll(self):
+        has_more = True
+        while has_more and self.subscribers:
+            data, _, errors = await _read_changes(self.cursor)
+            if errors:
+                # The cursor outlived the tombstones (the loop was stalled
+                # for days); clients must resync.
+                self.publish(Event(frame("reset", errors)))
+                self.cursor = item_service.changes_cursor()
+                return
+            has_more = data["has_more"]
+            if data["results"] or data["deleted"]:
+                self.publish(Event.from_page(data))
+            self.cursor = data["cursor"]
+
+    def publish(self, event: Event) -> None:
+        for subscriber in list(self.subscribers):
+            subscriber.push(event)
+            if subscriber.dropped:
+                self.unsubscribe(subscriber)
+
+
+@sync_to_async
+def _read_changes(cursor: str) -> tuple:
+    # Outside a request nothing else recycles the poller's connection.
+    close_old_connections()
+    return item_service.list_changes(cursor, item_service.MAX_CHANGES_PAGE_SIZE)
+
+
+def get_broker() -> ChangeBroker:
+    loop = asyncio.get_running_loop()
+    broker = _brokers.get(loop)
+    if broker is None:
+        broker = _brokers[loop] = ChangeBroker()
+    return broker
+
+
+async def event_stream(subscriber, cursor: str, first_page: dict, disconnected=None):
+    """Yield SSE bytes: a catch-up from ``cursor``, then live events.
+
+    ``first_page`` is the first page of the catch-up (already read by the
+    view, which turns an invalid or expired cursor into an error response),
+    or ``None`` to start live at ``cursor``. Ends when the subscriber is
+    dropped, or when ``disconnected`` (an ``asyncio.Event``) is set.
+    """
+    broker = get_broker()
+    try:
+        yield f"retry: {RETRY_MS}\n".encode() + frame("ready", {}, cursor)
+        page = first_page
+        while page is not None:
+            if page["results"] or page["deleted"]:
+                yield changes_frame(page)
+            cursor = page["cursor"]
+            if not page["has_more"]:
+                break
+            page, _, _ = await item_service.alist_changes(
+                cursor, item_service.MAX_CHANGES_PAGE_SIZE
+            )
+
+        position = item_service.changes_position(cursor)
+        gone = asyncio.ensure_future(disconnected.wait()) if disconnected else None
+        try:
+            while not subscriber.dropped:
+                if not subscriber.pending:
+                    subscriber.ready.clear()
+                    ready = asyncio.ensure_future(subscriber.ready.wait())
+                    await asyncio.wait(
+                        [ready, gone] if gone else [ready],
+                        timeout=settings.ITEMS_STREAM_HEARTBEAT_SECONDS,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    ready.cancel()
+                    if gone and gone.done():
+                        return
+                    if not subscriber.pending:
+                        if not subscriber.dropped:
+                            yield PING
+                        continue
+                # Send everything pending at once. Pages the catch-up
+                # already covered are skipped; a partly covered one only
+                # repeats rows in the state the client has already seen.
+                chunks = []
+                while subscriber.pending:
+                    event = subscriber.pending.popleft()
+                    if event.position is None:
+                        chunks.append(event.payload)
+                    elif not _covered(event.position, position):
+                        chunks.append(event.payload)
+                        position = tuple(map(max, event.position, position))
+                if chunks:
+                    yield b"".join(chunks)
+        finally:
+            if gone:
+                gone.cancel()
+    finally:
+        broker.unsubscribe(subscriber)
+
+
+def _covered(position: tuple, reached: tuple) -> bool:
+    return all(mine <= theirs for mine, theirs in zip(position, reached))
+
+
+def disconnect_aware(application):
+    """ASGI wrapper noticing when an event stream's client goes away.
+
+    Django 4.2 stops reading ``receive`` once the request body is in, so a
+    streaming response never learns of a disconnect and the server's
+    ``send`` silently drops its output. For requests accepting
+    ``text/event-stream`` this keeps listening and sets the
+    ``items.disconnected`` event in the scope, which ends the stream.
+    """
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http" or not any(
+            name == b"accept" and b"text/event-stream" in value
+            for name, value in scope.get("headers", ())
+        ):
+            return await application(scope, receive, send)
+
+        disconnected = asyncio.Event()
+        scope = {**scope, "items.disconnected": disconnected}
+        body_read = asyncio.Event()
+
+        async def receive_body():
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+            elif not message.get("more_body", False):
+                body_read.set()
+            return message
+
+        async def watch():
+            await body_read.wait()
+            while not disconnected.is_set():
+                if (await receive())["type"] == "http.disconnect":
+                    disconnected.set()
+
+        watcher = asyncio.create_task(watch())
+        try:
+            await application(scope, receive_body, send)
+        finally:
+            watcher.cancel()
+
+    return app
@@ -0,0 +1,50 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory, TestCase, override_settings
+
+from .. import async_views, views
+
+BODY = json.dumps({"name": "Widget", "group": "Primary", "price": "1.50"})
+
+
+@override_settings(ITEMS_CACHE_ENABLED=False)
+class AsyncBodyTests(TestCase):
+    """The async write views answer request bodies like the DRF views."""
+
+    async def post(self, body, content_type):
+        request = AsyncRequestFactory().post(
+            "/api/items/", body, content_type=content_type
+        )
+        return await async_views.item_list(request)
+
+    async def sync_post(self, body, content_type):
+        request = AsyncRequestFactory().post(
+            "/api/items/", body, content_type=content_type
+        )
+        response = await sync_to_async(views.item_list)(request)
+        return response.render()
+
+    async def assertSameResponse(self, body, content_type, status_code):
+        sync = await self.sync_post(body, content_type)
+        response = await self.post(body, content_type)
+        self.assertEqual(sync.status_code, status_code)
+        self.assertEqual(response.status_code, status_code)
+        self.assertEqual(response.content, sync.content)
+
+    async def test_other_media_types_are_unsupported(self):
+        for content_type in ["text/plain", "application/x-www-form-urlencoded", ""]:
+            with self.subTest(content_type=content_type):
+                await self.assertSameResponse(BODY, content_type, 415)
+
+    async def test_invalid_json_is_a_parse_error(self):
+        response = await self.post("{", "application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(b"JSON parse error", response.content)
+
+    async def test_empty_body_is_validated(self):
+        await self.assertSameResponse("", "text/plain", 400)
+
+    async def test_json_with_charset_is_accepted(self):
+        response = await self.post(BODY, "application/json; charset=utf-8")
+        self.assertEqual(response.status_code, 201)
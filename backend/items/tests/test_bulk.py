@@ -0,0 +1,41 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from ..models import Item
+
+
+class BulkBodyTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_scalar_bodies_are_rejected(self):
+        for method in ("post", "patch"):
+            for body in (5, "x", True, 1.5):
+                with self.subTest(method=method, body=body):
+                    response = getattr(self.client, method)(
+                        "/api/items/bulk/", body, format="json"
+                    )
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(
+                        response.json(), {"error": "Expected a list or an object."}
+                    )
+
+
+class BulkFieldTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.item = Item.objects.create(name="Widget", quantity=3)
+
+    def test_negative_quantity_is_a_field_error(self):
+        response = self.client.patch(
+            "/api/items/bulk/",
+            {"filter": {"status": "active"}, "fields": {"quantity": -5}},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {"quantity": ["Ensure this value is greater than or equal to 0."]},
+        )
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 3)
@@ -0,0 +1,83 @@
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from item_manager.db import router
+from ..models import Item
+from ..services import cache
+
+
+@override_settings(
+    ITEMS_CACHE_ENABLED=True,
+    DATABASE_REPLICAS=["replica1"],
+    DATABASE_REPLICA_PIN_SECONDS=5,
+)
+class ReplicaLagTests(SimpleTestCase):
+    def setUp(self):
+        self.calls = 0
+
+        @cache.cached_read(Item)
+        def read():
+            self.calls += 1
+            return self.calls
+
+        self.read = read
+        token = router._state.set(router.RouteState())
+        self.addCleanup(router._state.reset, token)
+        cache.invalidate(Item)
+
+    def test_replica_read_right_after_a_write_is_not_cached(self):
+        self.assertEqual(self.read(), 1)
+        self.assertEqual(self.read(), 2)
+
+    def test_replica_read_is_cached_once_replication_caught_up(self):
+        later = time.time() + 6
+        with mock.patch.object(cache.time, "time", return_value=later):
+            self.assertEqual(self.read(), 1)
+        self.assertEqual(self.read(), 1)
+
+    def test_primary_read_is_cached_right_after_a_write(self):
+        router._current().pinned = True
+        self.assertEqual(self.read(), 1)
+        router._current().pinned = False
+        self.assertEqual(self.read(), 1)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_reads_are_cached(self):
+        self.assertEqual(self.read(), 1)
+        self.assertEqual(self.read(), 1)
+
+
+@override_settings(ITEMS_CACHE_ENABLED=True, DATABASE_REPLICAS=[])
+class BulkWriteInvalidationTests(TestCase):
+    """Writes that send no model signals still drop cached item reads."""
+
+    def setUp(self):
+        cache.invalidate(Item)
+        self.item = Item.objects.create(name="Widget")
+        self.client = APIClient()
+
+    def status(self):
+        return self.client.get(f"/api/items/{self.item.pk}/").json()["status"]
+
+    def test_queryset_update(self):
+        self.assertEqual(self.status(), "active")
+        before = self.item.updated_at
+        Item.objects.filter(pk=self.item.pk).update(status="inactive")
+        self.assertEqual(self.status(), "inactive")
+        self.item.refresh_from_db()
+        self.assertGreater(self.item.updated_at, before)
+
+    def test_bulk_update(self):
+        self.assertEqual(self.status(), "active")
+        self.item.status = "archived"
+        Item.objects.bulk_update([self.item], ["status"])
+        self.assertEqual(self.status(), "archived")
+
+    def test_adjust_quantities(self):
+        self.client.get(f"/api/items/{self.item.pk}/")
+        Item.objects.adjust_quantities({self.item.pk: 5})
+        response = self.client.get(f"/api/items/{self.item.pk}/")
+        self.assertEqual(response.json()["quantity"], self.item.quantity + 5)
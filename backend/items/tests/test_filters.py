@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from ..filters import MAX_INTEGER, parse_query
+
+
+class RangeFilterTests(SimpleTestCase):
+    def parse(self, query):
+        return parse_query(QueryDict(query))
+
+    def test_values_within_the_column_range(self):
+        for query, key, value in [
+            (f"quantity__gt={MAX_INTEGER}", "quantity__gt", MAX_INTEGER),
+            (f"quantity__lt={-MAX_INTEGER - 1}", "quantity__lt", -MAX_INTEGER - 1),
+            ("price__lt=99999999.99", "price__lt", Decimal("99999999.99")),
+            ("price__gte=-0.5", "price__gte", Decimal("-0.5")),
+        ]:
+            with self.subTest(query):
+                parsed, error = self.parse(query)
+                self.assertIsNone(error)
+                self.assertEqual(parsed["filters"][key], value)
+
+    def test_values_outside_the_column_range(self):
+        for query, message in [
+            (f"quantity__gt={MAX_INTEGER + 1}", "Invalid quantity__gt."),
+            ("quantity__gt=99999999999999999999999", "Invalid quantity__gt."),
+            (f"quantity={-MAX_INTEGER - 2}", "Invalid quantity."),
+            ("price__lt=100000000", "Invalid price__lt."),
+            ("price__lt=99999999.999", "Invalid price__lt."),
+            ("price__gt=1e400", "Invalid price__gt."),
+            ("price=NaN", "Invalid price."),
+        ]:
+            with self.subTest(query):
+                parsed, error = self.parse(query)
+                self.assertIsNone(parsed)
+                self.assertTrue(error.startswith(message), error)
+
+
+class RangeFilterRequestTests(TestCase):
+    def test_out_of_range_integer_is_a_bad_request(self):
+        response = APIClient().get("/api/items/?quantity__gt=99999999999999999999999")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {"error": "Invalid quantity__gt. Must be an integer."}
+        )
@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from ..models import Item
+from ..services import import_service
+
+
+def make_row(**values):
+    row = {
+        "name": "Widget",
+        "description": None,
+        "group": "Primary",
+        "status": "active",
+        "priority": "medium",
+        "price": None,
+        "quantity": 1,
+        "location": None,
+        "tags": None,
+    }
+    row.update(values)
+    return row
+
+
+class CopyLineTests(SimpleTestCase):
+    def test_none_is_an_unquoted_empty_field(self):
+        self.assertEqual(import_service._copy_line([None, "a", None]), ',"a",\n')
+
+    def test_empty_string_stays_quoted(self):
+        self.assertEqual(import_service._copy_line(["", None]), '"",\n')
+
+    def test_values_are_quoted_and_escaped(self):
+        line = import_service._copy_line(['say "hi"', "a,b\nc", Decimal("9.50"), 3])
+        self.assertEqual(line, '"say ""hi""","a,b\nc","9.50","3"\n')
+
+
+class WriteBatchTests(TestCase):
+    def assert_nulls_kept(self, use_copy):
+        rows = [make_row(), make_row(name="Gadget", price=Decimal("2.50"), tags="")]
+        import_service.write_batch(rows, "error", use_copy=use_copy)
+        stored = dict(Item.objects.values_list("name", "price"))
+        self.assertEqual(stored, {"Gadget": Decimal("2.50"), "Widget": None})
+        widget = Item.objects.get(name="Widget")
+        self.assertIsNone(widget.description)
+        self.assertIsNone(widget.location)
+        self.assertIsNone(widget.tags)
+
+    def test_bulk_create_keeps_nulls(self):
+        self.assert_nulls_kept(use_copy=False)
+
+    @skipUnless(connection.vendor == "postgresql", "COPY needs PostgreSQL")
+    def test_copy_keeps_nulls(self):
+        self.assert_nulls_kept(use_copy=True)
+
+    @skipUnless(connection.vendor == "postgresql", "COPY needs PostgreSQL")
+    def test_copy_with_conflicts_keeps_nulls(self):
+        import_service.write_batch([make_row(price=Decimal("1.00"))], "error", True)
+        import_service.write_batch([make_row(location=None)], "update", True)
+        self.assertIsNone(Item.objects.get(name="Widget").price)
+
+
+class RejectsFileTests(TestCase):
+    def test_rejected_records_are_written_with_their_errors(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "items.ndjson")
+            rejects = os.path.join(directory, "rejects.ndjson")
+            with open(source, "w") as f:
+                f.write('{"name": "Widget", "quantity": 2}\n')
+                f.write('{"name": "Gadget", "status": "lost"}\n')
+                f.write("{not json\n")
+            call_command("import_items", source, rejects=rejects, stdout=StringIO())
+            with open(rejects) as f:
+                lines = [json.loads(line) for line in f]
+
+        self.assertEqual(Item.objects.get().name, "Widget")
+        self.assertEqual([line["index"] for line in lines], [1, 2])
+        self.assertEqual(lines[0]["record"], {"name": "Gadget", "status": "lost"})
+        self.assertIn("status", lines[0]["errors"])
+        self.assertEqual(lines[1]["record"], "{not json")
+        self.assertIn("non_field_errors", lines[1]["errors"])
@@ -0,0 +1,15 @@
+from django.test import TestCase
+
+from .. import metrics
+
+
+class MethodLabelTests(TestCase):
+    def test_unknown_methods_share_one_label(self):
+        for method in ("FOO", "BAR"):
+            self.client.generic(method, "/api/items/")
+        self.client.get("/api/items/")
+        rendered = metrics.render()
+        self.assertIn('route="/api/items/",method="other"', rendered)
+        self.assertIn('route="/api/items/",method="GET"', rendered)
+        self.assertNotIn("FOO", rendered)
+        self.assertNotIn("BAR", rendered)
@@ -0,0 +1,90 @@
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from ..models import Item
+from ..services import stats_service
+
+
+@override_settings(ITEMS_CACHE_ENABLED=False)
+class QueryBudgetTests(TestCase):
+    """Queries per request on the main endpoints; a regression fails here."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.item = Item.objects.create(
+            name="Widget", price=Decimal("9.99"), quantity=3, tags="blue,small"
+        )
+        Item.objects.create(name="Gadget", priority="high", status="inactive")
+        # Every statistics bucket exists, as it does on any real database.
+        stats_service.rebuild()
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_list(self):
+        # Page window, latest update, latest deletion, page.
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/items/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_not_modified(self):
+        etag = self.client.get("/api/items/")["ETag"]
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/items/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail(self):
+        # Validators, row.
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/api/items/{self.item.pk}/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_create(self):
+        # Savepoint, insert, statistics, release.
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                "/api/items/", {"name": "New", "price": "1.50"}, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+
+    def test_create_with_tags(self):
+        # Plus tag upsert, tag ids, link reset and link insert.
+        with self.assertNumQueries(8):
+            response = self.client.post(
+                "/api/items/", {"name": "New", "tags": "red,large"}, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+
+    def test_patch(self):
+        # One fetch, savepoint, update, release; no uniqueness check.
+        with self.assertNumQueries(4):
+            response = self.client.patch(
+                f"/api/items/{self.item.pk}/", {"location": "Shelf"}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_patch_statistics_field(self):
+        with self.assertNumQueries(5):
+            response = self.client.patch(
+                f"/api/items/{self.item.pk}/", {"priority": "high"}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_patch_name_conflict(self):
+        # The unique constraint rejects the write inside a savepoint that is
+        # rolled back; one lookup words the error.
+        with self.assertNumQueries(6):
+            response = self.client.patch(
+                f"/api/items/{self.item.pk}/", {"name": "Gadget"}, format="json"
+            )
+        self.assertEqual(response.status_code, 400)
+
+    def test_adjust(self):
+        # Savepoint, UPDATE ... RETURNING, statistics, release.
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                f"/api/items/{self.item.pk}/adjust/", {"delta": -1}, format="json"
+            )
+        self.assertEqual(response.json()["quantity"], 2)
@@ -0,0 +1,17 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class QueryPlanTests(TestCase):
+    def test_access_paths_use_indexes(self):
+        # Fails with CommandError naming any path that scans the table,
+        # sorts outside an index, or walks the index past a cursor.
+        output = StringIO()
+        call_command("explain_items", seed=5000, stdout=output)
+        self.assertNotIn("SCAN  ", output.getvalue())
+        # Filters are checked with every ordering, not only the default one.
+        self.assertIn(
+            "INDEX ?status=active&ordering=quantity [cursor page]", output.getvalue()
+        )
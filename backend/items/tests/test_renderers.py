@@ -0,0 +1,103 @@
+import datetime
+import io
+from decimal import Decimal
+from unittest import skipIf
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from .. import renderers
+from ..renderers import FastJSONParser, FastJSONRenderer
+
+UTC = datetime.timezone.utc
+VALUES = [
+    None,
+    {"price": Decimal("9.99"), "zero": Decimal("0.00"), "big": Decimal("1E+3")},
+    {"created_at": datetime.datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=UTC)},
+    {"created_at": datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC)},
+    {
+        "offset": datetime.datetime(
+            2024, 1, 2, tzinfo=datetime.timezone(-datetime.timedelta(hours=5))
+        )
+    },
+    {"naive": datetime.datetime(2024, 1, 2, 3, 4), "date": datetime.date(2024, 1, 2)},
+    {"time": datetime.time(3, 4, 5), "delta": datetime.timedelta(seconds=90)},
+    {"text": 'quote " slash \\ tab \t     é \U0001f600', "empty": ""},
+    {
+        "numbers": [0, -1, 2**63 - 1, 2**64, 2**70, 1.5, 1e300],
+        "flags": [True, False],
+    },
+    {1: "non-str key", "nested": [{"a": None}, []]},
+    [{"id": 1, "tag_list": ["a", "b"], "price": None}] * 3,
+]
+
+
+class RendererParityTests(SimpleTestCase):
+    def test_same_bytes_as_drf(self):
+        for value in VALUES:
+            with self.subTest(value=value):
+                self.assertEqual(
+                    FastJSONRenderer().render(value), JSONRenderer().render(value)
+                )
+
+    def test_indent_falls_back_to_drf(self):
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            FastJSONRenderer().render(VALUES[1], media_type),
+            JSONRenderer().render(VALUES[1], media_type),
+        )
+
+    @override_settings(ITEMS_JSON_BACKEND="json")
+    def test_json_backend(self):
+        for value in VALUES:
+            with self.subTest(value=value):
+                self.assertEqual(
+                    FastJSONRenderer().render(value), JSONRenderer().render(value)
+                )
+
+    @skipIf(renderers.orjson is None, "orjson is not installed")
+    def test_orjson_is_used_when_installed(self):
+        self.assertTrue(renderers._use_orjson())
+
+
+class ParserParityTests(SimpleTestCase):
+    def parse(self, parser, body):
+        return parser.parse(io.BytesIO(body), "application/json", {})
+
+    def test_same_values_as_drf(self):
+        for body in [
+            b'{"price": "9.99", "quantity": 3, "tags": null}',
+            b'[1, 2.5, -0, 1e400, "\\u00e9", true]',
+            b'{"big": 123456789012345678901234567890, "neg": -9223372036854775809}',
+        ]:
+            with self.subTest(body=body):
+                fast = self.parse(FastJSONParser(), body)
+                drf = self.parse(JSONParser(), body)
+                self.assertEqual(fast, drf)
+                # Integers beyond 64 bits must stay ints, not become floats.
+                self.assertEqual(
+                    [type(v) for v in _leaves(fast)], [type(v) for v in _leaves(drf)]
+                )
+
+    def test_same_error_as_drf(self):
+        for body in [b"{", b'{"a": 1,}', b"\xff", b'{"nan": NaN}']:
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError) as drf:
+                    self.parse(JSONParser(), body)
+                with self.assertRaises(ParseError) as fast:
+                    self.parse(FastJSONParser(), body)
+                self.assertEqual(str(fast.exception), str(drf.exception))
+
+    def test_loads_matches_parser(self):
+        body = b'{"a": [1, 2.5, null], "b": 123456789012345678901234567890}'
+        self.assertEqual(renderers.loads(body), self.parse(JSONParser(), body))
+
+
+def _leaves(value):
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        return [leaf for item in value for leaf in _leaves(item)]
+    return [value]
@@ -0,0 +1,84 @@
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from ..models import Item
+from ..renderers import FastJSONRenderer
+from ..serializers import ItemReadSerializer, ItemSerializer
+
+ITEMS = [
+    {"name": "Plain"},
+    {
+        "name": "Full",
+        "description": "Line one\nline two   é\U0001f600",
+        "group": "Secondary",
+        "status": "archived",
+        "priority": "urgent",
+        "price": Decimal("12345678.90"),
+        "quantity": 0,
+        "location": 'Aisle "7"',
+        "tags": " red , Large,,blue ",
+    },
+    {"name": "Cheap", "price": Decimal("0.1"), "priority": "high", "tags": ""},
+    {"name": "Zero", "price": Decimal("0"), "status": "inactive", "quantity": 7},
+]
+
+
+class ReadSerializerParityTests(TestCase):
+    """The values_list fast path renders exactly what ItemSerializer does."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for values in ITEMS:
+            Item.objects.create(**values)
+        # Whole seconds and microseconds both format like DRF.
+        Item.objects.filter(name="Plain").update(
+            created_at=datetime.datetime(
+                2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc
+            )
+        )
+        # Stored values outside the enums fall back like ItemSerializer.
+        Item.objects.filter(name="Zero").update(group="Legacy", priority="")
+
+    def expected(self):
+        return ItemSerializer(Item.objects.order_by("id"), many=True).data
+
+    def rows(self, serializer_class=ItemReadSerializer):
+        return Item.objects.order_by("id").values_list(*serializer_class.columns)
+
+    def test_full_rows(self):
+        data = ItemReadSerializer(self.rows(), many=True).data
+        self.assertEqual(data, self.expected())
+        self.assertEqual(
+            JSONRenderer().render(data), JSONRenderer().render(self.expected())
+        )
+
+    def test_single_row(self):
+        item = Item.objects.get(name="Full")
+        row = self.rows().get(pk=item.pk)
+        self.assertEqual(ItemReadSerializer(row).data, ItemSerializer(item).data)
+
+    def test_sparse_rows(self):
+        for fields in [
+            ("name",),
+            ("id", "price", "updated_at"),
+            ("tag_list", "is_urgent", "is_high_priority", "group"),
+            ItemReadSerializer.fields,
+        ]:
+            with self.subTest(fields=fields):
+                serializer_class = ItemReadSerializer.sparse(fields)
+                data = serializer_class(self.rows(serializer_class), many=True).data
+                expected = [
+                    {field: item[field] for field in fields} for item in self.expected()
+                ]
+                self.assertEqual(
+                    JSONRenderer().render(data), JSONRenderer().render(expected)
+                )
+
+    def test_fast_renderer_output(self):
+        data = ItemReadSerializer(self.rows(), many=True).data
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(self.expected())
+        )
@@ -0,0 +1,38 @@
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from ..management.commands import serve
+
+FILE_CACHE = {
+    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+    "LOCATION": "/tmp/item-manager-test-cache",
+}
+
+
+@mock.patch.object(serve.ProjectApplication, "run")
+class ServeCacheTests(SimpleTestCase):
+    def serve(self, *args):
+        stderr = StringIO()
+        call_command("serve", *args, stderr=stderr)
+        return stderr.getvalue()
+
+    @override_settings(ITEMS_CACHE_ENABLED=True)
+    def test_local_cache_is_disabled_for_several_workers(self, run):
+        output = self.serve("--workers", "2")
+        self.assertIn("per-process LocMemCache", output)
+        self.assertFalse(settings.ITEMS_CACHE_ENABLED)
+
+    @override_settings(ITEMS_CACHE_ENABLED=True)
+    def test_local_cache_is_kept_for_one_worker(self, run):
+        self.assertEqual(self.serve("--workers", "1"), "")
+        self.assertTrue(settings.ITEMS_CACHE_ENABLED)
+
+    def test_shared_cache_is_kept(self, run):
+        caches = {**settings.CACHES, "items": FILE_CACHE}
+        with self.settings(CACHES=caches, ITEMS_CACHE_ENABLED=True):
+            self.assertEqual(self.serve("--workers", "4"), "")
+            self.assertTrue(settings.ITEMS_CACHE_ENABLED)
@@ -1,21 +1,36 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, views
+
+# Endpoints with a native async version use it when ITEMS_ASYNC_VIEWS is on
+# (the default under ASGI); the rest are served by the sync views either way.
+item_views = async_views if settings.ITEMS_ASYNC_VIEWS else views
 
 urlpatterns = [
-    path("items/", views.item_list, name="item-list"),
-    path("items/<int:pk>/", views.item_detail, name="item-detail"),
+    path("items/", item_views.item_list, name="item-list"),
+    path("items/<int:pk>/", item_views.item_detail, name="item-detail"),
     path("items/constants/", views.item_constants, name="item-constants"),
+    path("items/export/", views.items_export, name="items-export"),
+    path("items/bulk/", views.items_bulk, name="items-bulk"),
+    path("items/adjust/", views.items_adjust, name="items-adjust"),
+    path("items/<int:pk>/adjust/", views.item_adjust, name="item-adjust"),
+    path("items/search/", views.items_search, name="items-search"),
+    path("items/changes/", views.items_changes, name="items-changes"),
+    # Async only: an open stream must not hold a worker thread.
+    path("items/stream/", async_views.items_stream, name="items-stream"),
+    path("items/stats/", item_views.item_stats, name="item-stats"),
+    path("metrics/", views.prometheus_metrics, name="metrics"),
     path(
         "items/status/<str:status_value>/",
-        views.items_by_status,
+        item_views.items_by_status,
         name="items-by-status",
     ),
     path(
         "items/priority/<str:priority_value>/",
-        views.items_by_priority,
+        item_views.items_by_priority,
         name="items-by-priority",
     ),
-    path("items/urgent/", views.urgent_items, name="urgent-items"),
-    path("items/active/", views.active_items, name="active-items"),
+    path("items/urgent/", item_views.urgent_items, name="urgent-items"),
+    path("items/active/", item_views.active_items, name="active-items"),
 ]
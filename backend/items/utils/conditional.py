@@ -0,0 +1,80 @@
+# backend/items/utils/conditional.py
+"""
+Conditional GET support (ETag / Last-Modified / 304) for read endpoints.
+"""
+import asyncio
+import datetime
+from functools import wraps
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def conditional_get(validators_func):
+    """Answer GET/HEAD with 304 when the client's validators still match.
+
+    ``validators_func`` receives the view's arguments and returns
+    ``(etag, last_modified)``, either of which may be ``None``. It runs
+    before the view, so an unchanged resource is never serialized. Other
+    methods pass straight through to the view. For ``async def`` views,
+    ``validators_func`` must be a coroutine function too.
+    """
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_inner(request, *args, **kwargs):
+                if request.method not in ("GET", "HEAD"):
+                    return await view(request, *args, **kwargs)
+                etag, last_modified = _normalize(
+                    *await validators_func(request, *args, **kwargs)
+                )
+                response = get_conditional_response(
+                    request, etag=etag, last_modified=last_modified
+                )
+                if response is None:
+                    response = _add_validators(
+                        await view(request, *args, **kwargs), etag, last_modified
+                    )
+                return response
+
+            return async_inner
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+            etag, last_modified = _normalize(*validators_func(request, *args, **kwargs))
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = _add_validators(
+                    view(request, *args, **kwargs), etag, last_modified
+                )
+            return response
+
+        return inner
+
+    return decorator
+
+
+def _normalize(etag, last_modified):
+    """Quote the ETag and turn ``last_modified`` into a UTC timestamp."""
+    etag = quote_etag(etag) if etag else None
+    if last_modified:
+        if not timezone.is_aware(last_modified):
+            last_modified = timezone.make_aware(last_modified, datetime.timezone.utc)
+        last_modified = int(last_modified.timestamp())
+    return etag, last_modified
+
+
+def _add_validators(response, etag, last_modified):
+    if response.status_code == 200:
+        if etag:
+            response.headers.setdefault("ETag", etag)
+        if last_modified:
+            response.headers.setdefault("Last-Modified", http_date(last_modified))
+    return response
@@ -0,0 +1,71 @@
+# backend/items/utils/seeding.py
+"""
+Synthetic item data for benchmarks and query-plan checks.
+"""
+import random
+from decimal import Decimal
+
+from ..enums import ItemGroup, ItemPriority, ItemStatus
+
+# Rough production mix: most items are active, few are urgent.
+STATUS_WEIGHTS = {
+    ItemStatus.ACTIVE.value: 70,
+    ItemStatus.INACTIVE.value: 20,
+    ItemStatus.ARCHIVED.value: 10,
+}
+PRIORITY_WEIGHTS = {
+    ItemPriority.LOW.value: 30,
+    ItemPriority.MEDIUM.value: 45,
+    ItemPriority.HIGH.value: 20,
+    ItemPriority.URGENT.value: 5,
+}
+GROUP_WEIGHTS = {
+    ItemGroup.PRIMARY.value: 60,
+    ItemGroup.SECONDARY.value: 40,
+}
+TAGS = [
+    "electronics",
+    "gadgets",
+    "office",
+    "furniture",
+    "tools",
+    "spare",
+    "fragile",
+    "new",
+    "refurbished",
+    "bulk",
+]
+LOCATIONS = [f"Warehouse {w}, Shelf {s}" for w in "ABCD" for s in range(1, 6)]
+
+
+def _choice(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def build_item_data(count, seed=0, prefix="seed"):
+    """Yield ``count`` dicts of realistic field values for ``Item``."""
+    rng = random.Random(seed)
+    for index in range(count):
+        yield {
+            "name": f"{prefix}-{index}",
+            "description": f"Synthetic item {index} " * rng.randint(1, 8),
+            "group": _choice(rng, GROUP_WEIGHTS),
+            "status": _choice(rng, STATUS_WEIGHTS),
+            "priority": _choice(rng, PRIORITY_WEIGHTS),
+            "price": Decimal(rng.randint(100, 500000)) / 100,
+            "quantity": rng.randint(1, 500),
+            "location": rng.choice(LOCATIONS),
+            "tags": ", ".join(rng.sample(TAGS, rng.randint(0, 4))) or None,
+        }
+
+
+def seed_items(model, count, seed=0, prefix="seed", batch_size=2000):
+    """Insert ``count`` synthetic rows with ``bulk_create``."""
+    batch = []
+    for data in build_item_data(count, seed, prefix):
+        batch.append(model(**data))
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
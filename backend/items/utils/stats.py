@@ -0,0 +1,112 @@
+"""
+Bucket arithmetic for the incrementally maintained inventory statistics.
+
+Every item counts towards the ``("total", "")`` bucket and to one bucket per
+dimension, e.g. ``("status", "active")``. Each bucket holds three measures:
+item count, total quantity and total value (``price * quantity``) in cents.
+"""
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+
+DIMENSIONS = ("status", "priority", "group")
+TOTAL = ("total", "")
+STAT_FIELDS = frozenset({*DIMENSIONS, "price", "quantity"})
+
+
+def buckets(values: dict) -> list:
+    """The buckets an item with these field values counts towards."""
+    return [TOTAL, *((dimension, values[dimension]) for dimension in DIMENSIONS)]
+
+
+def cents(amount) -> int:
+    return int((Decimal(amount or 0) * 100).to_integral_value())
+
+
+def row_deltas(values: dict, sign: int = 1) -> dict:
+    """Bucket deltas for adding one item (or removing it, with ``sign=-1``)."""
+    quantity = values["quantity"] or 0
+    measures = (sign, sign * quantity, sign * cents(values["price"]) * quantity)
+    return {bucket: measures for bucket in buckets(values)}
+
+
+def merge(*deltas: dict) -> dict:
+    """Sum bucket deltas, dropping buckets whose measures cancel out."""
+    merged = {}
+    for delta in deltas:
+        for bucket, measures in delta.items():
+            current = merged.get(bucket, (0, 0, 0))
+            merged[bucket] = tuple(a + b for a, b in zip(current, measures))
+    return {bucket: measures for bucket, measures in merged.items() if any(measures)}
+
+
+def change_deltas(old: dict, new: dict) -> dict:
+    """Bucket deltas for an item whose values went from ``old`` to ``new``.
+
+    ``old`` is ``None`` for a new item and ``new`` is ``None`` for a deleted
+    one.
+    """
+    return merge(
+        row_deltas(old, -1) if old is not None else {},
+        row_deltas(new) if new is not None else {},
+    )
+
+
+def tally(queryset) -> list:
+    """Aggregate ``queryset`` per (status, priority, group) in one query."""
+    return list(tally_query(queryset))
+
+
+def tally_query(queryset):
+    """The lazy GROUP BY behind :func:`tally`, e.g. for async iteration."""
+    value = ExpressionWrapper(
+        F("price") * F("quantity"),
+        output_field=DecimalField(max_digits=20, decimal_places=2),
+    )
+    return (
+        queryset.order_by()
+        .values(*DIMENSIONS)
+        .annotate(
+            item_count=Count("pk"),
+            quantity_sum=Sum("quantity"),
+            price_sum=Sum("price"),
+            value_sum=Sum(value),
+        )
+    )
+
+
+def assign(groups: list, values: dict) -> list:
+    """Predict the :func:`tally` of the same rows after ``update(**values)``.
+
+    ``values`` maps stat fields to the constants being assigned.
+    """
+    assigned = []
+    for group in groups:
+        group = {**group, **{d: values[d] for d in DIMENSIONS if d in values}}
+        count = group["item_count"]
+        if "quantity" in values:
+            quantity = values["quantity"]
+            group["quantity_sum"] = quantity * count
+            if "price" in values:
+                group["value_sum"] = Decimal(values["price"] or 0) * quantity * count
+            else:
+                group["value_sum"] = Decimal(group["price_sum"] or 0) * quantity
+        elif "price" in values:
+            price = values["price"]
+            group["price_sum"] = price * count if price is not None else None
+            group["value_sum"] = Decimal(price or 0) * (group["quantity_sum"] or 0)
+        assigned.append(group)
+    return assigned
+
+
+def group_deltas(groups: list, sign: int = 1) -> dict:
+    """Bucket deltas for adding (or removing) every row of a :func:`tally`."""
+    deltas = []
+    for group in groups:
+        measures = (
+            sign * group["item_count"],
+            sign * (group["quantity_sum"] or 0),
+            sign * cents(group["value_sum"]),
+        )
+        deltas.append({bucket: measures for bucket in buckets(group)})
+    return merge(*deltas)
@@ -1,7 +1,8 @@
-from django.shortcuts import get_object_or_404
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 from .constants import (
     COLOR_SCHEMES,
@@ -11,9 +12,125 @@ from .constants import (
     ITEM_STATUSES,
     VALIDATION_MESSAGES,
 )
-from .models import Item, ItemGroup, ItemPriority, ItemStatus
-from .serializers import ItemSerializer
+from .filters import ENUM_FILTERS, build_queryset, parse_fields, parse_query
+from .models import ItemPriority, ItemStatus
+from . import metrics, search
 from .services import item_service
+from .utils.conditional import conditional_get
+
+
+def _page_params(request):
+    """Extract the keyset pagination parameters from the query string."""
+    return {
+        "cursor": request.GET.get("cursor"),
+        "page_size": request.GET.get("page_size"),
+    }
+
+
+def _page_links(request, page):
+    """Turn the opaque next/previous cursors of a service page into links."""
+    url = request.build_absolute_uri()
+    links = {
+        key: replace_query_param(url, "cursor", page[key]) if page[key] else None
+        for key in ("next", "previous")
+    }
+    return {**page, **links}
+
+
+def _paginated_response(request, page):
+    return Response(_page_links(request, page))
+
+
+def _enum_filters(params):
+    """Collect the status/priority/group filters present in ``params``.
+
+    Returns ``(filters, error_response)``; the response is set when a value
+    is not a valid enum member.
+    """
+    filters = {}
+    for field, valid_values in ENUM_FILTERS.items():
+        value = params.get(field)
+        if value is None:
+            continue
+        if value not in valid_values:
+            return None, Response(
+                {"error": f"Invalid {field}. Must be one of: {valid_values}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        filters[field] = value
+    return filters, None
+
+
+def _fields(request):
+    """Parse ``?fields=``/``?omit=``; returns ``(fields, error_response)``."""
+    fields, error = parse_fields(request.query_params)
+    if error:
+        return None, Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+    return fields, None
+
+
+def _list_query(request, fixed=None):
+    """Parse the list filters of ``request`` into ``list_items`` arguments.
+
+    ``fixed`` holds filters implied by the route. Returns
+    ``(query, error_response)``.
+    """
+    query, error = parse_query(request.query_params, fixed)
+    if error:
+        return None, Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+    return query, None
+
+
+def _item_list(request, fixed=None):
+    query, error = _list_query(request, fixed)
+    if error:
+        return error
+    page = item_service.list_items(**_page_params(request), **query)
+    return _paginated_response(request, page)
+
+
+def _list_validators(fixed_func=None):
+    """ETag/Last-Modified for a list view over the request's filtered rows.
+
+    ``fixed_func`` gets the view's URL arguments and returns the filters the
+    route implies. Invalid parameters yield no validators, leaving the error
+    response to the view itself.
+    """
+
+    def validators(request, *args, **kwargs):
+        fixed = fixed_func(*args, **kwargs) if fixed_func else None
+        query, error = parse_query(request.GET, fixed)
+        if error:
+            return None, None
+        queryset = build_queryset(query["filters"], query["tags"], query["tag_match"])
+        return item_service.get_list_validators(
+            queryset,
+            request.get_full_path(),
+            **_page_params(request),
+            ordering=query["ordering"],
+        )
+
+    return validators
+
+
+def _detail_validators(request, pk):
+    return item_service.get_item_validators(pk, request.get_full_path())
+
+
+def _status_route(status_value):
+    return {"status": status_value}
+
+
+def _priority_route(priority_value):
+    return {"priority": priority_value}
+
+
+def _urgent_route():
+    return {"priority": ItemPriority.URGENT.value}
+
+
+def _active_route():
+    return {"status": ItemStatus.ACTIVE.value}
 
 
 @api_view(["GET"])
@@ -33,14 +150,14 @@ def item_constants(request):
     )
 
 
+@conditional_get(_list_validators())
 @api_view(["GET", "POST"])
 def item_list(request):
     """
-    List all items or create a new item.
+    List items, optionally filtered and sorted, or create a new item.
     """
     if request.method == "GET":
-        data = item_service.list_items()
-        return Response(data)
+        return _item_list(request)
 
     elif request.method == "POST":
         data, status_code, errors = item_service.create_item(request.data)
@@ -49,19 +166,143 @@ def item_list(request):
         return Response(errors, status=status_code)
 
 
+@api_view(["GET"])
+def items_search(request):
+    """
+    Full-text search over name, description, location and tags.
+    """
+    query = request.query_params.get("q", "")
+    if not search.terms(query):
+        return Response(
+            {"error": "q must contain at least one word"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    fields, error = _fields(request)
+    if error:
+        return error
+
+    page = item_service.search_items(query, **_page_params(request), fields=fields)
+    url = request.build_absolute_uri()
+    if page["next"]:
+        page = {**page, "next": replace_query_param(url, "cursor", page["next"])}
+    return Response(page)
+
+
+@api_view(["GET"])
+def items_changes(request):
+    """
+    Items written and items deleted since a cursor, for incremental sync.
+    """
+    fields, error = _fields(request)
+    if error:
+        return error
+    data, status_code, errors = item_service.list_changes(
+        request.query_params.get("since"),
+        request.query_params.get("page_size"),
+        fields,
+    )
+    if errors:
+        return Response(errors, status=status_code)
+    if data["has_more"]:
+        url = request.build_absolute_uri()
+        data = {**data, "next": replace_query_param(url, "since", data["cursor"])}
+    else:
+        data = {**data, "next": None}
+    return Response(data)
+
+
+@api_view(["GET"])
+def item_stats(request):
+    """
+    Inventory counts, quantity and value in total and per status/priority/group.
+    """
+    live = request.query_params.get("live", "false").lower() in ("true", "1")
+    return Response(item_service.get_item_stats(live))
+
+
+@api_view(["GET"])
+def prometheus_metrics(request):
+    """
+    Per-route request histograms and read cache counters for Prometheus.
+    """
+    return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+BULK_MODES = ["all_or_nothing", "best_effort"]
+
+
+def _bulk_mode(request):
+    """Parse ``?mode=``; returns ``(atomic, error_response)``."""
+    mode = request.query_params.get("mode", "all_or_nothing")
+    if mode not in BULK_MODES:
+        return None, Response(
+            {"error": f"Invalid mode. Must be one of: {BULK_MODES}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return mode == "all_or_nothing", None
+
+
+@api_view(["POST", "PATCH"])
+def items_bulk(request):
+    """
+    Create or update many items in one request.
+    """
+    atomic, error = _bulk_mode(request)
+    if error:
+        return error
+    batch_size = request.query_params.get("batch_size")
+    if not isinstance(request.data, (dict, list)):
+        return Response(
+            {"error": "Expected a list or an object."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    if request.method == "POST":
+        data, status_code, errors = item_service.bulk_create_items(
+            request.data, atomic=atomic, batch_size=batch_size
+        )
+    elif isinstance(request.data, list):
+        data, status_code, errors = item_service.bulk_patch_items(
+            request.data, atomic=atomic, batch_size=batch_size
+        )
+    else:
+        filter_params = request.data.get("filter")
+        if not isinstance(filter_params, dict) or not filter_params:
+            return Response(
+                {
+                    "error": f"filter must be a non-empty object over {list(ENUM_FILTERS)}"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        unknown = sorted(set(filter_params) - set(ENUM_FILTERS))
+        if unknown:
+            return Response(
+                {"error": f"Unknown filter fields: {unknown}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        filters, error = _enum_filters(filter_params)
+        if error:
+            return error
+        data, status_code, errors = item_service.bulk_update_items(
+            filters, request.data.get("fields")
+        )
+
+    if errors is None:
+        return Response(data, status=status_code)
+    return Response(errors, status=status_code)
+
+
+@conditional_get(_detail_validators)
 @api_view(["GET", "PATCH"])
 def item_detail(request, pk):
     """
     Retrieve or update a specific item.
     """
-    try:
-        get_object_or_404(Item, pk=pk)
-    except Item.DoesNotExist:
-        return Response({"error": "Item not found"}, status=status.HTTP_404_NOT_FOUND)
-
     if request.method == "GET":
-        data = item_service.get_item(pk)
-        return Response(data)
+        fields, error = _fields(request)
+        if error:
+            return error
+        return Response(item_service.get_item(pk, fields))
 
     elif request.method == "PATCH":
         data, status_code, errors = item_service.update_item(pk, request.data)
@@ -70,49 +311,98 @@ def item_detail(request, pk):
         return Response(errors, status=status_code)
 
 
+@api_view(["POST"])
+def items_adjust(request):
+    """
+    Add to or subtract from the quantities of many items in one request.
+    """
+    atomic, error = _bulk_mode(request)
+    if error:
+        return error
+    data, status_code, errors = item_service.bulk_adjust_items(request.data, atomic)
+    if errors is None:
+        return Response(data, status=status_code)
+    return Response(errors, status=status_code)
+
+
+@api_view(["POST"])
+def item_adjust(request, pk):
+    """
+    Add ``delta`` to an item's quantity, computed atomically by the database.
+    """
+    fields, error = _fields(request)
+    if error:
+        return error
+    delta = request.data.get("delta") if hasattr(request.data, "get") else None
+    data, status_code, errors = item_service.adjust_item_quantity(pk, delta, fields)
+    if errors is None:
+        return Response(data, status=status_code)
+    return Response(errors, status=status_code)
+
+
+@conditional_get(_list_validators(_status_route))
 @api_view(["GET"])
 def items_by_status(request, status_value):
     """
-    Get items filtered by status.
+    Get items filtered by status; alias of ``/items/?status=<status_value>``.
     """
-    if status_value not in ITEM_STATUSES:
-        return Response(
-            {"error": f"Invalid status. Must be one of: {ITEM_STATUSES}"},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
-
-    data = item_service.get_items_by_status(status_value)
-    return Response(data)
+    return _item_list(request, _status_route(status_value))
 
 
+@conditional_get(_list_validators(_priority_route))
 @api_view(["GET"])
 def items_by_priority(request, priority_value):
     """
-    Get items filtered by priority.
+    Get items filtered by priority; alias of ``/items/?priority=<priority_value>``.
     """
-    if priority_value not in ITEM_PRIORITIES:
-        return Response(
-            {"error": f"Invalid priority. Must be one of: {ITEM_PRIORITIES}"},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
-
-    data = item_service.get_items_by_priority(priority_value)
-    return Response(data)
+    return _item_list(request, _priority_route(priority_value))
 
 
+@conditional_get(_list_validators(_urgent_route))
 @api_view(["GET"])
 def urgent_items(request):
     """
-    Get all urgent items.
+    Get all urgent items; alias of ``/items/?priority=urgent``.
     """
-    data = item_service.get_urgent_items()
-    return Response(data)
+    return _item_list(request, _urgent_route())
 
 
+@conditional_get(_list_validators(_active_route))
 @api_view(["GET"])
 def active_items(request):
     """
-    Get all active items.
+    Get all active items; alias of ``/items/?status=active``.
     """
-    data = item_service.get_active_items()
-    return Response(data)
+    return _item_list(request, _active_route())
+
+
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+@api_view(["GET"])
+def items_export(request):
+    """
+    Stream the full item catalog as NDJSON or CSV.
+    """
+    output = request.query_params.get("output", "ndjson")
+    if output not in EXPORT_CONTENT_TYPES:
+        return Response(
+            {"error": f"Invalid output. Must be one of: {list(EXPORT_CONTENT_TYPES)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    query, error = _list_query(request)
+    if error:
+        return error
+
+    response = StreamingHttpResponse(
+        item_service.export_items(
+            output, query["filters"], query["tags"], query["tag_match"], query["fields"]
+        ),
+        content_type=EXPORT_CONTENT_TYPES[output],
+    )
+    response["Content-Disposition"] = f'attachment; filename="items.{output}"'
+    return response
@@ -1,5 +1,5 @@
 // src/context/ItemContext.js
-import React, { createContext, useContext, useState } from 'react';
+import React, { createContext, useContext, useRef, useState } from 'react';
 import * as itemApi from '../services/itemApi';
 
 const ItemContext = createContext();
@@ -7,11 +7,14 @@ const ItemContext = createContext();
 export function ItemProvider({ children }) {
     const [items, setItems] = useState([]);
     const [loading, setLoading] = useState(false);
+    const cursor = useRef(null);
 
+    // The first call loads every item; later calls only fetch the changes.
     const fetchItems = async () => {
         setLoading(true);
-        const res = await itemApi.fetchItems();
-        setItems(res.data);
+        const changes = await itemApi.fetchChanges(cursor.current);
+        cursor.current = changes.cursor;
+        setItems((prev) => itemApi.applyChanges(prev, changes));
         setLoading(false);
     };
 
@@ -1,18 +1,23 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import api from '../services/api';
+import { applyChanges, fetchChanges, subscribeToChanges } from '../services/itemApi';
 
 export default function useItems() {
   const [items, setItems] = useState([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  const cursor = useRef(null);
+  const [synced, setSynced] = useState(false);
 
-  // Fetch all items
+  // Fetch all items the first time, then only what changed since
   const fetchItems = useCallback(async () => {
     setLoading(true);
     setError(null);
     try {
-      const response = await api.get('/items/');
-      setItems(response.data);
+      const changes = await fetchChanges(cursor.current);
+      cursor.current = changes.cursor;
+      setItems((prev) => applyChanges(prev, changes));
+      setSynced(true);
     } catch (err) {
       setError(err);
     } finally {
@@ -57,6 +62,23 @@ export default function useItems() {
     fetchItems();
   }, [fetchItems]);
 
+  // Then keep up through the live stream
+  useEffect(() => {
+    if (!synced) return undefined;
+    return subscribeToChanges(
+      cursor.current,
+      (changes) => {
+        cursor.current = changes.cursor;
+        setItems((prev) => applyChanges(prev, changes));
+      },
+      () => {
+        cursor.current = null;
+        setSynced(false);
+        fetchItems();
+      }
+    );
+  }, [synced, fetchItems]);
+
   return {
     items,
     loading,
@@ -1,9 +1,103 @@
 // src/services/itemApi.js
 import api from './api';
 
-export const fetchItems = () => api.get('/items/');
+// Changes since `cursor` from /items/changes/, following pages until caught up.
+// Without a cursor (or once it has expired) this is a full load: `reset` is
+// set and `changed` holds every item.
+export const fetchChanges = async (cursor = null) => {
+    const changes = { changed: [], deleted: [], cursor, reset: !cursor };
+    let hasMore = true;
+    while (hasMore) {
+        let res;
+        try {
+            res = await api.get('/items/changes/', {
+                params: { since: changes.cursor || undefined, page_size: 1000 },
+            });
+        } catch (err) {
+            if (cursor && err.response && err.response.status === 410) {
+                return fetchChanges();
+            }
+            throw err;
+        }
+        changes.changed.push(...res.data.results);
+        changes.deleted.push(...res.data.deleted.map(({ id }) => id));
+        changes.cursor = res.data.cursor;
+        hasMore = res.data.has_more;
+    }
+    return changes;
+};
+// Apply fetchChanges() output to a list, keeping the list order (newest first).
+export const applyChanges = (items, { changed, deleted, reset }) => {
+    const byId = new Map(reset ? [] : items.map((item) => [item.id, item]));
+    changed.forEach((item) => byId.set(item.id, item));
+    deleted.forEach((id) => byId.delete(id));
+    return [...byId.values()].sort(
+        (a, b) => new Date(b.created_at) - new Date(a.created_at) || b.id - a.id
+    );
+};
+// How often to poll /items/changes/ when the stream is unavailable.
+const CHANGES_POLL_MS = 30000;
+// Live changes after `cursor` from /items/stream/, in the fetchChanges()
+// shape. The browser resumes from the last event after a reconnect; on
+// `reset` the cursor has expired and the caller must reload. If the server
+// refuses the stream (410 for an expired cursor, 501 under WSGI) this falls
+// back to polling fetchChanges(), whose results may then carry `reset`.
+// Returns a function closing the stream.
+export const subscribeToChanges = (cursor, onChanges, onReset) => {
+    const url = new URL(`${api.defaults.baseURL}/items/stream/`, window.location.href);
+    url.searchParams.set('since', cursor);
+    const source = new EventSource(url);
+    let last = cursor;
+    let polling = false;
+    let timer = null;
+    let closed = false;
+    const poll = async () => {
+        try {
+            const changes = await fetchChanges(last);
+            last = changes.cursor;
+            if (!closed && (changes.reset || changes.changed.length || changes.deleted.length)) {
+                onChanges(changes);
+            }
+        } catch (err) {
+            // Retried on the next poll.
+        }
+        if (!closed) {
+            timer = setTimeout(poll, CHANGES_POLL_MS);
+        }
+    };
+    source.addEventListener('changes', (event) => {
+        const data = JSON.parse(event.data);
+        last = event.lastEventId;
+        onChanges({
+            changed: data.results,
+            deleted: data.deleted.map(({ id }) => id),
+            cursor: event.lastEventId,
+            reset: false,
+        });
+    });
+    source.addEventListener('reset', () => {
+        source.close();
+        onReset();
+    });
+    source.onerror = () => {
+        // The browser retries dropped connections itself; it only gives up
+        // when the server answered with an error status.
+        if (source.readyState === EventSource.CLOSED && !polling && !closed) {
+            polling = true;
+            poll();
+        }
+    };
+    return () => {
+        closed = true;
+        clearTimeout(timer);
+        source.close();
+    };
+};
 export const fetchItem = (id) => api.get(`/items/${id}/`);
 export const createItem = (data) => api.post('/items/', data);
 export const updateItem = (id, data) => api.patch(`/items/${id}/`, data);
+// Add `delta` to an item's quantity on the server, safe against concurrent
+// edits; answers 409 with the current quantity if it would drop below zero.
+export const adjustQuantity = (id, delta) => api.post(`/items/${id}/adjust/`, { delta });
 export const deleteItem = (id) => api.delete(`/items/${id}/`);
 // Add more item-related API calls as needed
@@ -2,13 +2,19 @@
 import create from 'zustand';
 import * as itemApi from '../services/itemApi';
 
-const useItemStore = create((set) => ({
+const useItemStore = create((set, get) => ({
     items: [],
+    cursor: null,
     loading: false,
+    // The first call loads every item; later calls only fetch the changes.
     fetchItems: async () => {
         set({ loading: true });
-        const res = await itemApi.fetchItems();
-        set({ items: res.data, loading: false });
+        const changes = await itemApi.fetchChanges(get().cursor);
+        set((state) => ({
+            items: itemApi.applyChanges(state.items, changes),
+            cursor: changes.cursor,
+            loading: false,
+        }));
     },
 }));
 